@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.models import News, Category, SavedSummary, Comment
 from app.schemas.schemas import SaveSummaryRequest, SaveSummaryResponse
+from app.services.cache import get_cache, CATEGORY_STATS_KEY
 from datetime import datetime
 import logging
 
@@ -230,6 +231,7 @@ async def delete_category(
         # Delete the category itself
         db.delete(category)
         db.commit()
+        get_cache().delete(CATEGORY_STATS_KEY)
         
         logger.info(f"Category {category_id} deleted with {saved_summaries_count} saved summaries and {comments_count} comments")
         
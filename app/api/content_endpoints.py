@@ -13,9 +13,11 @@ from app.schemas.schemas import (
     ContentScrapeRequest, 
     ContentScrapeResponse,
     News as NewsSchema,
-    NewsUpdate
+    NewsUpdate,
+    SummaryGenerateResponse
 )
-from app.services.content_scraper import ContentScraper
+from app.services.summarizer import summary_queue, SUMMARY_LENGTHS
+from app.services.memory_budget import memory_budget
 
 router = APIRouter(prefix="/api/content", tags=["content"])
 
@@ -42,7 +44,8 @@ async def scrape_news_content(
         )
     
     try:
-        # Initialize scraper
+        # Initialize scraper (imported here so low-memory workers only load it when needed)
+        from app.services.content_scraper import ContentScraper
         scraper = ContentScraper()
         
         # Scrape content
@@ -95,6 +98,7 @@ async def scrape_multiple_articles(
         raise HTTPException(status_code=400, detail="Maximum 10 articles per batch")
     
     results = []
+    from app.services.content_scraper import ContentScraper
     scraper = ContentScraper()
     
     try:
@@ -176,9 +180,85 @@ async def get_content_status(news_id: int, db: Session = Depends(get_db)):
         "content_length": len(news_item.full_content) if news_item.full_content else 0,
         "translated_content_length": len(news_item.full_content_english) if news_item.full_content_english else 0,
         "source_domain": news_item.source_domain,
-        "content_language": news_item.content_language
+        "content_language": news_item.content_language,
+        "is_summarized": news_item.is_summarized,
+        "summarized_at": news_item.summarized_at
     }
 
+@router.post("/summarize/batch", response_model=List[SummaryGenerateResponse])
+async def summarize_multiple_articles(
+    news_ids: List[int],
+    length: str = "medium",
+    force: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue several scraped articles for summarization in one batch
+    """
+    if length not in SUMMARY_LENGTHS:
+        raise HTTPException(status_code=400, detail=f"Invalid length. Use one of: {', '.join(SUMMARY_LENGTHS)}")
+
+    articles = {item.id: item for item in db.query(News).filter(News.id.in_(news_ids)).all()}
+    results = []
+    for news_id in news_ids:
+        news_item = articles.get(news_id)
+        if not news_item:
+            results.append(SummaryGenerateResponse(success=False, message=f"News article {news_id} not found"))
+        elif not news_item.is_content_scraped or not news_item.full_content:
+            results.append(SummaryGenerateResponse(success=False, message="Content must be scraped first"))
+        elif news_item.is_summarized and not force:
+            results.append(SummaryGenerateResponse(
+                success=True,
+                message="Summary already generated",
+                summary=news_item.summary,
+                summary_length=len(news_item.summary or "")
+            ))
+        elif not memory_budget.allow_background_job("summary"):
+            results.append(SummaryGenerateResponse(success=False, message="Server is low on memory, try again later"))
+        else:
+            summary_queue.submit(news_id, length, force)
+            results.append(SummaryGenerateResponse(success=True, message="Summary generation queued"))
+
+    return results
+
+@router.post("/summarize/{news_id}", response_model=SummaryGenerateResponse)
+async def summarize_news_content(
+    news_id: int,
+    length: str = "medium",
+    force: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue summary generation for a scraped article; poll /status/{news_id} for completion
+    """
+    if length not in SUMMARY_LENGTHS:
+        raise HTTPException(status_code=400, detail=f"Invalid length. Use one of: {', '.join(SUMMARY_LENGTHS)}")
+
+    news_item = db.query(News).filter(News.id == news_id).first()
+    if not news_item:
+        raise HTTPException(status_code=404, detail="News article not found")
+
+    if not news_item.is_content_scraped or not news_item.full_content:
+        raise HTTPException(status_code=400, detail="Content must be scraped before it can be summarized")
+
+    # Return the cached summary unless regeneration was requested
+    if news_item.is_summarized and not force:
+        return SummaryGenerateResponse(
+            success=True,
+            message="Summary already generated",
+            summary=news_item.summary,
+            summary_length=len(news_item.summary or "")
+        )
+
+    if not memory_budget.allow_background_job("summary"):
+        raise HTTPException(status_code=503, detail="Server is low on memory, try again later")
+
+    summary_queue.submit(news_id, length, force)
+    return SummaryGenerateResponse(
+        success=True,
+        message="Summary generation queued"
+    )
+
 @router.get("/preview/{news_id}")
 async def preview_scraped_content(
     news_id: int, 
@@ -230,6 +310,7 @@ async def get_scraping_stats(db: Session = Depends(get_db)):
     total_articles = db.query(News).count()
     scraped_articles = db.query(News).filter(News.is_content_scraped == True).count()
     translated_articles = db.query(News).filter(News.is_content_translated == True).count()
+    summarized_articles = db.query(News).filter(News.is_summarized == True).count()
     
     # Get stats by domain
     from sqlalchemy import func
@@ -254,6 +335,8 @@ async def get_scraping_stats(db: Session = Depends(get_db)):
         "total_articles": total_articles,
         "scraped_articles": scraped_articles,
         "translated_articles": translated_articles,
+        "summarized_articles": summarized_articles,
+        "summaries_queued": summary_queue.pending_count(),
         "scraping_percentage": round(scraped_articles / total_articles * 100, 1) if total_articles > 0 else 0,
         "translation_percentage": round(translated_articles / total_articles * 100, 1) if total_articles > 0 else 0,
         "domain_breakdown": domain_breakdown
@@ -0,0 +1,45 @@
+"""
+Scheduler API Endpoints
+Exposes the per-section polling schedule and last-run statistics recorded by
+the scheduler service (scheduler_service.py) and the journal of full scrape runs
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+import logging
+
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
+
+@router.get("/status")
+async def get_scheduler_status(db: Session = Depends(get_db)):
+    """Schedule of every section with its last run, soonest due first"""
+    try:
+        from app.services.scheduler import schedule_status
+        sections = schedule_status(db)
+    except Exception as e:
+        logger.error(f"Error getting scheduler status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    now = datetime.utcnow()
+    last_runs = [s["last_run_at"] for s in sections if s["last_run_at"]]
+    return {
+        "sections": sections,
+        "total_sections": len(sections),
+        "due_sections": sum(1 for s in sections if s["next_run_at"] and s["next_run_at"] <= now),
+        "failing_sections": sum(1 for s in sections if s["last_status"] == "error"),
+        "last_activity_at": max(last_runs) if last_runs else None
+    }
+
+@router.get("/runs")
+async def get_scrape_runs(limit: int = 10, db: Session = Depends(get_db)):
+    """Latest full scrape runs with the status, cursor and counts of each section"""
+    try:
+        from app.services.scrape_runs import recent_runs
+        return recent_runs(db, limit=min(limit, 100))
+    except Exception as e:
+        logger.error(f"Error getting scrape runs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,7 +1,9 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 
+from app.services.sql_profiler import install_query_listeners
+
 # Use PostgreSQL in production, SQLite in development
 DATABASE_URL = os.getenv('DATABASE_URL')
 
@@ -41,10 +43,55 @@ else:
         max_overflow=10      # Maximum overflow connections
     )
 
+# Per-request query stats, slow-query log and SQL_PROFILING (see sql_profiler.py)
+install_query_listeners(engine)
+
+# Columns added to existing tables after their first release.
+# create_all() never alters an existing table, so these are added in place.
+# Each entry: (table, column, column DDL, optional backfill statement)
+ADDED_COLUMNS = [
+    ("news", "translation_status", "VARCHAR(20) NOT NULL DEFAULT 'pending'",
+     "UPDATE news SET translation_status = 'completed' WHERE title_english IS NOT NULL"),
+    ("news", "translation_attempts", "INTEGER NOT NULL DEFAULT 0", None),
+    ("news", "story_cluster_id", "INTEGER", None),
+    ("section_schedules", "avg_new_items", "FLOAT NOT NULL DEFAULT 0", None),
+]
+
+# Indexes on added columns: (index name, table, column)
+ADDED_INDEXES = [
+    ("ix_news_translation_status", "news", "translation_status"),
+    ("ix_news_story_cluster_id", "news", "story_cluster_id"),
+]
+
+def ensure_added_columns(bind=None):
+    """Add any columns from ADDED_COLUMNS (and their indexes) that are missing in an existing database"""
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for table, column, ddl, backfill in ADDED_COLUMNS:
+        if table not in existing_tables:
+            continue
+        existing_columns = {col['name'] for col in inspector.get_columns(table)}
+        if column in existing_columns:
+            continue
+
+        with bind.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            if backfill:
+                conn.execute(text(backfill))
+        print(f"✅ Added column {table}.{column}")
+
+    for name, table, column in ADDED_INDEXES:
+        if table in existing_tables:
+            with bind.begin() as conn:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})"))
+
 # Create tables automatically when the module is imported
 try:
     from app.models.models import Base
     Base.metadata.create_all(bind=engine)
+    ensure_added_columns()
     print(f"✅ Database tables created/verified successfully at: {DATABASE_URL}")
     
     # Set proper permissions for SQLite database on Digital Ocean
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
@@ -6,30 +6,42 @@ from app.database import get_db
 from app.models.models import News, Category, Comment, SavedSummary
 from app.models import models
 from app.schemas import schemas
-from app.scrapers.peoples_daily_scraper import PeoplesDailyScraper
-from app.scrapers.paper_scraper import PaperScraper
-from app.scrapers.state_council_scraper import StateCouncilScraper
-from app.scrapers.nbs_scraper import NBSScraper
-from app.scrapers.taiwan_affairs_scraper import TaiwanAffairsScraper
-from app.scrapers.mnd_scraper import MNDScraper
-from app.scrapers.guancha_scraper import GuanchaScraper
-from app.scrapers.global_times_scraper import GlobalTimesScraper
 from app.api.content_endpoints import router as content_router
 from app.api.category_endpoints import router as category_router
+from app.api.scheduler_endpoints import router as scheduler_router
 from collections import defaultdict
 import logging
 from datetime import datetime, timedelta
 import calendar
-from fastapi.responses import HTMLResponse, JSONResponse
+import time
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from typing import List, Dict, Optional
 from app.services.translator import MicrosoftTranslator
+from app.scrapers.registry import section_layout
+from app.services.scrape_process import fetch_sections, run_title_translation_job
+from app.services.memory_budget import memory_budget
+from app.services.metrics import (
+    observe_request, render_metrics, start_publisher
+)
+from app.services.sql_profiler import (
+    profile_sql, sql_profiling_enabled, start_query_stats
+)
+from app.services.page_cache import cached_page, date_tag, month_tag, install_invalidation
+from app.services.cache import get_cache, CATEGORY_STATS_KEY, STATS_TTL_SECONDS
 import os
-from sqlalchemy import text
+from sqlalchemy import text, func
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Largest synthetic data set /api/admin/add-test-data generates in one request (the endpoint is
+# unauthenticated; bulk data sets go through python -m app.services.synthetic_data)
+MAX_TEST_ARTICLES = 1000
+MAX_TEST_COMMENTS = 200
+MAX_TEST_SAVED_SUMMARIES = 100
+MAX_TEST_DAYS = 3650
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Chinese News Aggregator with Content Scraping",
@@ -43,6 +55,12 @@ app.include_router(content_router)
 # Include category management router
 app.include_router(category_router)
 
+# Include scheduler status router
+app.include_router(scheduler_router)
+
+# Drop cached calendar/date pages whenever their articles change
+install_invalidation()
+
 # Try to configure templates - fail gracefully if jinja2 not available
 templates = None
 try:
@@ -71,191 +89,154 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def shed_memory_cache():
+    """Drop the in-process cache when running without a shared cache backend"""
+    cache = get_cache()
+    if cache.backend.name == "memory":
+        cache.backend.clear()
+
+memory_budget.register_shedder("memory cache", shed_memory_cache)
+
+@app.middleware("http")
+async def enforce_memory_budget(request: Request, call_next):
+    # Samples RSS at most every few seconds and sheds caches when over budget
+    memory_budget.check()
+    return await call_next(request)
+
+# Opt-in (SQL_PROFILING=1): Server-Timing header and a query profile log line per request
+if sql_profiling_enabled():
+    app.middleware("http")(profile_sql)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = start_query_stats()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        observe_request(request, status, time.perf_counter() - started, stats)
+
+@app.on_event("startup")
+async def publish_metrics():
+    # Each worker shares its metrics so /metrics on any of them shows all workers
+    start_publisher("web")
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics of every worker and background process"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.post("/api/news/fetch")
-async def fetch_news(db: Session = Depends(get_db)):
+async def fetch_news(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     try:
         # Check if we're in production (Railway) environment
         is_production = bool(os.getenv('DATABASE_URL'))
         
-        # Initialize all scrapers - enable translation in production
-        pd_scraper = PeoplesDailyScraper(translate_immediately=is_production)
-        paper_scraper = PaperScraper(translate_immediately=is_production)
-        sc_scraper = StateCouncilScraper(translate_immediately=is_production)
-        nbs_scraper = NBSScraper(translate_immediately=is_production)
-        tao_scraper = TaiwanAffairsScraper(translate_immediately=is_production)
-        mnd_scraper = MNDScraper(translate_immediately=is_production)
-        guancha_scraper = GuanchaScraper(translate_immediately=is_production)
-        gt_scraper = GlobalTimesScraper(translate_immediately=is_production)
-        
-        # Fetch articles from all sources
-        pd_articles = pd_scraper.fetch_news()
-        paper_articles = paper_scraper.fetch_news()
-        sc_articles = sc_scraper.fetch_news()
-        nbs_articles = nbs_scraper.fetch_news()
-        tao_articles = tao_scraper.fetch_news()
-        mnd_articles = mnd_scraper.fetch_news()
-        guancha_articles = guancha_scraper.fetch_news()
-        gt_articles = gt_scraper.fetch_news()
-        
-        # Combine all articles
-        all_articles = pd_articles + paper_articles + sc_articles + nbs_articles + tao_articles + mnd_articles + guancha_articles + gt_articles
+        # Only parse links published since the previous fetch
+        counts = await fetch_sections(db, translate_immediately=is_production)
         
-        translator = MicrosoftTranslator()
-        new_articles_count = 0
-        duplicate_count = 0
-        
-        for article in all_articles:
-            # Check if article already exists by URL only (across all dates)
-            existing_by_url = db.query(News).filter(News.source_url == article['source_url']).first()
-            
-            if existing_by_url:
-                duplicate_count += 1
-                logger.info(f"Skipping duplicate URL: {article['source_url']}")
-                continue
-            
-            try:
-                # Check if this is from Global Times (already in English)
-                if article.get('source_section', '').startswith('Global Times'):
-                    title_english = article['title']  # Already in English
-                else:
-                    title_english = translator.translate(article['title'])
-            except Exception as e:
-                logger.error(f"Translation failed: {str(e)}")
-                title_english = None
-            
-            try:
-                news_item = News(
-                    title=article['title'],
-                    title_english=title_english,
-                    source_url=article['source_url'],
-                    source_section=article.get('source_section'),
-                    collection_date=article['collection_date']
-                )
-                db.add(news_item)
-                db.flush()  # Check for constraint violations before commit
-                new_articles_count += 1
-            except Exception as db_error:
-                logger.warning(f"Database constraint violation for article: {article['source_url']} - {str(db_error)}")
-                db.rollback()
-                duplicate_count += 1
-                continue
-        
-        try:
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database commit error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+        # Translate the new titles after the response has been sent
+        if memory_budget.allow_background_job("title translation"):
+            background_tasks.add_task(run_title_translation_job)
         
         return {
-            "message": f"Successfully fetched {new_articles_count} new articles from all sources (People's Daily, The Paper, State Council, NBS, Taiwan Affairs, MND, Guancha, Global Times)",
-            "new_articles": new_articles_count,
-            "duplicates_skipped": duplicate_count,
-            "total_processed": len(all_articles)
+            "message": f"Successfully fetched {counts['new_articles']} new articles from all sources (People's Daily, The Paper, State Council, NBS, Taiwan Affairs, MND, Guancha, Global Times)",
+            "new_articles": counts['new_articles'],
+            "duplicates_skipped": counts['duplicates_skipped'],
+            "clustered_articles": counts['clustered_articles'],
+            "known_links_skipped": counts['known_links_skipped'],
+            "joined_sections": counts['joined_sections'],
+            "busy_sections": counts['busy_sections'],
+            "total_processed": counts['total_processed']
         }
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/news/fetch/{date}")
-async def fetch_news_by_date(date: str, db: Session = Depends(get_db)):
-    """Fetch news from all sources for a specific date to populate subtabs"""
+async def fetch_news_by_date(date: str, background_tasks: BackgroundTasks,
+                             source: Optional[str] = None, section: Optional[str] = None,
+                             db: Session = Depends(get_db)):
+    """Fetch news for a specific date to populate subtabs (all sources, one source or one section)"""
     try:
         # Parse the date
         date_obj = datetime.strptime(date, '%Y-%m-%d').date()
-        
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    try:
         # Check if we're in production (Railway) environment
         is_production = bool(os.getenv('DATABASE_URL'))
         
-        # Initialize all scrapers - enable translation in production
-        pd_scraper = PeoplesDailyScraper(translate_immediately=is_production)
-        paper_scraper = PaperScraper(translate_immediately=is_production)
-        sc_scraper = StateCouncilScraper(translate_immediately=is_production)
-        nbs_scraper = NBSScraper(translate_immediately=is_production)
-        tao_scraper = TaiwanAffairsScraper(translate_immediately=is_production)
-        mnd_scraper = MNDScraper(translate_immediately=is_production)
-        guancha_scraper = GuanchaScraper(translate_immediately=is_production)
-        gt_scraper = GlobalTimesScraper(translate_immediately=is_production)
-        
-        # Fetch articles from all sources
-        pd_articles = pd_scraper.fetch_news_by_date(date_obj)
-        paper_articles = paper_scraper.fetch_news_by_date(date_obj)
-        sc_articles = sc_scraper.fetch_news_by_date(date_obj)
-        nbs_articles = nbs_scraper.fetch_news_by_date(date_obj)
-        tao_articles = tao_scraper.fetch_news_by_date(date_obj)
-        mnd_articles = mnd_scraper.fetch_news_by_date(date_obj)
-        guancha_articles = guancha_scraper.fetch_news_by_date(date_obj)
-        gt_articles = gt_scraper.fetch_news_by_date(date_obj)
-        
-        # Combine all articles
-        all_articles = pd_articles + paper_articles + sc_articles + nbs_articles + tao_articles + mnd_articles + guancha_articles + gt_articles
-        
-        translator = MicrosoftTranslator()
-        new_articles_count = 0
-        updated_articles_count = 0
-        duplicate_count = 0
-        
-        for article in all_articles:
-            # Check if article already exists by URL only (across all dates)
-            existing_by_url = db.query(News).filter(News.source_url == article['source_url']).first()
-            
-            if existing_by_url:
-                # Article exists - update if needed
-                if not existing_by_url.source_section and article.get('source_section'):
-                    existing_by_url.source_section = article.get('source_section')
-                    updated_articles_count += 1
-                else:
-                    duplicate_count += 1
-                    logger.info(f"Article already exists: {article['source_url']}")
-                continue
-            
-            # Article doesn't exist - create new one
-            try:
-                # Check if this is from Global Times (already in English)
-                if article.get('source_section', '').startswith('Global Times'):
-                    title_english = article['title']  # Already in English
-                else:
-                    title_english = translator.translate(article['title'])
-            except Exception as e:
-                logger.error(f"Translation failed: {str(e)}")
-                title_english = None
-            
-            try:
-                news_item = News(
-                    title=article['title'],
-                    title_english=title_english,
-                    source_url=article['source_url'],
-                    source_section=article.get('source_section'),
-                    collection_date=date_obj
-                )
-                db.add(news_item)
-                db.flush()  # Check for constraint violations before commit
-                new_articles_count += 1
-            except Exception as db_error:
-                logger.warning(f"Database constraint violation for article: {article['source_url']} - {str(db_error)}")
-                db.rollback()
-                duplicate_count += 1
-                continue
-        
         try:
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database commit error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+            counts = await fetch_sections(db, date=date, source=source, section=section,
+                                          translate_immediately=is_production)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Translate the new titles after the response has been sent
+        if memory_budget.allow_background_job("title translation"):
+            background_tasks.add_task(run_title_translation_job)
         
+        scope = section or source or "all sources"
         return {
-            "message": f"Successfully processed articles for {date}: {new_articles_count} new, {updated_articles_count} updated, {duplicate_count} duplicates skipped",
-            "new_articles": new_articles_count,
-            "updated_articles": updated_articles_count,
-            "duplicates_skipped": duplicate_count,
-            "total_processed": len(all_articles)
+            "message": f"Successfully processed articles for {date} ({scope}): {counts['new_articles']} new, {counts['updated_articles']} updated, {counts['duplicates_skipped']} duplicates skipped",
+            "source": source,
+            "section": section,
+            "sections_scraped": len(counts['sections']),
+            "new_articles": counts['new_articles'],
+            "updated_articles": counts['updated_articles'],
+            "duplicates_skipped": counts['duplicates_skipped'],
+            "clustered_articles": counts['clustered_articles'],
+            "joined_sections": counts['joined_sections'],
+            "busy_sections": counts['busy_sections'],
+            "total_processed": counts['total_processed']
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/news/translate-titles")
+async def translate_titles(background_tasks: BackgroundTasks, limit: Optional[int] = None):
+    """Start a title translation sweep over pending and previously failed rows"""
+    if not memory_budget.allow_background_job("title translation"):
+        raise HTTPException(status_code=503, detail="Server is low on memory, try again later")
+    background_tasks.add_task(run_title_translation_job, limit)
+    return {"message": "Title translation started"}
+
+@app.get("/api/news/translation-status")
+async def translation_status(db: Session = Depends(get_db)):
+    """Count articles per title translation status"""
+    try:
+        def count_statuses():
+            rows = db.query(News.translation_status, func.count(News.id)).group_by(News.translation_status).all()
+            return {status: count for status, count in rows}
+        
+        return get_cache().get_or_set("stats:translation_status", count_statuses, STATS_TTL_SECONDS)
+    except Exception as e:
+        logger.error(f"Error getting translation status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.post("/api/news/cluster-stories/{date}")
+async def cluster_stories(date: str, days: int = 1, db: Session = Depends(get_db)):
+    """Rebuild near-duplicate story clusters for the given date and the days before it, using scraped content too"""
+    try:
+        end = datetime.strptime(date, '%Y-%m-%d').date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    try:
+        from app.services.story_clustering import recluster_stories
+        return recluster_stories(db, end - timedelta(days=max(days - 1, 0)), end)
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Error clustering stories: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/", response_class=HTMLResponse)
 async def calendar_view(request: Request, db: Session = Depends(get_db), year: int = None, month: int = None):
@@ -281,6 +262,14 @@ async def calendar_view(request: Request, db: Session = Depends(get_db), year: i
     else:
         end_date = datetime(current_year, current_month + 1, 1).date() - timedelta(days=1)
     
+    return cached_page(
+        request, ("calendar", current_year, current_month), {month_tag(current_year, current_month)},
+        is_current=(current_year, current_month) >= (today.year, today.month),
+        render=lambda: render_calendar(request, db, current_year, current_month, cal, start_date, end_date)
+    )
+
+def render_calendar(request: Request, db: Session, current_year: int, current_month: int,
+                    cal: List[List[int]], start_date, end_date):
     dates_with_news = db.query(News.collection_date).distinct().filter(
         News.collection_date.between(start_date, end_date)
     ).all()
@@ -330,210 +319,169 @@ async def calendar_view(request: Request, db: Session = Depends(get_db), year: i
 async def news_by_date(request: Request, date: str, db: Session = Depends(get_db)):
     try:
         date_obj = datetime.strptime(date, '%Y-%m-%d').date()
-        news_items = db.query(News).filter(News.collection_date == date_obj).all()
-        
-        # Initialize all scrapers to get website structure
-        pd_scraper = PeoplesDailyScraper()
-        paper_scraper = PaperScraper()
-        sc_scraper = StateCouncilScraper()
-        nbs_scraper = NBSScraper()
-        tao_scraper = TaiwanAffairsScraper()
-        mnd_scraper = MNDScraper()
-        guancha_scraper = GuanchaScraper()
-        gt_scraper = GlobalTimesScraper()
-        
-        # Initialize organized news structure for all sources
-        organized_news = {}
-        
-        # Add People's Daily sections
-        for source_name, source_sections in pd_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add The Paper sections
-        for source_name, source_sections in paper_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add State Council sections
-        for source_name, source_sections in sc_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add NBS sections
-        for source_name, source_sections in nbs_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add Taiwan Affairs sections
-        for source_name, source_sections in tao_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add MND sections
-        for source_name, source_sections in mnd_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add Guancha sections
-        for source_name, source_sections in guancha_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Add Global Times sections
-        for source_name, source_sections in gt_scraper.websites.items():
-            organized_news[source_name] = {}
-            for section_name, section_url in source_sections.items():
-                organized_news[source_name][section_name] = []
-        
-        # Categorize news using source_section field if available, fallback to URL pattern
-        for item in news_items:
-            categorized = False
-            
-            # First try to use stored source_section
-            if item.source_section:
-                parts = item.source_section.split(' - ')
-                if len(parts) == 2:
-                    source_name, section_name = parts
-                    if source_name in organized_news and section_name in organized_news[source_name]:
-                        organized_news[source_name][section_name].append(item)
+        return cached_page(
+            request, ("news", date_obj), {date_tag(date_obj)},
+            is_current=date_obj >= datetime.now().date(),
+            render=lambda: render_news_by_date(request, date, date_obj, db)
+        )
+    except Exception as e:
+        logger.error(f"Error fetching news: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def render_news_by_date(request: Request, date: str, date_obj, db: Session):
+    news_items = db.query(News).filter(News.collection_date == date_obj).all()
+    
+    # Initialize organized news structure for all sources (all tabs and subtabs)
+    organized_news = {
+        source_name: {section_name: [] for section_name in source_sections}
+        for source_name, source_sections in section_layout().items()
+    }
+    
+    # Categorize news using source_section field if available, fallback to URL pattern
+    for item in news_items:
+        categorized = False
+        
+        # First try to use stored source_section
+        if item.source_section:
+            parts = item.source_section.split(' - ')
+            if len(parts) == 2:
+                source_name, section_name = parts
+                if source_name in organized_news and section_name in organized_news[source_name]:
+                    organized_news[source_name][section_name].append(item)
+                    categorized = True
+        
+        # Fallback to URL pattern matching for older articles
+        if not categorized:
+            url = item.source_url
+            if "world.people.com.cn" in url:
+                if "People's Daily" in organized_news and "International Breaking News" in organized_news["People's Daily"]:
+                    organized_news["People's Daily"]["International Breaking News"].append(item)
+                    categorized = True
+            elif "thepaper.cn" in url:
+                # Try to categorize The Paper articles by URL pattern
+                if "The Paper" in organized_news:
+                    # Default to Paper China Government if we can't determine the specific section
+                    if "Paper China Government" in organized_news["The Paper"]:
+                        organized_news["The Paper"]["Paper China Government"].append(item)
                         categorized = True
-            
-            # Fallback to URL pattern matching for older articles
-            if not categorized:
-                url = item.source_url
-                if "world.people.com.cn" in url:
-                    if "People's Daily" in organized_news and "International Breaking News" in organized_news["People's Daily"]:
-                        organized_news["People's Daily"]["International Breaking News"].append(item)
+            elif "gov.cn" in url:
+                # Categorize government sites
+                if "State Council" in organized_news:
+                    # Default to State Council News Releases if we can't determine the specific section
+                    if "State Council News Releases" in organized_news["State Council"]:
+                        organized_news["State Council"]["State Council News Releases"].append(item)
+                        categorized = True
+            elif "mofcom.gov.cn" in url:
+                # Categorize MOFCOM articles
+                if "State Council" in organized_news:
+                    if "MOFCOM Spokesperson" in organized_news["State Council"]:
+                        organized_news["State Council"]["MOFCOM Spokesperson"].append(item)
                         categorized = True
-                elif "thepaper.cn" in url:
-                    # Try to categorize The Paper articles by URL pattern
-                    if "The Paper" in organized_news:
-                        # Default to Paper China Government if we can't determine the specific section
-                        if "Paper China Government" in organized_news["The Paper"]:
-                            organized_news["The Paper"]["Paper China Government"].append(item)
+            elif "stats.gov.cn" in url:
+                # Categorize NBS articles
+                if "NBS" in organized_news:
+                    if "NBS Data Release" in organized_news["NBS"]:
+                        organized_news["NBS"]["NBS Data Release"].append(item)
+                        categorized = True
+            elif "gwytb.gov.cn" in url:
+                # Categorize Taiwan Affairs articles
+                if "Taiwan Affairs" in organized_news:
+                    if "Taiwan Affairs Office" in organized_news["Taiwan Affairs"]:
+                        organized_news["Taiwan Affairs"]["Taiwan Affairs Office"].append(item)
+                        categorized = True
+            elif "mod.gov.cn" in url:
+                # Categorize MND articles
+                if "MND" in organized_news:
+                    if "MND Regular PC" in organized_news["MND"]:
+                        organized_news["MND"]["MND Regular PC"].append(item)
+                        categorized = True
+            elif "guancha.cn" in url:
+                # Categorize Guancha articles with improved pattern matching
+                if "Guancha" in organized_news:
+                    # Try to determine section by URL pattern
+                    if "ZhongGuoWaiJiao" in url or "Chinese" in url:
+                        if "Guancha Chinese Diplomacy" in organized_news["Guancha"]:
+                            organized_news["Guancha"]["Guancha Chinese Diplomacy"].append(item)
                             categorized = True
-                elif "gov.cn" in url:
-                    # Categorize government sites
-                    if "State Council" in organized_news:
-                        # Default to State Council News Releases if we can't determine the specific section
-                        if "State Council News Releases" in organized_news["State Council"]:
-                            organized_news["State Council"]["State Council News Releases"].append(item)
+                    else:
+                        # Default to Guancha International for other Guancha articles
+                        if "Guancha International" in organized_news["Guancha"]:
+                            organized_news["Guancha"]["Guancha International"].append(item)
                             categorized = True
-                elif "mofcom.gov.cn" in url:
-                    # Categorize MOFCOM articles
-                    if "State Council" in organized_news:
-                        if "MOFCOM Spokesperson" in organized_news["State Council"]:
-                            organized_news["State Council"]["MOFCOM Spokesperson"].append(item)
+            elif "globaltimes.cn" in url:
+                # Categorize Global Times articles
+                if "Global Times" in organized_news:
+                    # Try to determine section by URL pattern
+                    if "/china/politics/" in url:
+                        if "GT China Politics" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Politics"].append(item)
                             categorized = True
-                elif "stats.gov.cn" in url:
-                    # Categorize NBS articles
-                    if "NBS" in organized_news:
-                        if "NBS Data Release" in organized_news["NBS"]:
-                            organized_news["NBS"]["NBS Data Release"].append(item)
+                    elif "/china/society/" in url:
+                        if "GT China Society" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Society"].append(item)
                             categorized = True
-                elif "gwytb.gov.cn" in url:
-                    # Categorize Taiwan Affairs articles
-                    if "Taiwan Affairs" in organized_news:
-                        if "Taiwan Affairs Office" in organized_news["Taiwan Affairs"]:
-                            organized_news["Taiwan Affairs"]["Taiwan Affairs Office"].append(item)
+                    elif "/china/diplomacy/" in url:
+                        if "GT China Diplomacy" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Diplomacy"].append(item)
                             categorized = True
-                elif "mod.gov.cn" in url:
-                    # Categorize MND articles
-                    if "MND" in organized_news:
-                        if "MND Regular PC" in organized_news["MND"]:
-                            organized_news["MND"]["MND Regular PC"].append(item)
+                    elif "/china/military/" in url:
+                        if "GT China Military" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Military"].append(item)
                             categorized = True
-                elif "guancha.cn" in url:
-                    # Categorize Guancha articles with improved pattern matching
-                    if "Guancha" in organized_news:
-                        # Try to determine section by URL pattern
-                        if "ZhongGuoWaiJiao" in url or "Chinese" in url:
-                            if "Guancha Chinese Diplomacy" in organized_news["Guancha"]:
-                                organized_news["Guancha"]["Guancha Chinese Diplomacy"].append(item)
-                                categorized = True
-                        else:
-                            # Default to Guancha International for other Guancha articles
-                            if "Guancha International" in organized_news["Guancha"]:
-                                organized_news["Guancha"]["Guancha International"].append(item)
-                                categorized = True
-                elif "globaltimes.cn" in url:
-                    # Categorize Global Times articles
-                    if "Global Times" in organized_news:
-                        # Try to determine section by URL pattern
-                        if "/china/politics/" in url:
-                            if "GT China Politics" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Politics"].append(item)
-                                categorized = True
-                        elif "/china/society/" in url:
-                            if "GT China Society" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Society"].append(item)
-                                categorized = True
-                        elif "/china/diplomacy/" in url:
-                            if "GT China Diplomacy" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Diplomacy"].append(item)
-                                categorized = True
-                        elif "/china/military/" in url:
-                            if "GT China Military" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Military"].append(item)
-                                categorized = True
-                        elif "/china/science/" in url:
-                            if "GT China Science" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Science"].append(item)
-                                categorized = True
-                        elif "/opinion/" in url:
-                            if "GT Opinion Editorial" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT Opinion Editorial"].append(item)
-                                categorized = True
-                        elif "/source/" in url:
-                            if "GT Source Voice" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT Source Voice"].append(item)
-                                categorized = True
-                        elif "/In-depth/" in url:
-                            if "GT Indepth" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT Indepth"].append(item)
-                                categorized = True
-                        else:
-                            # Default to GT China Politics for other Global Times articles
-                            if "GT China Politics" in organized_news["Global Times"]:
-                                organized_news["Global Times"]["GT China Politics"].append(item)
-                                categorized = True
-        
-        # MODIFIED: Don't remove empty sections - keep all tabs and subtabs visible
-        # This ensures users can see all available sources even when no news has been fetched yet
-        # The original logic that removed empty sections has been commented out:
-        # for source_name in list(organized_news.keys()):
-        #     for section_name in list(organized_news[source_name].keys()):
-        #         if not organized_news[source_name][section_name]:
-        #             del organized_news[source_name][section_name]
-        #     if not organized_news[source_name]:
-        #         del organized_news[source_name]
-        
-        # Calculate article counts per source for tab display
-        source_counts = {}
-        for source_name, sections in organized_news.items():
-            total_count = 0
-            for section_name, articles in sections.items():
-                total_count += len(articles)
-            source_counts[source_name] = total_count
-        
-        return templates.TemplateResponse("date_sources.html", {
-            "request": request,
-            "organized_news": organized_news,
-            "source_counts": source_counts,
-            "selected_date": date,
-            "total_articles": len(news_items)
-        })
-    except Exception as e:
-        logger.error(f"Error fetching news: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+                    elif "/china/science/" in url:
+                        if "GT China Science" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Science"].append(item)
+                            categorized = True
+                    elif "/opinion/" in url:
+                        if "GT Opinion Editorial" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT Opinion Editorial"].append(item)
+                            categorized = True
+                    elif "/source/" in url:
+                        if "GT Source Voice" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT Source Voice"].append(item)
+                            categorized = True
+                    elif "/In-depth/" in url:
+                        if "GT Indepth" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT Indepth"].append(item)
+                            categorized = True
+                    else:
+                        # Default to GT China Politics for other Global Times articles
+                        if "GT China Politics" in organized_news["Global Times"]:
+                            organized_news["Global Times"]["GT China Politics"].append(item)
+                            categorized = True
+    
+    # MODIFIED: Don't remove empty sections - keep all tabs and subtabs visible
+    # This ensures users can see all available sources even when no news has been fetched yet
+    # The original logic that removed empty sections has been commented out:
+    # for source_name in list(organized_news.keys()):
+    #     for section_name in list(organized_news[source_name].keys()):
+    #         if not organized_news[source_name][section_name]:
+    #             del organized_news[source_name][section_name]
+    #     if not organized_news[source_name]:
+    #         del organized_news[source_name]
+    
+    # Other sections covering the same story on this date, keyed by story cluster
+    story_coverage = defaultdict(list)
+    for item in news_items:
+        if item.story_cluster_id:
+            story_coverage[item.story_cluster_id].append(item.source_section or item.source_domain or "Unknown")
+    
+    # Calculate article counts per source for tab display
+    source_counts = {}
+    for source_name, sections in organized_news.items():
+        total_count = 0
+        for section_name, articles in sections.items():
+            total_count += len(articles)
+        source_counts[source_name] = total_count
+    
+    return templates.TemplateResponse("date_sources.html", {
+        "request": request,
+        "organized_news": organized_news,
+        "source_counts": source_counts,
+        "story_coverage": story_coverage,
+        "selected_date": date,
+        "total_articles": len(news_items)
+    })
 
 @app.get("/api/debug/articles")
 async def debug_articles(db: Session = Depends(get_db)):
@@ -687,6 +635,7 @@ async def get_article_api(article_id: int, db: Session = Depends(get_db)):
             "title_english": article.title_english,
             "source_url": article.source_url,
             "collection_date": article.collection_date.isoformat() if article.collection_date else None,
+            "story_cluster_id": article.story_cluster_id,
             "full_content": article.full_content,
             "full_content_english": article.full_content_english,
             "summary": article.summary,
@@ -729,18 +678,20 @@ async def get_categories(db: Session = Depends(get_db)):
 async def get_categories_stats(db: Session = Depends(get_db)):
     """Get comment counts for all categories"""
     try:
-        categories = db.query(Category).all()
-        stats = []
-        
-        for category in categories:
-            comment_count = db.query(Comment).filter(Comment.category_id == category.id).count()
-            stats.append({
-                "category_id": category.id,
-                "category_name": category.name,
-                "comment_count": comment_count
-            })
+        def count_comments():
+            categories = db.query(Category).all()
+            stats = []
+            
+            for category in categories:
+                comment_count = db.query(Comment).filter(Comment.category_id == category.id).count()
+                stats.append({
+                    "category_id": category.id,
+                    "category_name": category.name,
+                    "comment_count": comment_count
+                })
+            return stats
         
-        return stats
+        return get_cache().get_or_set(CATEGORY_STATS_KEY, count_comments, STATS_TTL_SECONDS)
     except Exception as e:
         logger.error(f"Error getting category stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -801,25 +752,7 @@ async def sources_view(request: Request):
     """Display all available sources organized by tabs and subtabs"""
     try:
         # Get the websites configuration from all scrapers
-        pd_scraper = PeoplesDailyScraper()
-        paper_scraper = PaperScraper()
-        sc_scraper = StateCouncilScraper()
-        nbs_scraper = NBSScraper()
-        tao_scraper = TaiwanAffairsScraper()
-        mnd_scraper = MNDScraper()
-        guancha_scraper = GuanchaScraper()
-        gt_scraper = GlobalTimesScraper()
-        
-        # Combine all websites from all scrapers
-        all_websites = {}
-        all_websites.update(pd_scraper.websites)
-        all_websites.update(paper_scraper.websites)
-        all_websites.update(sc_scraper.websites)
-        all_websites.update(nbs_scraper.websites)
-        all_websites.update(tao_scraper.websites)
-        all_websites.update(mnd_scraper.websites)
-        all_websites.update(guancha_scraper.websites)
-        all_websites.update(gt_scraper.websites)
+        all_websites = section_layout()
         
         return templates.TemplateResponse("sources.html", {
             "request": request,
@@ -886,6 +819,7 @@ async def add_comment(
         
         db.add(new_comment)
         db.commit()
+        get_cache().delete(CATEGORY_STATS_KEY)
         db.refresh(new_comment)
         
         # Return formatted response
@@ -999,6 +933,7 @@ async def create_category(
         
         db.add(new_category)
         db.commit()
+        get_cache().delete(CATEGORY_STATS_KEY)
         db.refresh(new_category)
         
         return new_category
@@ -1033,6 +968,7 @@ async def delete_category(
         # Delete the category itself
         db.delete(category)
         db.commit()
+        get_cache().delete(CATEGORY_STATS_KEY)
         
         logger.info(f"Category {category_id} deleted with {saved_summaries_count} saved summaries and {comments_count} comments")
         
@@ -1073,6 +1009,7 @@ async def delete_comment(
         # Delete the comment
         db.delete(comment)
         db.commit()
+        get_cache().delete(CATEGORY_STATS_KEY)
         
         logger.info(f"Comment {comment_id} deleted")
         
@@ -1182,7 +1119,8 @@ async def health_check(db: Session = Depends(get_db)):
             "timestamp": datetime.now().isoformat(),
             "service": "news-aggregator-api",
             "database": "connected",
-            "articles_count": count
+            "articles_count": count,
+            "memory": memory_budget.status()
         }
     except Exception as e:
         return {
@@ -1223,95 +1161,25 @@ async def initialize_database():
         raise HTTPException(status_code=500, detail=f"Database initialization failed: {str(e)}")
 
 @app.post("/api/admin/add-test-data")
-async def add_test_data(db: Session = Depends(get_db)):
-    """Add some test news data for demonstration"""
+def add_test_data(articles: int = 100, days: int = 30, comments: int = 20, saved_summaries: int = 10,
+                  seed: int = 0):
+    """Add a small set of synthetic news, categories, comments and saved summaries"""
+    limits = {"articles": (articles, MAX_TEST_ARTICLES), "days": (days, MAX_TEST_DAYS),
+              "comments": (comments, MAX_TEST_COMMENTS), "saved_summaries": (saved_summaries, MAX_TEST_SAVED_SUMMARIES)}
+    for name, (value, limit) in limits.items():
+        if not 0 <= value <= limit:
+            raise HTTPException(status_code=400, detail=f"{name} must be between 0 and {limit}")
+    if not memory_budget.allow_background_job("synthetic data"):
+        raise HTTPException(status_code=503, detail="Server is low on memory, try again later")
     try:
-        from datetime import datetime, date
-        
-        # Add test categories
-        categories_data = [
-            {"name": "Technology", "description": "Tech news and innovations"},
-            {"name": "Business", "description": "Business and finance news"},
-            {"name": "Environment", "description": "Environmental and climate news"},
-            {"name": "Health", "description": "Health and medical news"}
-        ]
-        
-        categories = {}
-        for cat_data in categories_data:
-            category = db.query(Category).filter(Category.name == cat_data["name"]).first()
-            if not category:
-                category = Category(**cat_data)
-                db.add(category)
-                db.commit()
-                db.refresh(category)
-            categories[cat_data["name"]] = category
-        
-        # Add test news articles
-        today = date.today()
-        test_articles = [
-            {
-                "headline": "Tech Giants Report Strong Q4 Earnings",
-                "summary": "Major technology companies showed robust financial performance in the fourth quarter.",
-                "content": "Technology giants reported strong earnings for Q4 2024, with cloud computing and AI investments paying off significantly.",
-                "url": "https://example.com/tech-earnings",
-                "published_at": datetime.now(),
-                "date": today,
-                "category_id": categories["Technology"].id,
-                "source": "Test Source"
-            },
-            {
-                "headline": "Global Climate Summit Reaches Historic Agreement",
-                "summary": "World leaders agreed on ambitious carbon reduction targets at the international climate summit.",
-                "content": "The global climate summit concluded with unprecedented agreement on carbon emission reduction targets.",
-                "url": "https://example.com/climate-summit",
-                "published_at": datetime.now(),
-                "date": today,
-                "category_id": categories["Environment"].id,
-                "source": "Test Source"
-            },
-            {
-                "headline": "Revolutionary Medical Breakthrough in Cancer Treatment",
-                "summary": "Scientists announce a breakthrough in personalized cancer therapy.",
-                "content": "Researchers have developed a new personalized cancer treatment approach that shows remarkable success rates.",
-                "url": "https://example.com/cancer-breakthrough",
-                "published_at": datetime.now(),
-                "date": today,
-                "category_id": categories["Health"].id,
-                "source": "Test Source"
-            },
-            {
-                "headline": "Asian Markets Rally on Economic Optimism",
-                "summary": "Stock markets across Asia showed strong gains as investors responded positively.",
-                "content": "Asian stock markets experienced significant rallies as positive economic data boosted investor confidence.",
-                "url": "https://example.com/asia-markets",
-                "published_at": datetime.now(),
-                "date": today,
-                "category_id": categories["Business"].id,
-                "source": "Test Source"
-            }
-        ]
-        
-        added_articles = []
-        for article_data in test_articles:
-            # Check if article already exists
-            existing = db.query(News).filter(News.headline == article_data["headline"]).first()
-            if not existing:
-                article = News(**article_data)
-                db.add(article)
-                db.commit()
-                db.refresh(article)
-                added_articles.append(article.headline)
-        
+        from app.services.synthetic_data import generate
+        result = generate(articles, days, comments, saved_summaries, seed=seed)
         return {
-            "message": "Test data added successfully",
-            "categories_created": len(categories),
-            "articles_added": len(added_articles),
-            "articles": added_articles,
+            "message": f"Added {result['articles']} synthetic articles",
+            **result,
             "status": "success"
         }
-        
     except Exception as e:
-        db.rollback()
         logger.error(f"Failed to add test data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to add test data: {str(e)}")
 
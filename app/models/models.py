@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, Text, Boolean, DateTime, Float, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -11,9 +11,12 @@ class News(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(Text, nullable=False)  # Allow duplicate titles
     title_english = Column(Text, nullable=True)  # Store English translation
+    translation_status = Column(String(20), default='pending', nullable=False, index=True)  # 'pending', 'completed', 'failed', 'not_required'
+    translation_attempts = Column(Integer, default=0, nullable=False)  # Number of title translation attempts so far
     source_url = Column(Text, nullable=False, unique=True)  # Make URLs unique
     source_section = Column(String(255))  # Add this new field
     collection_date = Column(Date, nullable=False)
+    story_cluster_id = Column(Integer, nullable=True, index=True)  # id of the first article of the same story (near-duplicates across sources)
     
     # Content fields for enhanced functionality
     full_content = Column(Text, nullable=True)  # Store scraped article content (original language)
@@ -95,3 +98,90 @@ class Comment(Base):
     
     def __repr__(self):
         return f"<Comment(id={self.id}, news_id={self.news_id}, category_id={self.category_id})>"
+
+
+class SectionFrontier(Base):
+    __tablename__ = "section_frontiers"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    page_url = Column(String(500), unique=True, nullable=False)  # Section index page
+    last_seen_urls = Column(Text, nullable=False, default='[]')  # JSON list of the newest article URLs, newest first
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<SectionFrontier(page_url='{self.page_url}')>"
+
+
+class SectionSchedule(Base):
+    __tablename__ = "section_schedules"
+    __table_args__ = (UniqueConstraint('source_name', 'section_name', name='uq_section_schedule'),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_name = Column(String(100), nullable=False)  # Top-level key of the scraper's websites
+    section_name = Column(String(255), nullable=False)
+    page_url = Column(Text, nullable=True)
+    interval_minutes = Column(Integer, nullable=False, default=60)  # Current poll interval, adapted to the publish rate
+    last_run_at = Column(DateTime, nullable=True)
+    next_run_at = Column(DateTime, nullable=True)
+    last_status = Column(String(20), nullable=True)  # 'success' or 'error'
+    last_error = Column(Text, nullable=True)
+    last_new_items = Column(Integer, nullable=False, default=0)
+    avg_new_items = Column(Float, nullable=False, default=0.0)  # Running average of new items per poll
+    last_duration_seconds = Column(Float, nullable=True)
+    total_runs = Column(Integer, nullable=False, default=0)
+    total_new_items = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<SectionSchedule(source='{self.source_name}', section='{self.section_name}', every={self.interval_minutes}m)>"
+
+
+class ScrapeRun(Base):
+    __tablename__ = "scrape_runs"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trigger = Column(String(50), nullable=False, default='automated')  # What started the run
+    status = Column(String(30), nullable=False, default='running')  # 'running', 'completed', 'completed_with_errors', 'abandoned'
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    resumed_count = Column(Integer, nullable=False, default=0)  # Times an interrupted run was picked up again
+    
+    sections = relationship("ScrapeRunSection", back_populates="run", order_by="ScrapeRunSection.id")
+    
+    def __repr__(self):
+        return f"<ScrapeRun(id={self.id}, status='{self.status}')>"
+
+
+class ScrapeRunSection(Base):
+    __tablename__ = "scrape_run_sections"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("scrape_runs.id"), nullable=False, index=True)
+    source_name = Column(String(100), nullable=False)
+    section_name = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # 'pending', 'running', 'completed', 'failed'
+    cursor = Column(Text, nullable=True)  # Newest article URL stored for this section in this run
+    new_articles = Column(Integer, nullable=False, default=0)
+    duplicates_skipped = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    run = relationship("ScrapeRun", back_populates="sections")
+    
+    def __repr__(self):
+        return f"<ScrapeRunSection(run_id={self.run_id}, section='{self.section_name}', status='{self.status}')>"
+
+
+class ScrapeLease(Base):
+    __tablename__ = "scrape_leases"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    lease_key = Column(String(300), unique=True, nullable=False)  # e.g. 'section:Global Times - GT China Politics'
+    owner = Column(String(100), nullable=False)  # Holder of the lease
+    acquired_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Free once this has passed (set to now on release)
+    result = Column(Text, nullable=True)  # JSON counts of the last finished run, shared with waiters
+    
+    def __repr__(self):
+        return f"<ScrapeLease(key='{self.lease_key}', owner='{self.owner}')>"
@@ -28,6 +28,7 @@ class NewsUpdate(BaseModel):
 
 class News(NewsBase):
     id: int
+    story_cluster_id: Optional[int] = None
     full_content: Optional[str] = None
     full_content_english: Optional[str] = None
     summary: Optional[str] = None
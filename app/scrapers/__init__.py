@@ -1,19 +1,30 @@
-from .base_scraper import BaseScraper
-from .peoples_daily_scraper import PeoplesDailyScraper
-from .paper_scraper import PaperScraper
-from .state_council_scraper import StateCouncilScraper
-from .nbs_scraper import NBSScraper
-from .taiwan_affairs_scraper import TaiwanAffairsScraper
-from .mnd_scraper import MNDScraper
-from .guancha_scraper import GuanchaScraper
-from .global_times_scraper import GlobalTimesScraper
+import importlib
+
+# Scraper modules pull in BeautifulSoup/lxml; they are imported on first access
+# so importing the package (or the registry) stays cheap
+_SCRAPER_MODULES = {
+    'BaseScraper': '.base_scraper',
+    'PeoplesDailyScraper': '.peoples_daily_scraper',
+    'PaperScraper': '.paper_scraper',
+    'StateCouncilScraper': '.state_council_scraper',
+    'NBSScraper': '.nbs_scraper',
+    'TaiwanAffairsScraper': '.taiwan_affairs_scraper',
+    'MNDScraper': '.mnd_scraper',
+    'GuanchaScraper': '.guancha_scraper',
+    'GlobalTimesScraper': '.global_times_scraper',
+}
+
+def __getattr__(name):
+    if name in _SCRAPER_MODULES:
+        return getattr(importlib.import_module(_SCRAPER_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
-    'BaseScraper', 
-    'PeoplesDailyScraper', 
+    'BaseScraper',
+    'PeoplesDailyScraper',
     'PaperScraper',
     'StateCouncilScraper',
-    'NBSScraper', 
+    'NBSScraper',
     'TaiwanAffairsScraper',
     'MNDScraper',
     'GuanchaScraper',
@@ -1,80 +1,81 @@
 from abc import ABC, abstractmethod
-import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict
-import chardet
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+import requests
+from .frontier import SectionCursor
+from app.services.encoding_resolver import encoding_resolver
+from app.services.page_fetch import fetch_page_async
+from app.services.scraper_config import get_max_body_bytes
+from app.services.http_client import (
+    REQUEST_TIMEOUT_SECONDS, ZH_ACCEPT_LANGUAGE, close_async_session, get_async_session, get_http_session
+)
 
 class BaseScraper(ABC):
+    # Accept-Language sent to the scraper's sites
+    accept_language = ZH_ACCEPT_LANGUAGE
+
     def __init__(self):
         self.session = None
+        # Optional CrawlFrontier: when set, scrape_page stops at links seen on the previous run
+        self.frontier = None
+        self._http_session: Optional[requests.Session] = None
+
+    @property
+    def http_session(self) -> requests.Session:
+        """The shared pooled HTTP client, so repeated polls keep their connections alive"""
+        return self._http_session or get_http_session()
+
+    @http_session.setter
+    def http_session(self, session: requests.Session):
+        """Use another session (e.g. one with a benchmark transport mounted)"""
+        self._http_session = session
+
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the HTTP client with the scraper's Accept-Language"""
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT_SECONDS)
+        return self.http_session.get(url, headers={'Accept-Language': self.accept_language}, **kwargs)
+
+    def get_section_selector(self, section_name: str) -> Optional[str]:
+        """CSS selector for the article links of a section (None lets scrape_page pick one)"""
+        return None
+
+    def fetch_section(self, source_name: str, section_name: str) -> List[Dict]:
+        """Scrape one section listed in self.websites"""
+        section_url = self.websites[source_name][section_name]
+        page_articles = self.scrape_page(section_url, self.get_section_selector(section_name))
+
+        # Add source section information to each article
+        for article in page_articles:
+            article['source_section'] = f"{source_name} - {section_name}"
+        return page_articles
+
+    def frontier_cursor(self, page_url: str) -> SectionCursor:
+        """Cursor for one pass over a section page (knows no links when no frontier is attached)"""
+        if self.frontier is None:
+            return SectionCursor()
+        return self.frontier.cursor(page_url)
 
     async def init_session(self):
-        if not self.session:
-            connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
-            timeout = aiohttp.ClientTimeout(total=30)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            self.session = aiohttp.ClientSession(
-                connector=connector, 
-                timeout=timeout, 
-                headers=headers
-            )
+        if not self.session or self.session.closed:
+            self.session = await get_async_session()
 
     async def close_session(self):
         if self.session:
-            await self.session.close()
             self.session = None
+            await close_async_session()
 
     async def fetch_page(self, url: str) -> str:
         """Fetch page content with proper Chinese encoding handling"""
         await self.init_session()
         try:
-            async with self.session.get(url) as response:
-                # Get the raw bytes first
-                content_bytes = await response.read()
-                
-                # Try to get encoding from response headers
-                encoding = None
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'charset=' in content_type:
-                    encoding = content_type.split('charset=')[-1].strip()
-                    # Normalize encoding names
-                    if encoding.lower() in ['gb2312', 'gbk']:
-                        encoding = 'gb2312'
-                    elif encoding.lower() in ['utf-8', 'utf8']:
-                        encoding = 'utf-8'
-                
-                # If no encoding found in headers, try to detect it
-                if not encoding:
-                    detected = chardet.detect(content_bytes)
-                    if detected and detected['confidence'] > 0.7:
-                        encoding = detected['encoding']
-                
-                # Fallback encodings for Chinese sites
-                if not encoding:
-                    # Try common Chinese encodings
-                    for fallback_encoding in ['utf-8', 'gb2312', 'gbk', 'big5']:
-                        try:
-                            return content_bytes.decode(fallback_encoding)
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    # If all else fails, use utf-8 with error handling
-                    return content_bytes.decode('utf-8', errors='ignore')
-                
-                try:
-                    return content_bytes.decode(encoding)
-                except (UnicodeDecodeError, LookupError):
-                    # If specified encoding fails, try utf-8 with error handling
-                    return content_bytes.decode('utf-8', errors='ignore')
+            # Streamed and bounded: attachments and oversized pages never sit in memory whole
+            page = await fetch_page_async(self.session, url, get_max_body_bytes(urlparse(url).netloc))
+            if page is None:
+                return ""
+            return encoding_resolver.decode(page['body'], page['content_type'], url)
                     
         except Exception as e:
             print(f"Error fetching {url}: {str(e)}")
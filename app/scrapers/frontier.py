@@ -0,0 +1,146 @@
+"""
+Crawl frontier
+Remembers the newest links seen on each section index page so steady-state
+runs only parse and ingest what was published since the previous run. Index
+pages are reverse-chronological: once a few links in a row are known, the
+rest of the page is older and parsing stops.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.models import SectionFrontier
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Consecutive known links that mark the end of new items (tolerates pinned stories at the top)
+STOP_AFTER_KNOWN = 3
+
+# Newest links remembered per section page
+MAX_TRACKED_URLS = 50
+
+
+class SectionCursor:
+    """Tracks one pass over a section page against the links seen on the previous run"""
+
+    def __init__(self, known_urls: Sequence[str] = ()):
+        self.previous = list(known_urls)
+        self.known_urls = set(known_urls)
+        self.new_urls: List[str] = []
+        self._new_set = set()
+        self.consecutive_known = 0
+        self.skipped = 0
+        self.exhausted = False
+
+    def known(self, href: str) -> bool:
+        """
+        Check a link in page order
+
+        Returns:
+            True if the link was seen on the previous run (skip it; stop if exhausted is set)
+        """
+        if href in self._new_set:
+            # Repeated link on the same page (e.g. image and headline)
+            return True
+
+        if href in self.known_urls:
+            self.consecutive_known += 1
+            self.skipped += 1
+            self.exhausted = self.consecutive_known >= STOP_AFTER_KNOWN
+            return True
+
+        self.consecutive_known = 0
+        self._new_set.add(href)
+        self.new_urls.append(href)
+        return False
+
+    def high_water_mark(self) -> List[str]:
+        """The newest links after this pass: new links first, then the previous ones"""
+        return (self.new_urls + [url for url in self.previous if url not in self._new_set])[:MAX_TRACKED_URLS]
+
+
+class CrawlFrontier:
+    """
+    Per-section high-water marks, loaded before a run and saved after its articles are committed
+
+    Passes over section pages stay pending until the caller saves (articles
+    committed) or discards (scrape failed) them, page by page.
+    """
+
+    def __init__(self, marks: Optional[Dict[str, List[str]]] = None):
+        self.marks = marks or {}
+        self.cursors: Dict[str, SectionCursor] = {}
+
+    @classmethod
+    def load(cls, db: Session) -> 'CrawlFrontier':
+        """Load the high-water marks of every section page"""
+        marks = {}
+        for row in db.query(SectionFrontier).all():
+            try:
+                marks[row.page_url] = json.loads(row.last_seen_urls or '[]')
+            except ValueError:
+                logger.warning(f"Ignoring unreadable frontier for {row.page_url}")
+        return cls(marks)
+
+    def cursor(self, page_url: str) -> SectionCursor:
+        """Start a pass over a section page"""
+        cursor = SectionCursor(self.marks.get(page_url, ()))
+        self.cursors[page_url] = cursor
+        return cursor
+
+    def pending(self) -> List[str]:
+        """Section pages passed over since their last save or discard"""
+        return list(self.cursors)
+
+    def save(self, db: Session, page_urls: Optional[Iterable[str]] = None):
+        """
+        Store the new high-water marks of section pages (the caller commits)
+
+        Only call this for pages whose articles were committed, otherwise links
+        that never reached the database would be skipped next time; discard the
+        pages of a failed scrape instead.
+
+        Args:
+            db: Database session
+            page_urls: Pages to store (default: every pending page)
+        """
+        pages = self.pending() if page_urls is None else [url for url in page_urls if url in self.cursors]
+        changed = {url: self.cursors[url] for url in pages if self.cursors[url].new_urls}
+        self.discard(pages)
+        if not changed:
+            return
+
+        rows = {row.page_url: row for row in
+                db.query(SectionFrontier).filter(SectionFrontier.page_url.in_(list(changed))).all()}
+        now = datetime.utcnow()
+        for page_url, cursor in changed.items():
+            mark = cursor.high_water_mark()
+            row = rows.get(page_url)
+            if row is None:
+                row = SectionFrontier(page_url=page_url)
+                db.add(row)
+            row.last_seen_urls = json.dumps(mark, ensure_ascii=False)
+            row.updated_at = now
+            self.marks[page_url] = mark
+
+    def discard(self, page_urls: Optional[Iterable[str]] = None):
+        """Drop the passes over section pages (default: all pending) without storing them"""
+        for page_url in (self.pending() if page_urls is None else list(page_urls)):
+            self.cursors.pop(page_url, None)
+
+    def stats(self, page_urls: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """New and skipped link counts of pending pages (call before save)"""
+        cursors = list(self.cursors.values()) if page_urls is None else \
+            [self.cursors[url] for url in page_urls if url in self.cursors]
+        return {
+            "sections": len(cursors),
+            "new_links": sum(len(c.new_urls) for c in cursors),
+            "known_links_skipped": sum(c.skipped for c in cursors),
+            "sections_stopped_early": sum(1 for c in cursors if c.exhausted)
+        }
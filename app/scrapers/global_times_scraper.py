@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
+from app.services.http_client import EN_ACCEPT_LANGUAGE
 import logging
 from dotenv import load_dotenv
 import os
@@ -16,6 +16,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GlobalTimesScraper(BaseScraper):
+    accept_language = EN_ACCEPT_LANGUAGE
+
     def __init__(self, translate_immediately=False):
         super().__init__()
         # Global Times articles are already in English, so no translation needed
@@ -57,19 +59,14 @@ class GlobalTimesScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "Global Times"
 
+    def get_section_selector(self, section_name: str):
+        return self.gt_selectors.get(section_name)
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.http_get(url)
             response.encoding = 'utf-8'  # Global Times uses UTF-8
             
             if response.status_code != 200:
@@ -86,6 +83,7 @@ class GlobalTimesScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -99,6 +97,12 @@ class GlobalTimesScraper(BaseScraper):
                         else:
                             href = f"https://www.globaltimes.cn/{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -118,13 +122,7 @@ class GlobalTimesScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.gt_selectors.get(section_name)
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -173,15 +171,7 @@ class GlobalTimesScraper(BaseScraper):
                 try:
                     print(f"\n=== Starting news fetch from {source_name} - {section_name} ===")
                     
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    }
-                    
-                    response = requests.get(section_url, headers=headers)
+                    response = self.http_get(section_url)
                     response.encoding = 'utf-8'
                     print(f"Response status: {response.status_code}")
                     
@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
 from app.services.translator import MicrosoftTranslator
 import logging
@@ -53,19 +52,14 @@ class GuanchaScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "Guancha"
 
+    def get_section_selector(self, section_name: str):
+        return self.guancha_selector
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.http_get(url)
             response.encoding = 'utf-8'  # Guancha uses UTF-8
             
             if response.status_code != 200:
@@ -82,6 +76,7 @@ class GuanchaScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -92,6 +87,12 @@ class GuanchaScraper(BaseScraper):
                         # Construct full URL for Guancha
                         href = f"https://www.guancha.cn{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -111,13 +112,7 @@ class GuanchaScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.guancha_selector
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
 from app.services.translator import MicrosoftTranslator
 import logging
@@ -51,19 +50,14 @@ class NBSScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "NBS"
 
+    def get_section_selector(self, section_name: str):
+        return self.nbs_selectors.get(section_name)
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.http_get(url)
             
             # Set encoding for Chinese government sites
             if "stats.gov.cn" in url:
@@ -83,6 +77,7 @@ class NBSScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -93,6 +88,12 @@ class NBSScraper(BaseScraper):
                         # Construct full URL for NBS
                         href = f"https://www.stats.gov.cn{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -112,13 +113,7 @@ class NBSScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.nbs_selectors.get(section_name)
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -167,15 +162,7 @@ class NBSScraper(BaseScraper):
                 try:
                     print(f"\n=== Starting news fetch from {source_name} - {section_name} ===")
                     
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    }
-                    
-                    response = requests.get(section_url, headers=headers)
+                    response = self.http_get(section_url)
                     response.encoding = 'utf-8'
                     print(f"Response status: {response.status_code}")
                     
@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
+from app.services.http_client import EN_ACCEPT_LANGUAGE
 from app.services.translator import MicrosoftTranslator
 import logging
 from dotenv import load_dotenv
@@ -17,6 +17,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PaperScraper(BaseScraper):
+    accept_language = EN_ACCEPT_LANGUAGE
+
     def __init__(self, translate_immediately=False):
         super().__init__()
         self.translate_immediately = translate_immediately
@@ -61,19 +63,14 @@ class PaperScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "The Paper"
 
+    def get_section_selector(self, section_name: str):
+        return self.paper_selectors.get(section_name)
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.http_get(url)
             response.encoding = 'utf-8'  # The Paper uses UTF-8
             
             if response.status_code != 200:
@@ -90,6 +87,7 @@ class PaperScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -100,6 +98,12 @@ class PaperScraper(BaseScraper):
                         # Construct full URL for The Paper
                         href = f"https://www.thepaper.cn{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -119,13 +123,7 @@ class PaperScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.paper_selectors.get(section_name)
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -174,15 +172,7 @@ class PaperScraper(BaseScraper):
                 try:
                     print(f"\n=== Starting news fetch from {source_name} - {section_name} ===")
                     
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    }
-                    
-                    response = requests.get(section_url, headers=headers)
+                    response = self.http_get(section_url)
                     response.encoding = 'utf-8'
                     print(f"Response status: {response.status_code}")
                     
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
+from app.services.encoding_resolver import encoding_resolver
+from app.services.http_client import EN_ACCEPT_LANGUAGE
 from app.services.translator import MicrosoftTranslator
 import logging
 from dotenv import load_dotenv
@@ -17,6 +18,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PeoplesDailyScraper(BaseScraper):
+    accept_language = EN_ACCEPT_LANGUAGE
+
     def __init__(self, translate_immediately=False):
         super().__init__()
         self.translate_immediately = translate_immediately
@@ -85,24 +88,17 @@ class PeoplesDailyScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "People's Daily"
 
+    def get_section_selector(self, section_name: str):
+        return self.pd_selectors.get(section_name)
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
+            response = self.http_get(url)
             
-            response = requests.get(url, headers=headers, timeout=30)
-            
-            # FIXED: Use proper encoding detection for Chinese content
-            if not response.encoding or response.encoding == 'ISO-8859-1':
-                # Use apparent encoding (auto-detected) for Chinese content
-                response.encoding = response.apparent_encoding or 'utf-8'
+            # Headers, <meta> or the domain's usual encoding before any detection
+            response.encoding = encoding_resolver.for_response(response)
             
             # All People's Daily and The Paper sites now use UTF-8
             if "thepaper.cn" in url or "people.com.cn" in url:
@@ -131,6 +127,7 @@ class PeoplesDailyScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -154,6 +151,12 @@ class PeoplesDailyScraper(BaseScraper):
                         else:
                             href = f"http://people.com.cn{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -173,13 +176,7 @@ class PeoplesDailyScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.pd_selectors.get(section_name)
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -0,0 +1,58 @@
+"""
+Scraper registry
+Maps each source name (the top-level key of a scraper's self.websites) to its
+scraper class, imported on first use. The combined section layout of all
+scrapers is kept in the shared cache so page views don't instantiate them.
+"""
+
+import importlib
+import importlib.util
+import os
+import zlib
+from typing import Dict, List, Tuple
+
+SCRAPER_CLASSES: Dict[str, Tuple[str, str]] = {
+    "People's Daily": ("app.scrapers.peoples_daily_scraper", "PeoplesDailyScraper"),
+    "The Paper": ("app.scrapers.paper_scraper", "PaperScraper"),
+    "State Council": ("app.scrapers.state_council_scraper", "StateCouncilScraper"),
+    "NBS": ("app.scrapers.nbs_scraper", "NBSScraper"),
+    "Taiwan Affairs": ("app.scrapers.taiwan_affairs_scraper", "TaiwanAffairsScraper"),
+    "MND": ("app.scrapers.mnd_scraper", "MNDScraper"),
+    "Guancha": ("app.scrapers.guancha_scraper", "GuanchaScraper"),
+    "Global Times": ("app.scrapers.global_times_scraper", "GlobalTimesScraper"),
+}
+
+def source_names() -> List[str]:
+    return list(SCRAPER_CLASSES)
+
+def get_scraper_class(source_name: str):
+    """Import and return the scraper class of a source (KeyError for unknown sources)"""
+    module_name, class_name = SCRAPER_CLASSES[source_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def create_scraper(source_name: str, **kwargs):
+    """Instantiate the scraper of a source"""
+    return get_scraper_class(source_name)(**kwargs)
+
+# Rebuilt when a scraper module changes, otherwise at most this often
+SECTION_LAYOUT_TTL_SECONDS = 24 * 3600
+
+def _layout_fingerprint() -> str:
+    """Changes whenever a scraper module file is modified (e.g. on deploy)"""
+    stamps = []
+    for module_name, _ in SCRAPER_CLASSES.values():
+        spec = importlib.util.find_spec(module_name)
+        stamps.append(f"{module_name}:{os.path.getmtime(spec.origin) if spec and spec.origin else 0}")
+    return format(zlib.crc32("|".join(stamps).encode('utf-8')), 'x')
+
+def _build_section_layout() -> Dict[str, Dict[str, str]]:
+    layout: Dict[str, Dict[str, str]] = {}
+    for source_name in source_names():
+        layout.update(create_scraper(source_name).websites)
+    return layout
+
+def section_layout() -> Dict[str, Dict[str, str]]:
+    """{source: {section: page URL}} of every registered scraper, shared by all workers through the cache"""
+    from app.services.cache import get_cache
+    return get_cache().get_or_set(f"section_layout:{_layout_fingerprint()}", _build_section_layout,
+                                  SECTION_LAYOUT_TTL_SECONDS)
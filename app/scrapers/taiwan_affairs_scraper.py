@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import List, Dict
 from bs4 import BeautifulSoup
-import requests
 from .base_scraper import BaseScraper
+from app.services.encoding_resolver import encoding_resolver
 from app.services.translator import MicrosoftTranslator
 import logging
 from dotenv import load_dotenv
@@ -49,29 +49,18 @@ class TaiwanAffairsScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "Taiwan Affairs"
 
+    def get_section_selector(self, section_name: str):
+        return self.tao_selectors.get(section_name)
+
     def scrape_page(self, url, selector=None):
         """Scrape a single page for articles"""
         articles = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
+            response = self.http_get(url)
             
-            response = requests.get(url, headers=headers, timeout=30)
-            
-            # Enhanced encoding handling for Taiwan Affairs sites
+            # Taiwan Affairs pages mix UTF-8 and GB encodings, often mislabelled
             if "gwytb.gov.cn" in url:
-                # Try UTF-8 first, then GB2312 as fallback
-                if response.encoding.lower() in ['iso-8859-1', 'windows-1252']:
-                    response.encoding = 'utf-8'
-                elif response.apparent_encoding:
-                    response.encoding = response.apparent_encoding
-                else:
-                    response.encoding = 'gb2312'
+                response.encoding = encoding_resolver.for_response(response)
             
             if response.status_code != 200:
                 logger.error(f"Failed to fetch page: {url} (Status: {response.status_code})")
@@ -87,6 +76,7 @@ class TaiwanAffairsScraper(BaseScraper):
             logger.info(f"Found {len(links)} links using selector: {selector}")
             
             current_date = datetime.now().date()
+            cursor = self.frontier_cursor(url)
             
             for link in links:
                 title = link.get_text().strip()
@@ -97,6 +87,12 @@ class TaiwanAffairsScraper(BaseScraper):
                         # Construct full URL for Taiwan Affairs Office
                         href = f"http://www.gwytb.gov.cn{href}"
                     
+                    # Skip links seen on the previous run; stop once the page reaches them
+                    if cursor.known(href):
+                        if cursor.exhausted:
+                            break
+                        continue
+                    
                     article = {
                         'title': title,
                         'source_url': href,
@@ -116,13 +112,7 @@ class TaiwanAffairsScraper(BaseScraper):
                 try:
                     logger.info(f"Scraping {source_name} - {section_name}: {section_url}")
                     
-                    # Get the appropriate selector for this section
-                    selector = self.tao_selectors.get(section_name)
-                    page_articles = self.scrape_page(section_url, selector)
-                    
-                    # Add source section information to each article
-                    for article in page_articles:
-                        article['source_section'] = f"{source_name} - {section_name}"
+                    page_articles = self.fetch_section(source_name, section_name)
                     
                     all_articles.extend(page_articles)
                     logger.info(f"Found {len(page_articles)} articles from {section_name}")
@@ -171,25 +161,11 @@ class TaiwanAffairsScraper(BaseScraper):
                 try:
                     print(f"\n=== Starting news fetch from {source_name} - {section_name} ===")
                     
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    }
-                    
-                    response = requests.get(section_url, headers=headers)
+                    response = self.http_get(section_url)
                     
-                    # Enhanced encoding handling for Taiwan Affairs sites
+                    # Taiwan Affairs pages mix UTF-8 and GB encodings, often mislabelled
                     if "gwytb.gov.cn" in section_url:
-                        # Try UTF-8 first, then GB2312 as fallback
-                        if response.encoding.lower() in ['iso-8859-1', 'windows-1252']:
-                            response.encoding = 'utf-8'
-                        elif response.apparent_encoding:
-                            response.encoding = response.apparent_encoding
-                        else:
-                            response.encoding = 'gb2312'
+                        response.encoding = encoding_resolver.for_response(response)
                     
                     print(f"Response status: {response.status_code}")
                     print(f"Response encoding: {response.encoding}")
@@ -0,0 +1,399 @@
+"""
+Shared Cache
+Key/value cache used by the app (rendered pages, section layout, translation
+memo, stats) with a pluggable backend, so every gunicorn worker and the
+cron/scheduler processes share one copy instead of each holding their own:
+
+- sqlite:///path  local SQLite file (WAL mode) shared by all processes on the host (default)
+- redis://...     any Redis-compatible server (redis, valkey, keydb) via the optional redis package
+- memory://       per-process LRU, for tests and single-process runs
+
+Entries have a TTL and the store is bounded in bytes; the least recently used
+entries are evicted first. Counters (used as invalidation versions) never
+expire and are not evicted.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+
+from app.services.metrics import record_cache_lookup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Evict at most every this many writes (eviction scans the whole SQLite table)
+EVICTION_CHECK_WRITES = 50
+
+# Reads refresh the SQLite LRU timestamp at most this often per entry
+ACCESS_RESOLUTION_SECONDS = 30
+
+# Dashboard counts may lag this much behind the database
+STATS_TTL_SECONDS = 60
+CATEGORY_STATS_KEY = "stats:categories"
+
+
+class CacheBackend(ABC):
+    """Byte-level storage used by Cache"""
+
+    name = "base"
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Values of the keys (None for missing or expired ones)"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment a persistent counter and return its new value"""
+        pass
+
+    @abstractmethod
+    def get_counters(self, keys: List[str]) -> List[int]:
+        """Current values of counters (0 for counters never incremented)"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU bounded by total value size"""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        now = time.time()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None and entry[1] <= now:
+                    self._remove(key)
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                values.append(entry[0] if entry is not None else None)
+        return values
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.time() + ttl_seconds if ttl_seconds else None)
+            self._size += len(value)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache table in a local SQLite file shared by every process on the host"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._pid = None
+        self._connection = None
+        self._connect()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Workers forked after the connection was opened (gunicorn --preload) need their own
+        if self._pid != os.getpid():
+            self._connect()
+        return self._connection
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._connection, self._pid = conn, os.getpid()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, expires_at, accessed_at FROM cache_entries WHERE key IN ({placeholders})",
+                keys
+            ).fetchall()
+            found = {}
+            touched = []
+            for key, value, expires_at, accessed_at in rows:
+                if expires_at is not None and expires_at <= now:
+                    continue
+                found[key] = bytes(value)
+                if accessed_at < now - ACCESS_RESOLUTION_SECONDS:
+                    touched.append((now, key))
+            if touched:
+                self._conn.executemany("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", touched)
+        return [found.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), now + ttl_seconds if ttl_seconds else None, now)
+            )
+            self._writes += 1
+            if self._writes % EVICTION_CHECK_WRITES == 0:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used ones until the store fits max_bytes"""
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", stale)
+        logger.info(f"Cache evicted {len(stale)} entries ({freed} bytes)")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO cache_counters (key, value) VALUES (?, 1) "
+                    "ON CONFLICT(key) DO UPDATE SET value = value + 1", (key,)
+                )
+                value = self._conn.execute("SELECT value FROM cache_counters WHERE key = ?", (key,)).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = dict(self._conn.execute(
+                f"SELECT key, value FROM cache_counters WHERE key IN ({placeholders})", keys
+            ).fetchall())
+        return [rows.get(key, 0) for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-compatible server; size-based eviction is the server's maxmemory policy
+
+    Use maxmemory-policy volatile-lru so counters (stored without TTL) are never evicted.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis  # Optional dependency: pip install redis
+        self.client = redis.Redis.from_url(url)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return self.client.mget(keys) if keys else []
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        # Entries always get a TTL so volatile-lru can evict them
+        self.client.set(key, value, ex=int(ttl_seconds or 7 * 24 * 3600) or 1)
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(f"counter:{key}"))
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        return [int(value) if value is not None else 0
+                for value in self.client.mget([f"counter:{key}" for key in keys])]
+
+    def clear(self):
+        for key in self.client.scan_iter("news:*"):
+            self.client.delete(key)
+
+
+class Cache:
+    """Namespaced JSON/bytes cache with tag-based invalidation on top of a backend"""
+
+    def __init__(self, backend: CacheBackend, prefix: str = "news:"):
+        self.backend = backend
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        value = self.backend.get_many([self._key(key)])[0]
+        record_cache_lookup(key, value is not None)
+        return value
+
+    def set_bytes(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        self.backend.set(self._key(key), value, ttl_seconds)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.get_bytes(key)
+        return json.loads(value) if value is not None else default
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Decoded values of the keys that are present"""
+        values = self.backend.get_many([self._key(key) for key in keys])
+        for key, value in zip(keys, values):
+            record_cache_lookup(key, value is not None)
+        return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        self.set_bytes(key, json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'), ttl_seconds)
+
+    def delete(self, key: str):
+        self.backend.delete(self._key(key))
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Any:
+        """Cached value of key, computing and storing it on a miss"""
+        value = self.get_bytes(key)
+        if value is not None:
+            return json.loads(value)
+        result = compute()
+        self.set(key, result, ttl_seconds)
+        return result
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Current invalidation version of each tag"""
+        tags = sorted(tags)
+        return dict(zip(tags, self.backend.get_counters([self._key("tag:" + tag) for tag in tags])))
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        """Make every entry stored with one of the tags stale, in every process"""
+        for tag in set(tags):
+            self.backend.incr(self._key("tag:" + tag))
+
+    def clear(self):
+        self.backend.clear()
+
+
+def default_cache_url() -> str:
+    """CACHE_URL, or a SQLite file next to the default database"""
+    url = os.getenv('CACHE_URL')
+    if url:
+        return url
+    if os.getenv('ENVIRONMENT') == 'production':
+        return "sqlite:////var/www/news_summary/news_cache.db"
+    return "sqlite:///./news_cache.db"
+
+def create_backend(url: str, max_bytes: Optional[int] = None) -> CacheBackend:
+    max_bytes = max_bytes or int(os.getenv('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+    if url.startswith('memory://'):
+        return MemoryBackend(max_bytes)
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteBackend(path, max_bytes)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+_cache: Optional[Cache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> Cache:
+    """Process-wide cache on the configured backend (falls back to memory if it cannot be opened)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                url = default_cache_url()
+                try:
+                    backend = create_backend(url)
+                except Exception as e:
+                    logger.warning(f"Cache backend {url} unavailable ({e}), using per-process memory cache")
+                    backend = MemoryBackend()
+                _cache = Cache(backend)
+                logger.info(f"Cache backend: {backend.name}")
+    return _cache
+
+def set_cache(cache: Optional[Cache]):
+    """Replace the process-wide cache (e.g. memory:// in scripts and tests)"""
+    global _cache
+    _cache = cache
@@ -0,0 +1,254 @@
+"""
+Generic content extractor
+Finds the article body of a page that has no selector configuration, in the
+manner of Readability: one pass over the lxml tree scores every text block
+(length, sentence punctuation) into its parent and grandparent, the highest
+scoring container after link density and class/id hints is the article, and
+its text blocks that are not mostly links are the content.
+
+The winner is also described by a simple selector (tag#id or tag.class) when
+one picks it out of the page as fetched, junk included (page_fetch matches it
+on the raw stream), so selector_learning can skip the scoring on the domain's
+next articles: extract_with_selector finds the container with one lookup.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import lxml.html
+from lxml import etree
+
+from app.services.page_fetch import matches_simple_selectors, parse_simple_selectors
+
+# Removed before scoring, with their content
+JUNK_TAGS = ('script', 'style', 'noscript', 'iframe', 'nav', 'footer', 'aside',
+             'select', 'button', 'textarea', 'svg')
+# Removed only when mostly links: ASP.NET pages wrap the whole body in <form id="form1">,
+# and some templates put the headline and lead in a <header>
+LINK_JUNK_TAGS = ('form', 'header')
+
+# A text block is one of these without block-level children
+TEXT_BLOCK_TAGS = {'p', 'pre', 'div', 'td', 'section', 'article', 'blockquote', 'li', 'center'}
+BLOCK_TAGS = {'p', 'pre', 'div', 'table', 'tr', 'td', 'section', 'article', 'blockquote', 'ul', 'ol', 'li',
+              'dl', 'center', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'main', 'figure'}
+
+# Shorter blocks are captions, bylines and buttons
+MIN_BLOCK_CHARS = 20
+# Blocks whose text is more than this share link text are navigation
+MAX_BLOCK_LINK_DENSITY = 0.5
+# Containers re-ranked with their link density
+TOP_CANDIDATES = 5
+CLASS_WEIGHT = 25
+
+POSITIVE_HINTS = re.compile(
+    r'article|content|detail|text|body|main|zoom|editor|story|entry|post|pages?_con|ucap', re.IGNORECASE)
+NEGATIVE_HINTS = re.compile(
+    r'comment|foot|nav|menu|sidebar|side|share|related|recommend|(^|[-_\s])hot|rank|copyright|breadcrumb|crumb|'
+    r'banner|promo|login|(^|[-_\s])ad([-_\s]|$)|links?([-_\s]|$)', re.IGNORECASE)
+# Sentence punctuation, Chinese and Latin
+SENTENCE_MARKS = re.compile(r'[，。；！？、,;!?]')
+WHITESPACE = re.compile(r'\s+')
+# Generated ids and classes (article-20240101, c1001-40150000) are no use on the next article
+GENERATED_NAME = re.compile(r'\d{3,}')
+
+_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+
+
+def parse_html(html: str):
+    """lxml tree of decoded page text (any <meta charset> is ignored: the text is already decoded)"""
+    return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=_PARSER)
+
+def _text(element) -> str:
+    return WHITESPACE.sub(' ', element.text_content()).strip()
+
+def _link_density(element, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_chars = sum(len(WHITESPACE.sub('', link.text_content())) for link in element.iter('a'))
+    return min(1.0, link_chars / text_length)
+
+def _class_weight(element) -> int:
+    hints = f"{element.get('class', '')} {element.get('id', '')}"
+    if not hints.strip():
+        return 0
+    weight = 0
+    if POSITIVE_HINTS.search(hints):
+        weight += CLASS_WEIGHT
+    if NEGATIVE_HINTS.search(hints):
+        weight -= CLASS_WEIGHT
+    return weight
+
+def _is_text_block(element) -> bool:
+    return element.tag in TEXT_BLOCK_TAGS and not any(
+        isinstance(child.tag, str) and child.tag in BLOCK_TAGS for child in element)
+
+def strip_junk(root):
+    """Remove the junk elements under root, and the link-dense forms and headers"""
+    etree.strip_elements(root, *JUNK_TAGS, with_tail=False)
+    for element in list(root.iter(*LINK_JUNK_TAGS)):
+        if element is root:
+            continue
+        length = len(WHITESPACE.sub('', element.text_content()))
+        if _link_density(element, length) > MAX_BLOCK_LINK_DENSITY:
+            element.drop_tree()
+
+def extract_title(tree) -> str:
+    """og:title, else the first <h1>, else <title>"""
+    for xpath in ('//meta[@property="og:title"]/@content', '//h1', '//title'):
+        found = tree.xpath(xpath)
+        if found:
+            title = found[0] if isinstance(found[0], str) else _text(found[0])
+            if title.strip():
+                return title.strip()
+    return ''
+
+def selector_for(elements: Iterable, container) -> Optional[str]:
+    """
+    Simple selector whose first match in the page is the container, if there is one
+
+    Args:
+        elements: The page's elements in document order before the junk was stripped:
+            page_fetch.ContainerWatcher matches the raw page, junk included
+        container: The article container
+    """
+    tag = container.tag
+    element_id = container.get('id', '').strip()
+    classes = [c for c in container.get('class', '').split() if not GENERATED_NAME.search(c)]
+    if element_id and not GENERATED_NAME.search(element_id) and not element_id[0].isdigit():
+        selector = f"{tag}#{element_id}"
+    elif classes:
+        selector = f"{tag}." + '.'.join(classes)
+    else:
+        return None
+    try:
+        return selector if first_match(elements, selector) is container else None
+    except ValueError:
+        return None
+
+def first_match(elements: Iterable, selector: str):
+    """First of the elements matching a simple selector (page_fetch.parse_simple_selectors)"""
+    parsed = parse_simple_selectors(selector)
+    for element in elements:
+        if isinstance(element.tag, str) and matches_simple_selectors(parsed, element.tag, element.attrib):
+            return element
+    return None
+
+def find_first(tree, selector: str):
+    """First element in document order matching a simple selector"""
+    return first_match(tree.iter(), selector)
+
+
+class ContentExtractor:
+    """Text-density / link-density article extraction"""
+
+    def __init__(self, min_block_chars: int = MIN_BLOCK_CHARS):
+        self.min_block_chars = min_block_chars
+
+    def _blocks(self, root) -> List[tuple]:
+        """(element, text, score) of every text block worth scoring under root, in document order"""
+        blocks = []
+        for element in root.iter(tuple(TEXT_BLOCK_TAGS)):
+            if not _is_text_block(element):
+                continue
+            text = _text(element)
+            length = len(WHITESPACE.sub('', text))
+            if length < self.min_block_chars:
+                continue
+            if _link_density(element, length) > MAX_BLOCK_LINK_DENSITY:
+                continue
+            score = 1 + len(SENTENCE_MARKS.findall(text)) + min(length // 100, 3)
+            blocks.append((element, text, score))
+        return blocks
+
+    def _best_container(self, blocks: List[tuple]):
+        scores: Dict = {}
+        for element, _, score in blocks:
+            parent = element.getparent()
+            for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+                if ancestor is None or not isinstance(ancestor.tag, str):
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = _class_weight(ancestor)
+                scores[ancestor] += score * share
+        if not scores:
+            return None
+
+        # Link density only for the few leading containers
+        best, best_score = None, float('-inf')
+        for candidate in sorted(scores, key=scores.get, reverse=True)[:TOP_CANDIDATES]:
+            length = len(WHITESPACE.sub('', candidate.text_content()))
+            adjusted = scores[candidate] * (1 - _link_density(candidate, length))
+            if adjusted > best_score:
+                best, best_score = candidate, adjusted
+        return best
+
+    def _parse(self, html: str):
+        try:
+            return parse_html(html)
+        except (etree.ParserError, ValueError):
+            return None
+
+    def extract(self, html: str) -> Dict[str, str]:
+        """
+        Extract the article of a page
+
+        Args:
+            html: Decoded page
+
+        Returns:
+            {'content', 'title', 'selector'}; content is empty when no article body
+            was found, selector None when no simple selector picks out the container
+        """
+        result = {'content': '', 'title': '', 'selector': None}
+        tree = self._parse(html)
+        if tree is None:
+            return result
+
+        result['title'] = extract_title(tree)
+        # The selector has to pick out the container in the page as fetched, junk included
+        elements = list(tree.iter())
+        strip_junk(tree)
+
+        blocks = self._blocks(tree)
+        container = self._best_container(blocks)
+        if container is None:
+            return result
+
+        inside = set(container.iter())
+        result['content'] = ' '.join(text for element, text, _ in blocks if element in inside)
+        result['selector'] = selector_for(elements, container)
+        return result
+
+    def extract_with_selector(self, html: str, selector: str) -> Dict[str, str]:
+        """
+        Article text of the container a known selector finds, without scoring the page
+
+        Returns:
+            {'content', 'title'}; content is empty when the selector matches nothing
+        """
+        result = {'content': '', 'title': ''}
+        tree = self._parse(html)
+        if tree is None:
+            return result
+
+        result['title'] = extract_title(tree)
+        # Looked up before stripping, like ContainerWatcher did while the page streamed in
+        try:
+            container = find_first(tree, selector)
+        except ValueError:
+            return result
+        if container is not None:
+            strip_junk(container)
+            result['content'] = ' '.join(text for _, text, _ in self._blocks(container))
+        return result
+
+
+content_extractor = ContentExtractor()
+
+def extract_article(html: str) -> Dict[str, str]:
+    """Article content, title and container selector of a page without selector configuration"""
+    return content_extractor.extract(html)
+
+def extract_article_with_selector(html: str, selector: str) -> Dict[str, str]:
+    """Article content and title from the container of a learned selector"""
+    return content_extractor.extract_with_selector(html, selector)
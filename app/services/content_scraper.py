@@ -6,7 +6,6 @@ Handles translation for Chinese content
 
 import requests
 import time
-import re
 from bs4 import BeautifulSoup
 from typing import Optional, Dict, Tuple
 from datetime import datetime
@@ -14,13 +13,24 @@ import logging
 from urllib.parse import urlparse, urljoin
 import urllib.parse
 
-from app.services.scraper_config import get_selector_config, get_language_config
+from app.services.scraper_config import (
+    get_all_configured_domains, get_selector_config, get_language_config, get_max_body_bytes
+)
+from app.services.content_extractor import extract_article, extract_article_with_selector
+from app.services.selector_learning import selector_learner
+from app.services.text_cleaner import clean_text
 from app.services.translator import MicrosoftTranslator
+from app.services.encoding_resolver import encoding_resolver
+from app.services.http_client import EN_ACCEPT_LANGUAGE, get_http_session
+from app.services.page_fetch import fetch_page
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shorter extractions count as no content found
+MIN_CONTENT_CHARS = 100
+
 class ContentScraper:
     """Main content scraper with domain-specific selector support"""
     
@@ -33,17 +43,12 @@ class ContentScraper:
         """
         self.delay = delay_between_requests
         self.translator = MicrosoftTranslator()
-        self.session = requests.Session()
-        
-        # Set user agent to appear more like a regular browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
+        self.session = get_http_session()
+        # On top of the shared browser headers
+        self.headers = {
+            'Accept-Language': EN_ACCEPT_LANGUAGE,
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
     
     def extract_domain_and_subcategory(self, url: str) -> Tuple[str, str]:
         """
@@ -76,15 +81,16 @@ class ContentScraper:
             logger.error(f"Error parsing URL {url}: {e}")
             return "unknown", "default"
     
-    def fetch_page_content(self, url: str) -> Optional[BeautifulSoup]:
+    def fetch_page_html(self, url: str, container_selector: Optional[str] = None) -> Optional[str]:
         """
-        Fetch and parse the webpage content
+        Fetch the webpage and decode it
         
         Args:
             url: URL to fetch
+            container_selector: Element holding the article; the download stops once it has closed
             
         Returns:
-            BeautifulSoup object or None if failed
+            Page text or None if failed (or not a page)
         """
         try:
             logger.info(f"Fetching content from: {url}")
@@ -95,83 +101,66 @@ class ContentScraper:
                 if elapsed < self.delay:
                     time.sleep(self.delay - elapsed)
             
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            # Streamed and bounded: attachments and oversized pages never sit in memory whole
+            page = fetch_page(self.session, url, get_max_body_bytes(urlparse(url).netloc),
+                              container_selector, headers=self.headers)
             
             self._last_request_time = time.time()
+            if page is None:
+                return None
             
-            # Handle encoding properly for Chinese content
-            if not response.encoding or response.encoding == 'ISO-8859-1':
-                # Try to detect proper encoding
-                detected_encoding = response.apparent_encoding
-                if detected_encoding:
-                    response.encoding = detected_encoding
-                elif 'people.com.cn' in url:
-                    # Use GB2312 for People's Daily sites
-                    response.encoding = 'gb2312'
-                else:
-                    response.encoding = 'utf-8'
-            
-            # Use the properly decoded text instead of raw bytes
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup
+            # Headers, <meta> or the domain's usual encoding; detection only on a prefix
+            encoding = encoding_resolver.resolve(page['body'], page['content_type'], url)
+            return page['body'].decode(encoding, errors='replace')
             
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
+        except Exception as e:
+            logger.error(f"Error decoding content from {url}: {e}")
+            return None
+    
+    def fetch_page_content(self, url: str, container_selector: Optional[str] = None) -> Optional[BeautifulSoup]:
+        """
+        Fetch and parse the webpage content
+        
+        Args:
+            url: URL to fetch
+            container_selector: Element holding the article; the download stops once it has closed
+            
+        Returns:
+            BeautifulSoup object or None if failed (or not a page)
+        """
+        html = self.fetch_page_html(url, container_selector)
+        if html is None:
+            return None
+        try:
+            return BeautifulSoup(html, 'html.parser')
         except Exception as e:
             logger.error(f"Error parsing content from {url}: {e}")
             return None
     
-    def clean_text(self, text: str) -> str:
+    def clean_text(self, text: str, domain: Optional[str] = None) -> str:
         """
         Clean extracted text content
         
         Args:
             text: Raw text content
+            domain: Source domain, for its own boilerplate patterns (scraper_config.CLEAN_PATTERNS)
             
         Returns:
             Cleaned text
         """
-        if not text:
-            return ""
-        
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # Remove common unwanted patterns
-        patterns_to_remove = [
-            r'责任编辑[：:][^\n]*',  # Chinese editor information
-            r'编辑[：:][^\n]*',      # Editor information
-            r'来源[：:][^\n]*',      # Source information
-            r'原标题[：:][^\n]*',    # Original title
-            r'\(责编[：:][^)]*\)',   # Editor in parentheses
-            r'点击进入专题',         # Click to enter topic
-            r'更多精彩内容',         # More exciting content
-            r'相关新闻',            # Related news
-            r'【.*?】',             # Content in square brackets
-        ]
-        
-        for pattern in patterns_to_remove:
-            text = re.sub(pattern, '', text)
-        
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # Clean up extra spaces again
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        return text
+        return clean_text(text, domain)
     
-    def extract_content_with_selectors(self, soup: BeautifulSoup, config) -> Dict[str, str]:
+    def extract_content_with_selectors(self, soup: BeautifulSoup, config, domain: Optional[str] = None) -> Dict[str, str]:
         """
         Extract content using domain-specific selectors
         
         Args:
             soup: BeautifulSoup object
             config: SelectorConfig object
+            domain: Source domain, for its cleanup patterns
             
         Returns:
             Dictionary with extracted content
@@ -221,7 +210,7 @@ class ContentScraper:
             
             # Clean all extracted text
             for key in result:
-                result[key] = self.clean_text(result[key])
+                result[key] = self.clean_text(result[key], domain)
             
             return result
             
@@ -229,6 +218,60 @@ class ContentScraper:
             logger.error(f"Error extracting content with selectors: {e}")
             return result
     
+    def extract_content_generic(self, html: str, domain: Optional[str] = None,
+                                url: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract content by text and link density, for pages without working selectors
+        
+        Args:
+            html: Decoded page
+            domain: Source domain, for its cleanup patterns
+            url: When given, the container the content was found in is learned for the URL pattern
+            
+        Returns:
+            Dictionary with extracted content (no author or date)
+        """
+        try:
+            extracted = extract_article(html)
+        except Exception as e:
+            logger.error(f"Error extracting content generically: {e}")
+            extracted = {'content': '', 'title': '', 'selector': None}
+        result = {
+            'content': self.clean_text(extracted['content'], domain),
+            'title': self.clean_text(extracted['title'], domain),
+            'author': '',
+            'date': ''
+        }
+        if domain and url and extracted['selector'] and len(result['content']) >= MIN_CONTENT_CHARS:
+            selector_learner.record(domain, url, extracted['selector'], True)
+        return result
+    
+    def extract_content_learned(self, html: str, config, domain: str, url: str) -> Dict[str, str]:
+        """
+        Extract content from the container of a learned selector, counting whether it still matches
+        
+        Args:
+            html: Decoded page
+            config: Learned SelectorConfig
+            domain, url: Where the selector was learned
+            
+        Returns:
+            Dictionary with extracted content (no author or date)
+        """
+        try:
+            extracted = extract_article_with_selector(html, config.content_selector)
+        except Exception as e:
+            logger.error(f"Error extracting content with learned selector {config.content_selector}: {e}")
+            extracted = {'content': '', 'title': ''}
+        result = {
+            'content': self.clean_text(extracted['content'], domain),
+            'title': self.clean_text(extracted['title'], domain),
+            'author': '',
+            'date': ''
+        }
+        selector_learner.record(domain, url, config.content_selector, len(result['content']) >= MIN_CONTENT_CHARS)
+        return result
+    
     def scrape_article_content(self, url: str, content_language: str = 'zh') -> Dict[str, any]:
         """
         Main method to scrape article content from URL
@@ -248,21 +291,40 @@ class ContentScraper:
             logger.info(f"Scraping {domain} ({subcategory}) - {url}")
             
             # Get appropriate selector configuration
-            config = get_selector_config(domain, subcategory)
+            config = get_selector_config(domain, subcategory, url)
             
             # Fetch page content
-            soup = self.fetch_page_content(url)
-            if not soup:
+            html = self.fetch_page_html(url, config.container_selector)
+            if not html:
                 return {
                     'success': False,
                     'error': 'Failed to fetch page content',
                     'url': url
                 }
             
-            # Extract content using selectors
-            extracted = self.extract_content_with_selectors(soup, config)
+            # Configured domains: their selectors. Learned ones: the container found on earlier articles.
+            # Other domains: the generic extractor (learning where the article is), since the broad
+            # default selectors often match nothing or the whole page. Each falls back to the other.
+            configured = domain in get_all_configured_domains()
+            
+            def extract_with_selectors():
+                return self.extract_content_with_selectors(BeautifulSoup(html, 'html.parser'), config, domain)
+            
+            if configured:
+                extracted = extract_with_selectors()
+            elif config.learned:
+                extracted = self.extract_content_learned(html, config, domain, url)
+            else:
+                extracted = self.extract_content_generic(html, domain, url)
+            if len(extracted['content']) < MIN_CONTENT_CHARS:
+                if configured or config.learned:
+                    fallback = self.extract_content_generic(html, domain, None if configured else url)
+                else:
+                    fallback = extract_with_selectors()
+                if len(fallback['content']) > len(extracted['content']):
+                    extracted = fallback
             
-            if not extracted['content'] or len(extracted['content']) < 100:
+            if not extracted['content'] or len(extracted['content']) < MIN_CONTENT_CHARS:
                 return {
                     'success': False,
                     'error': 'No substantial content found',
@@ -317,9 +379,7 @@ class ContentScraper:
             }
     
     def close(self):
-        """Close the session"""
-        if self.session:
-            self.session.close()
+        """Nothing to release: the shared HTTP client stays open for its other users"""
 
 # Utility function for standalone use
 def scrape_single_article(url: str, content_language: str = 'zh') -> Dict[str, any]:
@@ -0,0 +1,155 @@
+"""
+Encoding Resolver
+Finds the text encoding of a fetched page without running a detector over
+the whole body. In order:
+
+1. a byte order mark
+2. the charset of the Content-Type header
+3. <meta charset> / http-equiv Content-Type in the first META_SCAN_BYTES
+4. the encoding learned for the domain from its earlier pages, if the
+   sample (below) decodes with it
+5. UTF-8 if the sample is valid UTF-8, else a detector (charset_normalizer,
+   or chardet) on it
+
+The sample is DETECT_BYTES from the first non-ASCII byte on: unlabelled
+pages often start with more than DETECT_BYTES of ASCII scripts and styles,
+which any ASCII-compatible encoding decodes. A guess for such a page is not
+learned for the domain, and a body without non-ASCII bytes is read as UTF-8
+without learning anything.
+
+GB2312 and GBK are read as GB18030, their superset: pages labelled GB2312
+routinely contain characters only GBK/GB18030 have. A Latin-1 label is
+treated as no label, since Chinese sites send it by mistake and Latin-1
+decodes any bytes.
+"""
+
+import codecs
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+META_SCAN_BYTES = 4096
+DETECT_BYTES = 16384
+
+# Domains whose learned encoding is remembered
+MAX_LEARNED_DOMAINS = 1000
+
+# Encodings read as their superset
+SUPERSETS = {'gb2312': 'gb18030', 'gbk': 'gb18030'}
+# Labels that say nothing reliable about a Chinese page
+UNRELIABLE = {'iso8859-1', 'cp1252', 'ascii'}
+
+_CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """Python codec name of a charset label (superset applied), None if unknown"""
+    if not name:
+        return None
+    label = name.strip().lower()
+    if label.startswith('x-'):
+        label = label[2:]
+    try:
+        codec = codecs.lookup(label).name
+    except LookupError:
+        return None
+    return SUPERSETS.get(codec, codec)
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    match = _CHARSET_PARAM.search(content_type or '')
+    return normalize_encoding(match.group(1)) if match else None
+
+def charset_from_meta(body: bytes) -> Optional[str]:
+    match = _META_CHARSET.search(body[:META_SCAN_BYTES])
+    return normalize_encoding(match.group(1).decode('ascii', 'ignore')) if match else None
+
+def decodes(body: bytes, encoding: str) -> bool:
+    """Whether the first DETECT_BYTES are valid in the encoding (a cut-off last character is fine)"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(body[:DETECT_BYTES], final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+def sample(body: bytes) -> bytes:
+    """DETECT_BYTES of the body from its first non-ASCII byte on (empty if it has none)"""
+    match = _NON_ASCII.search(body)
+    return body[match.start():match.start() + DETECT_BYTES] if match else b''
+
+def detect(prefix: bytes) -> Optional[str]:
+    """Detector guess for a bounded prefix"""
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(prefix).best()
+        return normalize_encoding(best.encoding) if best else None
+    except ImportError:
+        import chardet
+        return normalize_encoding(chardet.detect(prefix).get('encoding'))
+
+
+class EncodingResolver:
+    """Resolves page encodings and remembers what each domain uses"""
+
+    def __init__(self, max_domains: int = MAX_LEARNED_DOMAINS):
+        self.max_domains = max_domains
+        self.learned: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def learn(self, domain: Optional[str], encoding: str):
+        if not domain:
+            return
+        with self._lock:
+            self.learned[domain] = encoding
+            self.learned.move_to_end(domain)
+            while len(self.learned) > self.max_domains:
+                self.learned.popitem(last=False)
+
+    def resolve(self, body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> str:
+        """Encoding of a page body"""
+        if body.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+
+        domain = urlparse(url).hostname if url else None
+        for labelled in (charset_from_content_type(content_type), charset_from_meta(body)):
+            if labelled and labelled not in UNRELIABLE:
+                self.learn(domain, labelled)
+                return labelled
+
+        window = sample(body)
+        learned = self.learned.get(domain) if domain else None
+        if learned and decodes(window, learned):
+            return learned
+        if not window:
+            # All ASCII: any ASCII-compatible encoding reads it, so it says nothing about the domain
+            return 'utf-8'
+
+        if decodes(window, 'utf-8'):
+            encoding = 'utf-8'
+        else:
+            encoding = detect(window)
+            if not encoding or encoding in UNRELIABLE or not decodes(window, encoding):
+                # Chinese pages that are not UTF-8 are almost always GB18030 (or a subset)
+                encoding = 'gb18030' if decodes(window, 'gb18030') else 'utf-8'
+        if _NON_ASCII.search(body, 0, DETECT_BYTES):
+            self.learn(domain, encoding)
+        return encoding
+
+    def decode(self, body: bytes, content_type: Optional[str] = None, url: Optional[str] = None) -> str:
+        """Page body as text (undecodable bytes replaced)"""
+        return body.decode(self.resolve(body, content_type, url), errors='replace')
+
+    def for_response(self, response) -> str:
+        """Encoding to set on a requests Response (instead of its full-body apparent_encoding)"""
+        return self.resolve(response.content, response.headers.get('Content-Type'), response.url)
+
+
+encoding_resolver = EncodingResolver()
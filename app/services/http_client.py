@@ -0,0 +1,213 @@
+"""
+HTTP Client
+The one HTTP client of the process, shared by every scraper and the content
+scraper, with a sync face (a requests Session) and an async face (an aiohttp
+ClientSession per event loop). Both keep connections alive in pools per host,
+cache DNS lookups, accept compressed responses (gzip/deflate, plus brotli
+when the optional brotli package is installed) and send the same browser
+headers.
+
+The sync DNS cache only serves the connection pools of this client's adapter
+(other libraries in the process resolve as usual); aiohttp has its own.
+"""
+
+import asyncio
+import importlib.util
+import socket
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Tuple
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+
+from app.services.metrics import SCRAPER_FETCH_SECONDS, record_fetch_latency
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/91.0.4472.124 Safari/537.36')
+ZH_ACCEPT_LANGUAGE = 'zh-CN,zh;q=0.9,en;q=0.8'
+EN_ACCEPT_LANGUAGE = 'en-US,en;q=0.5'
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Hosts with a pool of their own, and idle connections kept per host
+POOL_HOSTS = 32
+POOL_PER_HOST = 10
+# Concurrent connections of the async client
+ASYNC_CONNECTION_LIMIT = 100
+
+DNS_TTL_SECONDS = 300
+# Lookups kept by the sync DNS cache (expired ones are dropped first, then the oldest)
+DNS_CACHE_ENTRIES = 1024
+
+
+def brotli_available() -> bool:
+    """urllib3 and aiohttp decode br responses when one of these is installed"""
+    return any(importlib.util.find_spec(name) for name in ('brotli', 'brotlicffi'))
+
+def browser_headers() -> Dict[str, str]:
+    return {
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': ZH_ACCEPT_LANGUAGE,
+        'Accept-Encoding': 'gzip, deflate, br' if brotli_available() else 'gzip, deflate',
+        'Connection': 'keep-alive',
+    }
+
+
+class DNSCache:
+    """Bounded TTL cache of socket.getaddrinfo results (successful lookups only)"""
+
+    def __init__(self, ttl_seconds: float = DNS_TTL_SECONDS, max_entries: int = DNS_CACHE_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Tuple[float, list]] = {}
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        addresses = socket.getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl_seconds, addresses)
+            if len(self._entries) > self.max_entries:
+                self._evict(now)
+        return addresses
+
+    def _evict(self, now: float):
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        # Oldest lookups first (insertion order)
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = DNSCache()
+
+
+class _CachedDNSConnectionMixin:
+    """urllib3 connection that resolves its host through dns_cache and tries each address in turn"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = dns_cache.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        error = None
+        try:
+            for address in dict.fromkeys(info[4][0] for info in addresses):
+                # urllib3 connects to _dns_host; it is restored before TLS checks the certificate against it
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+
+class CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+class CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """Pooled adapter whose connections resolve through dns_cache (proxied requests resolve at the proxy)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CachedDNSHTTPConnectionPool,
+            'https': CachedDNSHTTPSConnectionPool,
+        }
+
+
+def new_http_session() -> requests.Session:
+    """A session configured like the shared one (for callers that need their own transport)"""
+    session = requests.Session()
+    adapter = CachedDNSAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(browser_headers())
+    session.hooks['response'].append(record_fetch_latency)
+    return session
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """The process-wide sync client"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = new_http_session()
+    return _http_session
+
+
+# aiohttp sessions belong to one event loop
+_async_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _fetch_trace_config():
+    """Fetch latency of the async client in the same metric as record_fetch_latency"""
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.started = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        SCRAPER_FETCH_SECONDS.observe(time.perf_counter() - context.started,
+                                      host=params.url.host or "unknown", status=params.response.status)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+async def get_async_session():
+    """The async client of the running event loop"""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=ASYNC_CONNECTION_LIMIT, limit_per_host=POOL_PER_HOST,
+                                         ttl_dns_cache=DNS_TTL_SECONDS)
+        session = aiohttp.ClientSession(connector=connector, headers=browser_headers(),
+                                        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+                                        trace_configs=[_fetch_trace_config()])
+        _async_sessions[loop] = session
+    return session
+
+async def close_async_session():
+    """Close the running loop's async client (the next get_async_session opens a new one)"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
@@ -0,0 +1,86 @@
+"""
+Ingestion Service
+Persists scraped article headlines. Titles are stored immediately with a
+translation_status; translation happens later in the title translation stage.
+Each new article is assigned to a story cluster as it is inserted.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.models import News
+from app.services.story_clustering import StoryClusterer
+from app.services.title_translation import initial_translation_fields
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def save_articles(db: Session, articles: List[Dict], collection_date: Optional[date] = None,
+                  update_existing_sections: bool = False) -> Dict[str, int]:
+    """
+    Insert scraped articles that are not in the database yet
+
+    Args:
+        db: Database session (the caller commits)
+        articles: Scraped article dictionaries (title, source_url, source_section, collection_date)
+        collection_date: Override the collection date of every article
+        update_existing_sections: Fill in source_section on existing rows that have none
+
+    Returns:
+        Dictionary with new, updated, duplicate and clustered counts
+    """
+    new_count = 0
+    updated_count = 0
+    duplicate_count = 0
+    clustered_count = 0
+    clusterer = StoryClusterer(db)
+
+    for article in articles:
+        # Check if article already exists by URL only (across all dates)
+        existing_by_url = db.query(News).filter(News.source_url == article['source_url']).first()
+
+        if existing_by_url:
+            if update_existing_sections and not existing_by_url.source_section and article.get('source_section'):
+                existing_by_url.source_section = article.get('source_section')
+                updated_count += 1
+            else:
+                duplicate_count += 1
+                logger.info(f"Article already exists: {article['source_url']}")
+            continue
+
+        try:
+            # A failing row rolls back to its savepoint only, not the batch's earlier rows
+            with db.begin_nested():
+                news_item = News(
+                    title=article['title'],
+                    source_url=article['source_url'],
+                    source_section=article.get('source_section'),
+                    collection_date=collection_date or article['collection_date'],
+                    **initial_translation_fields(article)
+                )
+                db.add(news_item)
+                db.flush()  # Check for constraint violations before commit
+        except Exception as db_error:
+            logger.warning(f"Database constraint violation for article: {article['source_url']} - {str(db_error)}")
+            duplicate_count += 1
+            continue
+        new_count += 1
+
+        try:
+            if clusterer.assign(news_item) != news_item.id:
+                clustered_count += 1
+        except Exception as cluster_error:
+            # Clustering is best effort; the article stays unclustered
+            logger.warning(f"Story clustering failed for article: {article['source_url']} - {str(cluster_error)}")
+
+    return {
+        "new_articles": new_count,
+        "updated_articles": updated_count,
+        "duplicates_skipped": duplicate_count,
+        "clustered_articles": clustered_count,
+        "total_processed": len(articles)
+    }
@@ -0,0 +1,109 @@
+"""
+Scrape Leases
+Cross-process single-flight locking backed by the scrape_leases table, so
+cron/scheduler runs, API fetches and every gunicorn worker never scrape the
+same section at the same time. A lease expires after its TTL, so a crashed
+holder cannot block a section forever. Works the same on SQLite and
+PostgreSQL: acquiring is an atomic conditional UPDATE or a unique INSERT.
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import logging
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.models import ScrapeLease
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A holder that dies is replaced after this long
+LEASE_TTL_SECONDS = 300
+
+# How often a waiter checks whether the holder finished
+WAIT_POLL_SECONDS = 0.5
+
+def new_owner_id() -> str:
+    """Unique holder id for one engine/process"""
+    return uuid.uuid4().hex
+
+def _session(session_factory=None):
+    if session_factory is None:
+        from app.database import SessionLocal
+        session_factory = SessionLocal
+    return session_factory()
+
+def acquire_lease(key: str, owner: str, ttl_seconds: int = LEASE_TTL_SECONDS, session_factory=None) -> bool:
+    """
+    Try to take a lease without waiting
+
+    Returns:
+        True if the caller now holds the lease
+    """
+    db = _session(session_factory)
+    try:
+        now = datetime.utcnow()
+        values = {"owner": owner, "acquired_at": now, "expires_at": now + timedelta(seconds=ttl_seconds)}
+
+        # Take over a free (released or expired) lease
+        taken = db.query(ScrapeLease).filter(
+            ScrapeLease.lease_key == key,
+            ScrapeLease.expires_at <= now
+        ).update(values, synchronize_session=False)
+        if taken:
+            db.commit()
+            return True
+
+        # First use of this key: the unique constraint lets only one inserter win
+        db.add(ScrapeLease(lease_key=key, **values))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+def release_lease(key: str, owner: str, result: Optional[Dict] = None, session_factory=None):
+    """Free a lease held by owner and publish the result for anyone who waited on it"""
+    db = _session(session_factory)
+    try:
+        db.query(ScrapeLease).filter(
+            ScrapeLease.lease_key == key,
+            ScrapeLease.owner == owner
+        ).update({
+            "expires_at": datetime.utcnow(),
+            "result": json.dumps(result, default=str) if result is not None else None
+        }, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not release lease {key}: {e}")
+    finally:
+        db.close()
+
+def wait_for_release(key: str, timeout_seconds: float, session_factory=None) -> Optional[Dict]:
+    """
+    Wait for the current holder of a lease to finish (blocking: keep it off the event loop)
+
+    Returns:
+        The holder's published result ({} if it published none), or None on timeout
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        db = _session(session_factory)
+        try:
+            lease = db.query(ScrapeLease).filter(ScrapeLease.lease_key == key).first()
+            if lease is None or lease.expires_at <= datetime.utcnow():
+                return json.loads(lease.result) if lease is not None and lease.result else {}
+        finally:
+            db.close()
+
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(WAIT_POLL_SECONDS)
@@ -0,0 +1,151 @@
+"""
+Memory Budget
+Keeps the web process within a resident-memory (RSS) budget on small
+droplets. When the budget is exceeded, registered shedders drop in-process
+caches and memory is returned to the OS; while the process is still over
+budget, new background jobs (title translation, summaries) are refused
+instead of pushing it into the OOM killer.
+
+LOW_MEMORY_MODE=1 enables the low-memory runtime (see digitalocean_deploy.md):
+scraping runs in a short-lived subprocess and the budget defaults to
+DEFAULT_LOW_MEMORY_BUDGET_MB. MEMORY_BUDGET_MB sets the budget explicitly
+(0 disables it).
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOW_MEMORY_BUDGET_MB = 300
+
+# RSS is sampled at most this often by the request middleware
+CHECK_INTERVAL_SECONDS = 5
+
+def low_memory_mode() -> bool:
+    return os.getenv('LOW_MEMORY_MODE', '').lower() in ('1', 'true', 'yes', 'on')
+
+def configured_budget_mb() -> Optional[float]:
+    """MEMORY_BUDGET_MB, or the low-memory default (None = no budget)"""
+    value = os.getenv('MEMORY_BUDGET_MB')
+    if value:
+        return float(value) or None
+    return DEFAULT_LOW_MEMORY_BUDGET_MB if low_memory_mode() else None
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Not Linux: peak RSS is the best available figure
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+def _release_freed_memory():
+    """Collect garbage and hand freed heap pages back to the OS (glibc only)"""
+    gc.collect()
+    libc_name = ctypes.util.find_library('c')
+    if libc_name:
+        try:
+            ctypes.CDLL(libc_name).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+class MemoryBudget:
+    """RSS budget with cache shedding and background-job admission"""
+
+    def __init__(self, budget_mb: Optional[float] = None, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.budget_mb = budget_mb
+        self.check_interval = check_interval
+        self._shedders: List[Tuple[str, Callable[[], None]]] = []
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.over_budget = False
+        self.last_rss_mb: Optional[float] = None
+        self.sheds = 0
+        self.refused_jobs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.budget_mb)
+
+    def register_shedder(self, name: str, shed: Callable[[], None]):
+        """Register a callable that drops an in-process cache when memory is short"""
+        self._shedders.append((name, shed))
+
+    def shed(self):
+        """Run every shedder and return freed memory to the OS"""
+        for name, shed in self._shedders:
+            try:
+                shed()
+            except Exception as e:
+                logger.warning(f"Memory shedder {name} failed: {e}")
+        _release_freed_memory()
+        self.sheds += 1
+
+    def check(self, force: bool = False) -> bool:
+        """
+        Sample RSS (rate limited) and shed caches if over budget
+
+        Returns:
+            True while the process is within its budget
+        """
+        if not self.enabled:
+            return True
+
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return not self.over_budget
+        if not self._lock.acquire(blocking=False):
+            return not self.over_budget
+        try:
+            self._last_check = now
+            rss = current_rss_mb()
+            if rss > self.budget_mb:
+                before = rss
+                self.shed()
+                rss = current_rss_mb()
+                logger.warning(f"RSS {before:.0f} MB over budget of {self.budget_mb:.0f} MB; "
+                               f"shed caches, now {rss:.0f} MB")
+            self.last_rss_mb = rss
+            self.over_budget = rss > self.budget_mb
+            return not self.over_budget
+        finally:
+            self._lock.release()
+
+    def allow_background_job(self, name: str) -> bool:
+        """Whether a new background job may start (refused while over budget)"""
+        if self.check(force=True):
+            return True
+        self.refused_jobs += 1
+        logger.warning(f"Refusing background job '{name}': RSS {self.last_rss_mb:.0f} MB "
+                       f"over budget of {self.budget_mb:.0f} MB")
+        return False
+
+    def status(self) -> Dict:
+        return {
+            "low_memory_mode": low_memory_mode(),
+            "budget_mb": self.budget_mb,
+            "rss_mb": round(current_rss_mb(), 1),
+            "over_budget": self.over_budget,
+            "sheds": self.sheds,
+            "refused_jobs": self.refused_jobs
+        }
+
+
+# Process-wide budget used by the API
+memory_budget = MemoryBudget(configured_budget_mb())
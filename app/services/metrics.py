@@ -0,0 +1,298 @@
+"""
+Metrics
+In-process counters and histograms exported at /metrics in the Prometheus
+text format: request latency per route, database queries per request
+(timed by the listeners in sql_profiler.py),
+scraper fetch latency per host, translator call latency, cache hit rates,
+and the RSS and garbage collector figures of the process.
+
+Every process (each gunicorn worker, the scheduler service, scrape child
+processes) publishes a snapshot of its own metrics to the shared cache
+(see cache.py), so a scrape of /metrics on any worker returns the figures
+of all of them, told apart by the `process` label.
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+import logging
+
+from app.services.memory_budget import current_rss_mb, memory_budget
+from app.services.sql_profiler import QueryStats
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# How often a process publishes its snapshot; snapshots of processes that stopped expire
+PUBLISH_INTERVAL_SECONDS = 15
+SNAPSHOT_TTL_SECONDS = 4 * PUBLISH_INTERVAL_SECONDS
+
+PROCESSES_KEY = "metrics:processes"
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _label_values(labelnames: Sequence[str], labels: Dict[str, object]) -> Labels:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """Cumulative histogram with labels"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[Labels, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append((self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((self.name + "_bucket", {**labels, "le": "+Inf"}, count))
+                samples.append((self.name + "_sum", labels, total))
+                samples.append((self.name + "_count", labels, count))
+        return samples
+
+
+class GaugeCallback:
+    """Gauge (or counter) whose samples are read when the metrics are collected"""
+
+    def __init__(self, name: str, help: str, read: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+                 type: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.read = read
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, labels, value) for labels, value in self.read()]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def collect(self) -> Dict[str, List[Sample]]:
+        """Samples of every metric, by metric name"""
+        collected = {}
+        for metric in self.metrics:
+            try:
+                collected[metric.name] = metric.samples()
+            except Exception as e:
+                logger.warning(f"Could not collect metric {metric.name}: {e}")
+        return collected
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Time to handle a request, by route template",
+    ("method", "route", "status")))
+HTTP_REQUEST_DB_QUERIES = REGISTRY.register(Histogram(
+    "http_request_db_queries", "Database queries issued per request",
+    ("route",), buckets=QUERY_COUNT_BUCKETS))
+DB_QUERIES = REGISTRY.register(Counter(
+    "db_queries_total", "Database queries issued while handling requests", ("route",)))
+DB_QUERY_SECONDS = REGISTRY.register(Counter(
+    "db_query_duration_seconds_total", "Time spent in database queries while handling requests", ("route",)))
+SCRAPER_FETCH_SECONDS = REGISTRY.register(Histogram(
+    "scraper_fetch_duration_seconds", "Time until a fetched page's response headers arrived, by host",
+    ("host", "status")))
+TRANSLATOR_SECONDS = REGISTRY.register(Histogram(
+    "translator_request_duration_seconds", "Translator API call latency",
+    ("operation", "status")))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total", "Shared cache lookups by key namespace and result (hit or miss)",
+    ("namespace", "result")))
+
+def _read_gc_stats():
+    for generation, stats in enumerate(gc.get_stats()):
+        yield {"generation": str(generation), "stat": "collections"}, stats["collections"]
+        yield {"generation": str(generation), "stat": "collected"}, stats["collected"]
+        yield {"generation": str(generation), "stat": "uncollectable"}, stats["uncollectable"]
+
+REGISTRY.register(GaugeCallback(
+    "process_resident_memory_bytes", "Resident memory of the process",
+    lambda: [({}, current_rss_mb() * 1024 * 1024)]))
+REGISTRY.register(GaugeCallback(
+    "python_gc_total", "Garbage collector collections and collected/uncollectable objects per generation",
+    _read_gc_stats, type="counter"))
+REGISTRY.register(GaugeCallback(
+    "python_gc_pending_objects", "Allocations counted towards the next collection of each generation",
+    lambda: [({"generation": str(generation)}, count) for generation, count in enumerate(gc.get_count())]))
+REGISTRY.register(GaugeCallback(
+    "memory_budget_bytes", "RSS budget of the process (0 = none)",
+    lambda: [({}, (memory_budget.budget_mb or 0) * 1024 * 1024)]))
+REGISTRY.register(GaugeCallback(
+    "memory_budget_sheds_total", "Times caches were shed because the process was over its RSS budget",
+    lambda: [({}, memory_budget.sheds)], type="counter"))
+REGISTRY.register(GaugeCallback(
+    "memory_budget_refused_jobs_total", "Background jobs refused while over the RSS budget",
+    lambda: [({}, memory_budget.refused_jobs)], type="counter"))
+
+
+def record_cache_lookup(key: str, hit: bool):
+    namespace = key.split(":", 1)[0]
+    # The snapshots published below are not cache traffic of the app
+    if namespace != "metrics":
+        CACHE_REQUESTS.inc(namespace=namespace, result="hit" if hit else "miss")
+
+def record_fetch_latency(response, *args, **kwargs):
+    """requests response hook: fetch latency of the response's host"""
+    host = urlparse(response.url).hostname or "unknown"
+    SCRAPER_FETCH_SECONDS.observe(response.elapsed.total_seconds(), host=host, status=response.status_code)
+    return response
+
+
+def observe_request(request, status: int, seconds: float, stats: QueryStats):
+    """Record a handled request under its route template (not the raw path, which has dates and ids)"""
+    route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+    HTTP_REQUEST_SECONDS.observe(seconds, method=request.method, route=route, status=status)
+    HTTP_REQUEST_DB_QUERIES.observe(stats.queries, route=route)
+    if stats.queries:
+        DB_QUERIES.inc(stats.queries, route=route)
+        DB_QUERY_SECONDS.inc(stats.seconds, route=route)
+
+
+# Snapshots shared between processes
+_process_role = "web"
+
+def set_process_role(role: str):
+    """Name the kind of process in the `process` label (web, scheduler, scrape, ...)"""
+    global _process_role
+    _process_role = role
+
+def process_label() -> str:
+    return f"{_process_role}-{os.getpid()}"
+
+def _snapshot_key(label: str) -> str:
+    return f"metrics:process:{label}"
+
+def publish():
+    """Store this process' samples in the shared cache for /metrics on any worker"""
+    from app.services.cache import get_cache
+
+    cache = get_cache()
+    label = process_label()
+    try:
+        cache.set(_snapshot_key(label), REGISTRY.collect(), SNAPSHOT_TTL_SECONDS)
+        now = time.time()
+        processes = cache.get(PROCESSES_KEY) or {}
+        processes = {name: expires for name, expires in processes.items() if expires > now}
+        processes[label] = now + SNAPSHOT_TTL_SECONDS
+        cache.set(PROCESSES_KEY, processes, SNAPSHOT_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not publish metrics: {e}")
+
+def start_publisher(role: Optional[str] = None, interval_seconds: float = PUBLISH_INTERVAL_SECONDS):
+    """Publish this process' snapshot periodically from a daemon thread"""
+    if role:
+        set_process_role(role)
+
+    def loop():
+        while True:
+            publish()
+            time.sleep(interval_seconds)
+
+    threading.Thread(target=loop, name="metrics-publisher", daemon=True).start()
+
+def collect_all() -> Dict[str, Dict[str, List[Sample]]]:
+    """Samples of every live process by process label, this one read fresh"""
+    from app.services.cache import get_cache
+
+    label = process_label()
+    snapshots = {}
+    try:
+        cache = get_cache()
+        others = [name for name in (cache.get(PROCESSES_KEY) or {}) if name != label]
+        found = cache.get_many([_snapshot_key(name) for name in others])
+        snapshots = {name: found[_snapshot_key(name)] for name in others if _snapshot_key(name) in found}
+    except Exception as e:
+        logger.warning(f"Could not read published metrics: {e}")
+    snapshots[label] = REGISTRY.collect()
+    return snapshots
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def render_metrics() -> str:
+    """All processes' metrics in the Prometheus text exposition format"""
+    snapshots = collect_all()
+    lines = []
+    for metric in REGISTRY.metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for label in sorted(snapshots):
+            for name, labels, value in snapshots[label].get(metric.name, []):
+                lines.append(f"{name}{_format_labels({'process': label, **labels})} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,119 @@
+"""
+Page Cache
+Rendered calendar and date pages kept in the shared cache (see cache.py), so
+every worker serves the same copy. Entries are keyed by route and date/month
+and tagged with the dates they show; any committed change to a News row of a
+date bumps the version of that date's and month's tags, which makes the
+pages stale in every process that installed the invalidation hook. Responses
+carry an ETag and Cache-Control so browsers and an nginx front can serve
+repeats without reaching Python. Past dates rarely change and are cached
+longer than today's page, which is still being filled in.
+"""
+
+import hashlib
+from datetime import date, datetime
+from itertools import chain
+from typing import Callable, Iterable, Set, Tuple
+import logging
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import News
+from app.services.cache import get_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How long a rendered page is kept; invalidation normally replaces it much sooner
+PAST_TTL_SECONDS = 6 * 3600
+CURRENT_TTL_SECONDS = 600
+
+# Browser/proxy max-age; pages that are still changing are always revalidated
+PAST_MAX_AGE_SECONDS = 300
+
+
+def date_tag(day: date) -> str:
+    return f"date:{day.isoformat()}"
+
+def month_tag(year: int, month: int) -> str:
+    return f"month:{year:04d}-{month:02d}"
+
+def tags_for_dates(dates: Iterable[date]) -> Set[str]:
+    """Tags of the pages showing any of the given dates"""
+    tags = set()
+    for day in dates:
+        tags.add(date_tag(day))
+        tags.add(month_tag(day.year, day.month))
+    return tags
+
+def invalidate_dates(dates: Iterable[date]):
+    """Make the cached pages of the dates (and their months) stale in every worker"""
+    get_cache().invalidate_tags(tags_for_dates(dates))
+
+
+def cached_page(request: Request, key: Tuple, tags: Set[str], is_current: bool,
+                render: Callable[[], Response]) -> Response:
+    """
+    Serve a page from the cache, rendering and storing it on a miss
+
+    Args:
+        request: Incoming request (for If-None-Match and the host in the key)
+        key: Route-specific cache key
+        tags: Date/month tags of the data shown on the page
+        is_current: Page shows today / the current month and may still change
+        render: Renders the page (a TemplateResponse) on a miss
+    """
+    cache = get_cache()
+    # url_for() makes the body depend on the host the page was requested on
+    cache_key = "page:" + ":".join(str(part) for part in key) + ":" + str(request.base_url)
+    versions = cache.tag_versions(tags)
+    page = cache.get(cache_key)
+    if page is None or page.get("versions") != versions:
+        response = render()
+        if response.status_code != 200:
+            return response
+        page = {
+            "etag": '"' + hashlib.sha1(response.body).hexdigest() + '"',
+            "body": response.body.decode('utf-8'),
+            "versions": versions
+        }
+        cache.set(cache_key, page, CURRENT_TTL_SECONDS if is_current else PAST_TTL_SECONDS)
+
+    headers = {
+        "ETag": page["etag"],
+        "Cache-Control": "no-cache" if is_current else f"public, max-age={PAST_MAX_AGE_SECONDS}"
+    }
+    if page["etag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page["body"], headers=headers)
+
+
+def _collect_changed_dates(session: Session, flush_context):
+    """Remember the collection dates of News rows written in this transaction"""
+    dates = session.info.setdefault("page_cache_dates", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, News) and obj.collection_date:
+            day = obj.collection_date
+            dates.add(day.date() if isinstance(day, datetime) else day)
+
+def _invalidate_committed(session: Session):
+    dates = session.info.pop("page_cache_dates", None)
+    if dates:
+        try:
+            invalidate_dates(dates)
+        except Exception as e:
+            logger.warning(f"Could not invalidate cached pages: {e}")
+
+def _forget_rolled_back(session: Session):
+    session.info.pop("page_cache_dates", None)
+
+def install_invalidation():
+    """Invalidate cached pages whenever a transaction that wrote News rows commits"""
+    if not event.contains(Session, "after_flush", _collect_changed_dates):
+        event.listen(Session, "after_flush", _collect_changed_dates)
+        event.listen(Session, "after_commit", _invalidate_committed)
+        event.listen(Session, "after_rollback", _forget_rolled_back)
@@ -0,0 +1,208 @@
+"""
+Page Fetch
+Bounded page downloads for the content scraper and the scrapers' async path,
+so one huge or misconfigured page cannot spike memory:
+
+- URLs of attachments (PDF, Office documents, archives, media) are skipped
+  without a request
+- the Content-Type is checked from the response headers, before the body
+- the body is streamed and cut at the domain's maximum size
+- given the selector of the article container, an incremental parser watches
+  the stream and the download stops as soon as that element has closed
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+from app.services.http_client import REQUEST_TIMEOUT_SECONDS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 16384
+
+ATTACHMENT_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.wps', '.et', '.zip', '.rar', '.7z',
+    '.jpg', '.jpeg', '.png', '.gif', '.mp3', '.mp4', '.avi', '.flv'
+)
+PAGE_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/xml', 'application/xml', 'text/plain')
+
+# Elements without an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+    'track', 'wbr'
+}
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?((?:[#.][\w-]+)*)$')
+
+
+def is_attachment_url(url: str) -> bool:
+    return urlparse(url).path.lower().endswith(ATTACHMENT_EXTENSIONS)
+
+def is_page_content_type(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type is a page worth parsing (a missing one is given the benefit of the doubt)"""
+    if not content_type:
+        return True
+    return content_type.split(';')[0].strip().lower() in PAGE_CONTENT_TYPES
+
+SimpleSelector = Tuple[Optional[str], Optional[str], List[str]]
+
+def parse_simple_selectors(selectors: str) -> List[SimpleSelector]:
+    """
+    (tag, id, classes) of comma separated simple selectors: tag, #id and .class
+    parts (e.g. "div.show_text, div#detail")
+
+    Raises:
+        ValueError: Anything else (combinators, attributes, pseudo-classes)
+    """
+    parsed = []
+    for selector in selectors.split(','):
+        match = _SIMPLE_SELECTOR.match(selector.strip())
+        if not match or not selector.strip():
+            raise ValueError(f"Unsupported container selector: {selector!r}")
+        tag, rest = match.group(1), match.group(2)
+        ids = re.findall(r'#([\w-]+)', rest)
+        parsed.append((tag.lower() if tag else None, ids[0] if ids else None, re.findall(r'\.([\w-]+)', rest)))
+    return parsed
+
+def matches_simple_selectors(selectors: List[SimpleSelector], tag: str, attributes: Dict) -> bool:
+    classes = (attributes.get('class') or '').split()
+    return any((not want_tag or want_tag == tag)
+               and (not want_id or attributes.get('id') == want_id)
+               and all(c in classes for c in want_classes)
+               for want_tag, want_id, want_classes in selectors)
+
+
+class ContainerWatcher(HTMLParser):
+    """
+    Incremental parser that notices when the article container has closed
+
+    Selectors are simple ones (parse_simple_selectors). Chunks are read as
+    Latin-1: tags and attributes are ASCII, and '<' never occurs inside a
+    UTF-8 or GB18030 multi-byte character, so no encoding is needed to follow
+    the structure.
+    """
+
+    def __init__(self, selectors: str):
+        super().__init__(convert_charrefs=False)
+        self.selectors = parse_simple_selectors(selectors)
+        self.open_tags: List[str] = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+        if self.open_tags or matches_simple_selectors(self.selectors, tag, dict(attrs)):
+            self.open_tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if self.done or tag not in self.open_tags:
+            return
+        # Closing an element also closes the ones left open inside it (<p> without </p>)
+        while self.open_tags.pop() != tag:
+            pass
+        if not self.open_tags:
+            self.done = True
+
+    def feed_bytes(self, chunk: bytes) -> bool:
+        """Feed a chunk of the page; True once the container has closed"""
+        if not self.done:
+            self.feed(chunk.decode('latin-1'))
+        return self.done
+
+
+def _watcher(container_selector: Optional[str]) -> Optional[ContainerWatcher]:
+    if not container_selector:
+        return None
+    try:
+        return ContainerWatcher(container_selector)
+    except ValueError as e:
+        logger.warning(str(e))
+        return None
+
+def _page(url: str, status: int, content_type: Optional[str], chunks: List[bytes], truncated: bool,
+          stopped_early: bool) -> Dict:
+    return {'url': url, 'status': status, 'content_type': content_type, 'body': b''.join(chunks),
+            'truncated': truncated, 'stopped_early': stopped_early}
+
+def fetch_page(session, url: str, max_bytes: int, container_selector: Optional[str] = None,
+               headers: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Stream a page through a requests session
+
+    Args:
+        session: requests Session (the shared HTTP client)
+        url: Page URL
+        max_bytes: Body bytes kept at most (decompressed); the rest is never downloaded
+        container_selector: Stop once this element has closed
+        headers: Extra request headers
+
+    Returns:
+        {'url', 'status', 'content_type', 'body', 'truncated', 'stopped_early'},
+        or None for attachments and non-page content types
+
+    Raises:
+        requests.RequestException: Failed request or error status
+    """
+    if is_attachment_url(url):
+        logger.info(f"Skipping attachment {url}")
+        return None
+
+    with session.get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type')
+        if not is_page_content_type(content_type):
+            logger.info(f"Skipping {url}: Content-Type {content_type}")
+            return None
+
+        watcher = _watcher(container_selector)
+        chunks, size, truncated, stopped_early = [], 0, False, False
+        for chunk in response.iter_content(CHUNK_BYTES):
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if watcher and watcher.feed_bytes(chunk):
+                stopped_early = True
+                break
+
+    if truncated:
+        logger.warning(f"Cut {url} at {max_bytes} bytes")
+    return _page(response.url, response.status_code, content_type, chunks, truncated, stopped_early)
+
+async def fetch_page_async(session, url: str, max_bytes: int,
+                           container_selector: Optional[str] = None) -> Optional[Dict]:
+    """fetch_page for an aiohttp ClientSession (raises aiohttp.ClientResponseError on error statuses)"""
+    if is_attachment_url(url):
+        logger.info(f"Skipping attachment {url}")
+        return None
+
+    async with session.get(url) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type')
+        if not is_page_content_type(content_type):
+            logger.info(f"Skipping {url}: Content-Type {content_type}")
+            return None
+
+        watcher = _watcher(container_selector)
+        chunks, size, truncated, stopped_early = [], 0, False, False
+        async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if watcher and watcher.feed_bytes(chunk):
+                stopped_early = True
+                break
+
+    if truncated:
+        logger.warning(f"Cut {url} at {max_bytes} bytes")
+    return _page(str(response.url), response.status, content_type, chunks, truncated, stopped_early)
@@ -0,0 +1,234 @@
+"""
+Scrape Scheduler
+Long-running replacement for the twice-daily cron scrape. Every section of
+every scraper is polled on its own interval by one process that keeps the
+scraper instances (and their HTTP sessions), the crawl frontier and the
+translator warm between polls. Intervals adapt to each section's publish
+rate: polls that find nothing back off exponentially, polls that find
+several new items speed up, within fixed bounds. Per-section schedule and
+last-run statistics are stored in the section_schedules table for the API.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import schedule
+from sqlalchemy.orm import Session
+
+from app.models.models import SectionSchedule
+from app.scrapers.frontier import CrawlFrontier
+from app.services.scrape_engine import SECTION_BUSY, ScrapeEngine
+from app.services.title_translation import TitleTranslationService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MINUTES = 60
+
+# Adaptive interval bounds and factors
+MIN_INTERVAL_MINUTES = 15
+MAX_INTERVAL_MINUTES = 24 * 60
+BACKOFF_FACTOR = 2.0   # Applied after a poll with no new items
+SPEEDUP_FACTOR = 0.5   # Applied after a poll with more than TARGET_NEW_ITEMS
+TARGET_NEW_ITEMS = 2   # New items per poll considered "about right"
+
+# Weight of the latest poll in the running average of new items per poll
+AVERAGE_WEIGHT = 0.3
+
+# Spread the first polls after startup so all sections don't hit the network at once
+STARTUP_STAGGER_SECONDS = 5
+
+
+def next_interval(interval_minutes: int, new_items: int,
+                  min_minutes: int = MIN_INTERVAL_MINUTES, max_minutes: int = MAX_INTERVAL_MINUTES) -> int:
+    """
+    Adapt a section's poll interval to the result of its last poll
+
+    Quiet sections back off exponentially, busy ones speed up; a poll that
+    found a few items keeps the interval.
+    """
+    if new_items == 0:
+        interval = interval_minutes * BACKOFF_FACTOR
+    elif new_items > TARGET_NEW_ITEMS:
+        interval = interval_minutes * SPEEDUP_FACTOR
+    else:
+        interval = interval_minutes
+    return int(min(max(round(interval), min_minutes), max_minutes))
+
+
+class ScrapeScheduler:
+    """Polls each section on its own schedule inside one long-running process"""
+
+    def __init__(self, session_factory=None, default_interval_minutes: int = DEFAULT_INTERVAL_MINUTES,
+                 translate_titles: bool = True, min_interval_minutes: int = MIN_INTERVAL_MINUTES,
+                 max_interval_minutes: int = MAX_INTERVAL_MINUTES):
+        """
+        Args:
+            session_factory: Callable returning a database session (defaults to SessionLocal)
+            default_interval_minutes: Starting poll interval of sections without a stored schedule
+            translate_titles: Run the title translation stage after polls that found new articles
+            min_interval_minutes: Fastest a busy section is polled
+            max_interval_minutes: Slowest a quiet section is polled
+        """
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+        self.default_interval_minutes = default_interval_minutes
+        self.translate_titles = translate_titles
+        self.min_interval_minutes = min_interval_minutes
+        self.max_interval_minutes = max_interval_minutes
+        self.scheduler = schedule.Scheduler()
+        self.jobs: Dict[str, schedule.Job] = {}
+        # Scraper instances are created once and reused for every poll; sections
+        # being scraped by the API or another process are skipped, not waited for
+        self.engine = ScrapeEngine(wait_seconds=0, session_factory=session_factory)
+        self.translation = None
+
+    def sections(self) -> List[Tuple[str, str, str]]:
+        """(source, section, page URL) of every section of every registered scraper"""
+        return [(source_name, section_name, self.engine.section_url(source_name, section_name))
+                for source_name, section_name in self.engine.sections()]
+
+    def sync_schedules(self, db: Session) -> List[SectionSchedule]:
+        """Create schedule rows for sections that have none yet"""
+        rows = {(row.source_name, row.section_name): row for row in db.query(SectionSchedule).all()}
+        result = []
+        for source_name, section_name, page_url in self.sections():
+            row = rows.get((source_name, section_name))
+            if row is None:
+                row = SectionSchedule(source_name=source_name, section_name=section_name,
+                                      interval_minutes=self.default_interval_minutes,
+                                      last_new_items=0, avg_new_items=0.0, total_runs=0, total_new_items=0)
+                db.add(row)
+            row.page_url = page_url
+            result.append(row)
+        db.commit()
+        return result
+
+    def schedule_section(self, source_name: str, section_name: str, interval_minutes: int,
+                         first_run_in: Optional[float] = None):
+        """(Re)register the poll job of a section"""
+        tag = f"{source_name} - {section_name}"
+        self.scheduler.clear(tag)
+        job = self.scheduler.every(interval_minutes).minutes.do(self.poll_section, source_name, section_name)
+        job.tag(tag)
+        if first_run_in is not None:
+            job.next_run = datetime.now() + timedelta(seconds=first_run_in)
+        self.jobs[tag] = job
+        return job
+
+    def start(self):
+        """Load the frontier and register one job per section"""
+        db = self.session_factory()
+        try:
+            self.engine.set_frontier(CrawlFrontier.load(db))
+            rows = self.sync_schedules(db)
+
+            now = datetime.utcnow()
+            for i, row in enumerate(rows):
+                # Resume the stored schedule; overdue sections run shortly after startup
+                due_in = (row.next_run_at - now).total_seconds() if row.next_run_at else 0
+                self.schedule_section(row.source_name, row.section_name, row.interval_minutes,
+                                      first_run_in=max(due_in, i * STARTUP_STAGGER_SECONDS))
+            logger.info(f"Scheduler started with {len(rows)} sections")
+        finally:
+            db.close()
+
+    def poll_section(self, source_name: str, section_name: str) -> Dict[str, int]:
+        """Scrape one section, store its new articles and record the run"""
+        started = time.monotonic()
+        db = self.session_factory()
+        counts = {"new_articles": 0}
+        error = None
+        try:
+            counts = self.engine.scrape_section(db, source_name, section_name)
+            if counts["status"] == SECTION_BUSY:
+                # Someone else is polling it right now: keep the schedule as it is
+                logger.info(f"Skipping poll of {source_name} - {section_name}: already being scraped")
+                db.close()
+                return counts
+
+            if counts["new_articles"] and self.translate_titles:
+                if self.translation is None:
+                    self.translation = TitleTranslationService()
+                self.translation.run(db)
+        except Exception as e:
+            db.rollback()
+            error = str(e)
+            logger.error(f"Poll of {source_name} - {section_name} failed: {error}")
+
+        try:
+            self.record_run(db, source_name, section_name, counts["new_articles"],
+                            time.monotonic() - started, error)
+        finally:
+            db.close()
+        return counts
+
+    def record_run(self, db: Session, source_name: str, section_name: str, new_items: int,
+                   duration: float, error: Optional[str] = None):
+        """Store the outcome of a poll on the section's schedule row"""
+        row = db.query(SectionSchedule).filter(
+            SectionSchedule.source_name == source_name,
+            SectionSchedule.section_name == section_name
+        ).first()
+        if row is None:
+            return
+
+        now = datetime.utcnow()
+        row.last_run_at = now
+        row.last_status = 'error' if error else 'success'
+        row.last_error = error
+        row.last_duration_seconds = round(duration, 2)
+        row.total_runs = (row.total_runs or 0) + 1
+
+        # Failed polls say nothing about the publish rate: keep the interval
+        if not error:
+            row.last_new_items = new_items
+            row.total_new_items = (row.total_new_items or 0) + new_items
+            row.avg_new_items = round(AVERAGE_WEIGHT * new_items + (1 - AVERAGE_WEIGHT) * (row.avg_new_items or 0.0), 3)
+            interval = next_interval(row.interval_minutes, new_items,
+                                     self.min_interval_minutes, self.max_interval_minutes)
+            if interval != row.interval_minutes:
+                logger.info(f"{source_name} - {section_name}: poll interval {row.interval_minutes} -> {interval} min "
+                            f"({new_items} new items)")
+                row.interval_minutes = interval
+                # The running job picks up the new interval when it schedules its next run
+                job = self.jobs.get(f"{source_name} - {section_name}")
+                if job is not None:
+                    job.interval = interval
+
+        row.next_run_at = now + timedelta(minutes=row.interval_minutes)
+        db.commit()
+
+    def run_forever(self, max_sleep_seconds: float = 30):
+        """Run due jobs until the process is stopped"""
+        self.start()
+        while True:
+            self.scheduler.run_pending()
+            idle = self.scheduler.idle_seconds
+            time.sleep(max(1.0, min(idle if idle is not None else max_sleep_seconds, max_sleep_seconds)))
+
+
+def schedule_status(db: Session) -> List[Dict]:
+    """Schedule and last-run statistics of every section, soonest due first"""
+    rows = db.query(SectionSchedule).order_by(SectionSchedule.next_run_at, SectionSchedule.id).all()
+    return [{
+        "source": row.source_name,
+        "section": row.section_name,
+        "page_url": row.page_url,
+        "interval_minutes": row.interval_minutes,
+        "last_run_at": row.last_run_at,
+        "next_run_at": row.next_run_at,
+        "last_status": row.last_status,
+        "last_error": row.last_error,
+        "last_new_items": row.last_new_items,
+        "avg_new_items": row.avg_new_items,
+        "last_duration_seconds": row.last_duration_seconds,
+        "total_runs": row.total_runs,
+        "total_new_items": row.total_new_items
+    } for row in rows]
@@ -0,0 +1,201 @@
+"""
+Scrape Engine
+Shared path for scraping sections: picks the registered scraper, holds the
+section's single-flight lease while it scrapes, saves the articles and
+commits them together with the crawl frontier. A caller that finds a
+section already being scraped elsewhere waits for that run and reuses its
+result instead of fetching the page again, if that run stored the same
+thing (the latest links, or the same collection date); otherwise it scrapes
+the section after it.
+"""
+
+import time
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.scrapers.frontier import CrawlFrontier
+from app.scrapers.registry import create_scraper, source_names
+from app.services.ingestion import save_articles
+from app.services.leases import (
+    LEASE_TTL_SECONDS, acquire_lease, new_owner_id, release_lease, wait_for_release
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Outcomes of scrape_section
+SECTION_SCRAPED = 'scraped'   # This caller scraped the section
+SECTION_JOINED = 'joined'     # Another process was scraping it in the same mode; its result was reused
+SECTION_BUSY = 'busy'         # Another process is still scraping it after the wait timeout
+
+# How long a caller waits for another process' run of the same section
+DEFAULT_WAIT_SECONDS = 120
+
+# Politeness delay between two sections of the same source
+SECTION_DELAY_SECONDS = 1
+
+def section_lease_key(source_name: str, section_name: str) -> str:
+    return f"section:{source_name} - {section_name}"
+
+def scrape_mode(collection_date: Optional[date] = None) -> str:
+    """What a run of a section stores: the latest links, or whole pages under one collection date"""
+    return f"date:{collection_date.isoformat()}" if collection_date else "latest"
+
+
+class ScrapeEngine:
+    """Scrapes sections of the registered scrapers with one lease per section"""
+
+    def __init__(self, frontier: Optional[CrawlFrontier] = None, scraper_kwargs: Optional[Dict] = None,
+                 wait_seconds: float = DEFAULT_WAIT_SECONDS, lease_ttl_seconds: int = LEASE_TTL_SECONDS,
+                 session_factory=None):
+        """
+        Args:
+            frontier: Crawl frontier to stop at known links (None parses whole pages)
+            scraper_kwargs: Keyword arguments for the scraper constructors
+            wait_seconds: How long to wait for another process scraping the same section (0 = don't wait)
+            lease_ttl_seconds: Lease lifetime; a crashed holder blocks a section at most this long
+            session_factory: Session factory for the lease table (defaults to SessionLocal)
+        """
+        self.frontier = frontier
+        self.scraper_kwargs = scraper_kwargs or {}
+        self.wait_seconds = wait_seconds
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.session_factory = session_factory
+        self.owner = new_owner_id()
+        self.scrapers: Dict[str, object] = {}
+
+    def scraper_for(self, source_name: str):
+        """Scraper instance for a source, created once per engine"""
+        if source_name not in self.scrapers:
+            scraper = create_scraper(source_name, **self.scraper_kwargs)
+            scraper.frontier = self.frontier
+            self.scrapers[source_name] = scraper
+        return self.scrapers[source_name]
+
+    def set_frontier(self, frontier: Optional[CrawlFrontier]):
+        self.frontier = frontier
+        for scraper in self.scrapers.values():
+            scraper.frontier = frontier
+
+    def sections(self, source_name: Optional[str] = None, section_name: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        (source, section) pairs of every registered scraper, of one source or of one section
+
+        Raises:
+            ValueError: If the source or section is not known
+        """
+        if source_name is not None and source_name not in source_names():
+            raise ValueError(f"Unknown source: {source_name}")
+        sources = [source_name] if source_name else source_names()
+        pairs = [(site_name, site_section)
+                 for name in sources
+                 for site_name, site_sections in self.scraper_for(name).websites.items()
+                 for site_section in site_sections]
+        if section_name is not None:
+            pairs = [pair for pair in pairs if pair[1] == section_name]
+            if not pairs:
+                raise ValueError(f"Unknown section: {section_name}")
+        return pairs
+
+    def section_url(self, source_name: str, section_name: str) -> str:
+        return self.scraper_for(source_name).websites[source_name][section_name]
+
+    def scrape_section(self, db: Session, source_name: str, section_name: str,
+                       collection_date: Optional[date] = None, update_existing_sections: bool = False,
+                       before_commit: Optional[Callable[[Dict, List[Dict]], None]] = None) -> Dict:
+        """
+        Scrape one section under its lease and commit the new articles
+
+        Args:
+            db: Database session
+            source_name: Top-level key of the scraper's websites
+            section_name: Section within the source
+            collection_date: Override the collection date of every article
+            update_existing_sections: Fill in source_section on existing rows that have none
+            before_commit: Called with (counts, articles) inside the transaction that stores them
+
+        Returns:
+            save_articles counts plus 'status' (scraped, joined or busy)
+        """
+        key = section_lease_key(source_name, section_name)
+        mode = scrape_mode(collection_date)
+        if not acquire_lease(key, self.owner, self.lease_ttl_seconds, self.session_factory):
+            if self.wait_seconds <= 0:
+                return {"status": SECTION_BUSY, "new_articles": 0}
+            logger.info(f"{source_name} - {section_name} is being scraped elsewhere, waiting for it")
+            shared = wait_for_release(key, self.wait_seconds, self.session_factory)
+            if shared is None:
+                return {"status": SECTION_BUSY, "new_articles": 0}
+            if shared.pop("mode", None) == mode:
+                return {**shared, "status": SECTION_JOINED}
+            # A run of the other kind (latest links vs. a date) stored nothing for this request: scrape after it
+            if not acquire_lease(key, self.owner, self.lease_ttl_seconds, self.session_factory):
+                return {"status": SECTION_BUSY, "new_articles": 0}
+
+        counts: Dict = {}
+        pending_before = set(self.frontier.pending()) if self.frontier is not None else set()
+
+        def section_pages() -> List[str]:
+            return [url for url in self.frontier.pending() if url not in pending_before]
+
+        try:
+            articles = self.scraper_for(source_name).fetch_section(source_name, section_name)
+            counts = save_articles(db, articles, collection_date=collection_date,
+                                   update_existing_sections=update_existing_sections)
+            if before_commit is not None:
+                before_commit(counts, articles)
+            db.commit()
+            if self.frontier is not None:
+                # Only the pages of this section: their articles are the ones just committed
+                # (save_articles rolls a failing row back to its own savepoint, never the others)
+                pages = section_pages()
+                counts["known_links_skipped"] = self.frontier.stats(pages)["known_links_skipped"]
+                self.frontier.save(db, pages)
+                db.commit()
+        except Exception:
+            if self.frontier is not None:
+                # Nothing of this section was stored: its links must count as new on the next run
+                self.frontier.discard(section_pages())
+            raise
+        finally:
+            release_lease(key, self.owner, {**counts, "mode": mode} if counts else None, self.session_factory)
+
+        return {**counts, "status": SECTION_SCRAPED}
+
+    def scrape_sections(self, db: Session, sections: Iterable[Tuple[str, str]], **kwargs) -> Dict:
+        """
+        Scrape several sections one after another (see scrape_section for kwargs)
+
+        Returns:
+            Summed counts plus a per-section outcome list
+        """
+        totals = {"new_articles": 0, "updated_articles": 0, "duplicates_skipped": 0,
+                  "clustered_articles": 0, "total_processed": 0, "known_links_skipped": 0}
+        outcomes = []
+        previous_source = None
+        for source_name, section_name in sections:
+            if previous_source == source_name:
+                time.sleep(SECTION_DELAY_SECONDS)
+            previous_source = source_name
+
+            try:
+                result = self.scrape_section(db, source_name, section_name, **kwargs)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error scraping {source_name} - {section_name}: {str(e)}")
+                result = {"status": "error", "error": str(e), "new_articles": 0}
+
+            # Joined results are counted by the run that scraped them
+            if result["status"] == SECTION_SCRAPED:
+                for field in totals:
+                    totals[field] += result.get(field, 0) or 0
+            outcomes.append({"source": source_name, "section": section_name, **result})
+
+        totals["joined_sections"] = sum(1 for o in outcomes if o["status"] == SECTION_JOINED)
+        totals["busy_sections"] = sum(1 for o in outcomes if o["status"] == SECTION_BUSY)
+        totals["sections"] = outcomes
+        return totals
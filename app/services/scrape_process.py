@@ -0,0 +1,194 @@
+"""
+Scrape Process
+Runs fetches and the title translation stage in a short-lived child process,
+so the scrapers, BeautifulSoup/lxml, NumPy and the translator are never
+imported by the web worker in low-memory mode and their memory goes back to
+the OS when the child exits. The child writes its counts as JSON on the last
+line of stdout.
+
+    python -m app.services.scrape_process [--date YYYY-MM-DD] [--source S] [--section S]
+    python -m app.services.scrape_process --translate-titles [--limit N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+from app.services.memory_budget import low_memory_mode
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A child still running after this long is killed
+SCRAPE_PROCESS_TIMEOUT_SECONDS = 900
+TRANSLATION_PROCESS_TIMEOUT_SECONDS = 1800
+
+# Exit code of a child that rejected its arguments (unknown source/section)
+EXIT_INVALID_REQUEST = 2
+
+
+def _child_command(args: List[str]) -> List[str]:
+    return [sys.executable, '-m', 'app.services.scrape_process'] + args
+
+def _child_env() -> Dict[str, str]:
+    """The parent's environment with the project importable; the working directory (and so a
+    relative SQLite path) is inherited unchanged"""
+    paths = [PROJECT_ROOT] + [p for p in os.getenv('PYTHONPATH', '').split(os.pathsep) if p]
+    return {**os.environ, 'PYTHONPATH': os.pathsep.join(paths)}
+
+def _parse_result(stdout: bytes) -> Dict:
+    """The JSON counts on the child's last stdout line (other output is ignored)"""
+    lines = [line for line in stdout.decode('utf-8', errors='replace').splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else {}
+
+def scrape_args(date: Optional[str] = None, source: Optional[str] = None, section: Optional[str] = None,
+                translate_immediately: bool = False) -> List[str]:
+    args = []
+    if date:
+        args += ['--date', date]
+    if source:
+        args += ['--source', source]
+    if section:
+        args += ['--section', section]
+    if translate_immediately:
+        args.append('--translate-immediately')
+    return args
+
+async def run_scrape_process(date: Optional[str] = None, source: Optional[str] = None,
+                             section: Optional[str] = None, translate_immediately: bool = False,
+                             timeout_seconds: float = SCRAPE_PROCESS_TIMEOUT_SECONDS) -> Dict:
+    """
+    Run a fetch in a child process without blocking the event loop
+
+    Returns:
+        The fetch counts (same keys as ScrapeEngine.scrape_sections)
+
+    Raises:
+        ValueError: If the source or section is not known
+        RuntimeError: If the child failed or timed out
+    """
+    process = await asyncio.create_subprocess_exec(
+        *_child_command(scrape_args(date, source, section, translate_immediately)),
+        stdout=asyncio.subprocess.PIPE, env=_child_env()
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout_seconds)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"Scrape process timed out after {timeout_seconds}s")
+
+    result = _parse_result(stdout)
+    if process.returncode == EXIT_INVALID_REQUEST:
+        raise ValueError(result.get('error', 'Invalid scrape request'))
+    if process.returncode != 0:
+        raise RuntimeError(result.get('error') or f"Scrape process exited with code {process.returncode}")
+    return result
+
+def run_translation_process(limit: Optional[int] = None,
+                            timeout_seconds: float = TRANSLATION_PROCESS_TIMEOUT_SECONDS) -> Dict:
+    """Run the title translation stage in a child process (blocking; use as a background task)"""
+    args = ['--translate-titles'] + (['--limit', str(limit)] if limit else [])
+    try:
+        completed = subprocess.run(_child_command(args), stdout=subprocess.PIPE, env=_child_env(),
+                                   timeout=timeout_seconds)
+        return _parse_result(completed.stdout)
+    except Exception as e:
+        logger.error(f"Title translation process failed: {e}")
+        return {"translated": 0, "failed": 0, "error": str(e)}
+
+def run_title_translation_job(limit: Optional[int] = None) -> Dict:
+    """Title translation background job: in a child process in low-memory mode, in-process otherwise"""
+    if low_memory_mode():
+        return run_translation_process(limit)
+    from app.services.title_translation import run_title_translation
+    return run_title_translation(limit)
+
+
+def scrape(db, date: Optional[str] = None, source: Optional[str] = None, section: Optional[str] = None,
+           translate_immediately: bool = False) -> Dict:
+    """
+    The fetch behind the API: whole pages for a date, or only the links new since the last fetch
+
+    Raises:
+        ValueError: If the source or section is not known
+    """
+    from app.scrapers.frontier import CrawlFrontier
+    from app.services.scrape_engine import ScrapeEngine
+
+    scraper_kwargs = {'translate_immediately': translate_immediately}
+    if date:
+        # Whole pages are parsed (no frontier) so existing rows get their section filled in
+        date_obj = datetime.strptime(date, '%Y-%m-%d').date()
+        engine = ScrapeEngine(scraper_kwargs=scraper_kwargs)
+        return engine.scrape_sections(db, engine.sections(source, section), collection_date=date_obj,
+                                      update_existing_sections=True)
+
+    # Sections already being scraped by another worker or the cron job are joined, not fetched twice
+    engine = ScrapeEngine(frontier=CrawlFrontier.load(db), scraper_kwargs=scraper_kwargs)
+    return engine.scrape_sections(db, engine.sections(source, section))
+
+async def fetch_sections(db, date: Optional[str] = None, source: Optional[str] = None,
+                         section: Optional[str] = None, translate_immediately: bool = False) -> Dict:
+    """Run a fetch in this process, or in a short-lived child process in low-memory mode"""
+    if low_memory_mode():
+        return await run_scrape_process(date, source, section, translate_immediately)
+    # scrape blocks (page fetches, database, waiting up to DEFAULT_WAIT_SECONDS for a section another
+    # process holds): in a worker thread, so the event loop keeps serving other requests meanwhile
+    return await asyncio.to_thread(scrape, db, date, source, section, translate_immediately)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a fetch or the title translation stage in this process")
+    parser.add_argument('--date', help="Collection date (YYYY-MM-DD); parses whole pages")
+    parser.add_argument('--source', help="Only this source")
+    parser.add_argument('--section', help="Only this section")
+    parser.add_argument('--translate-immediately', action='store_true', help="Translate titles while scraping")
+    parser.add_argument('--translate-titles', action='store_true', help="Run the title translation stage instead")
+    parser.add_argument('--limit', type=int, help="Maximum rows for --translate-titles")
+    args = parser.parse_args(argv)
+
+    from app.services.page_cache import install_invalidation
+    from app.services.metrics import publish, set_process_role
+    install_invalidation()
+    set_process_role("scrape")
+
+    try:
+        if args.translate_titles:
+            from app.services.title_translation import run_title_translation
+            result = run_title_translation(args.limit)
+        else:
+            from app.database import SessionLocal
+            from app.scrapers.registry import section_layout
+
+            db = SessionLocal()
+            try:
+                result = scrape(db, args.date, args.source, args.section, args.translate_immediately)
+            finally:
+                db.close()
+            # Warm the shared section layout while the scrapers are loaded here anyway
+            section_layout()
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        return EXIT_INVALID_REQUEST
+    except Exception as e:
+        logger.error(f"Scrape process failed: {e}")
+        print(json.dumps({"error": str(e)}))
+        return 1
+
+    # Fetch and translator latency of this run stay visible in /metrics for a minute
+    publish()
+    print(json.dumps(result, default=str, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Scrape Run Journal
+Runs a full scrape of every section as a journaled, resumable run. Each
+section's articles and its journal entry are committed together (followed
+by its crawl frontier), so a crash loses at most the section in progress; the next run
+picks up the interrupted run and only fetches the sections it had not
+finished.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.models import ScrapeRun, ScrapeRunSection
+from app.scrapers.frontier import CrawlFrontier
+from app.services.scrape_engine import SECTION_BUSY, ScrapeEngine
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Values of ScrapeRun.status
+RUN_RUNNING = 'running'
+RUN_COMPLETED = 'completed'
+RUN_COMPLETED_WITH_ERRORS = 'completed_with_errors'
+RUN_ABANDONED = 'abandoned'
+
+# Values of ScrapeRunSection.status
+SECTION_PENDING = 'pending'
+SECTION_RUNNING = 'running'
+SECTION_COMPLETED = 'completed'
+SECTION_FAILED = 'failed'
+
+# Interrupted runs older than this are abandoned instead of resumed
+RESUME_WINDOW_HOURS = 12
+
+
+class ScrapeRunner:
+    """Scrapes every section of every source as one resumable run"""
+
+    def __init__(self, db: Session, trigger: str = 'automated', scraper_kwargs: Optional[Dict] = None,
+                 resume_window_hours: int = RESUME_WINDOW_HOURS):
+        """
+        Args:
+            db: Database session (committed once per section)
+            trigger: Label stored on the run ('automated', 'api', ...)
+            scraper_kwargs: Keyword arguments for the scraper constructors
+            resume_window_hours: How old an interrupted run may be and still get resumed
+        """
+        self.db = db
+        self.trigger = trigger
+        self.scraper_kwargs = scraper_kwargs or {}
+        self.resume_window_hours = resume_window_hours
+        self.engine = ScrapeEngine(frontier=CrawlFrontier.load(db), scraper_kwargs=self.scraper_kwargs)
+
+    def sections(self) -> List[Tuple[str, str]]:
+        """(source, section) of every section of every registered scraper, in scraping order"""
+        return self.engine.sections()
+
+    def resume_or_start(self) -> ScrapeRun:
+        """Pick up the latest interrupted run of this trigger, or start a new one"""
+        interrupted = self.db.query(ScrapeRun).filter(
+            ScrapeRun.trigger == self.trigger,
+            ScrapeRun.status == RUN_RUNNING
+        ).order_by(ScrapeRun.id.desc()).all()
+
+        cutoff = datetime.utcnow() - timedelta(hours=self.resume_window_hours)
+        resumable = None
+        for run in interrupted:
+            if resumable is None and run.started_at >= cutoff:
+                resumable = run
+            else:
+                run.status = RUN_ABANDONED
+                run.finished_at = datetime.utcnow()
+
+        if resumable is not None:
+            resumable.resumed_count = (resumable.resumed_count or 0) + 1
+            # Sections that were mid-flight when the process died are redone
+            for section in resumable.sections:
+                if section.status == SECTION_RUNNING:
+                    section.status = SECTION_PENDING
+            self.db.commit()
+            done = sum(1 for s in resumable.sections if s.status != SECTION_PENDING)
+            logger.info(f"Resuming scrape run {resumable.id}: {done}/{len(resumable.sections)} sections already done")
+            return resumable
+
+        run = ScrapeRun(trigger=self.trigger, status=RUN_RUNNING, started_at=datetime.utcnow(), resumed_count=0)
+        self.db.add(run)
+        self.db.flush()
+        for source_name, section_name in self.sections():
+            self.db.add(ScrapeRunSection(run_id=run.id, source_name=source_name, section_name=section_name,
+                                         status=SECTION_PENDING, new_articles=0, duplicates_skipped=0, attempts=0))
+        self.db.commit()
+        logger.info(f"Started scrape run {run.id}")
+        return run
+
+    def run_section(self, section: ScrapeRunSection):
+        """Scrape one section and commit its articles, journal entry and frontier together"""
+        section.status = SECTION_RUNNING
+        section.attempts = (section.attempts or 0) + 1
+        section.started_at = datetime.utcnow()
+        self.db.commit()
+
+        def record(counts: Dict, articles: List[Dict]):
+            section.new_articles = counts['new_articles']
+            section.duplicates_skipped = counts['duplicates_skipped']
+            section.cursor = articles[0]['source_url'] if articles else section.cursor
+            section.status = SECTION_COMPLETED
+            section.error = None
+            section.finished_at = datetime.utcnow()
+
+        try:
+            result = self.engine.scrape_section(self.db, section.source_name, section.section_name,
+                                                before_commit=record)
+            if result['status'] == SECTION_BUSY:
+                raise RuntimeError("section is still being scraped by another process")
+            if section.status != SECTION_COMPLETED:
+                # Joined another process' scrape: its articles are already stored
+                section.status = SECTION_COMPLETED
+                section.error = None
+                section.finished_at = datetime.utcnow()
+                self.db.commit()
+            logger.info(f"  📰 {section.source_name} - {section.section_name}: {section.new_articles} new")
+        except Exception as e:
+            self.db.rollback()
+            section.status = SECTION_FAILED
+            section.error = str(e)
+            section.finished_at = datetime.utcnow()
+            self.db.commit()
+            logger.error(f"  ❌ {section.source_name} - {section.section_name} failed: {e}")
+
+    def run(self) -> Dict[str, int]:
+        """Run (or resume) a full scrape and return its totals"""
+        run = self.resume_or_start()
+        for section in run.sections:
+            if section.status == SECTION_PENDING:
+                self.run_section(section)
+
+        failed = sum(1 for s in run.sections if s.status == SECTION_FAILED)
+        run.status = RUN_COMPLETED_WITH_ERRORS if failed else RUN_COMPLETED
+        run.finished_at = datetime.utcnow()
+        self.db.commit()
+
+        return {
+            "run_id": run.id,
+            "resumed": bool(run.resumed_count),
+            "sections": len(run.sections),
+            "failed_sections": failed,
+            "new_articles": sum(s.new_articles or 0 for s in run.sections),
+            "duplicates": sum(s.duplicates_skipped or 0 for s in run.sections)
+        }
+
+
+def recent_runs(db: Session, limit: int = 10) -> List[Dict]:
+    """Latest scrape runs with their per-section journal"""
+    runs = db.query(ScrapeRun).order_by(ScrapeRun.id.desc()).limit(limit).all()
+    return [{
+        "id": run.id,
+        "trigger": run.trigger,
+        "status": run.status,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "resumed_count": run.resumed_count,
+        "new_articles": sum(s.new_articles or 0 for s in run.sections),
+        "sections": [{
+            "source": s.source_name,
+            "section": s.section_name,
+            "status": s.status,
+            "cursor": s.cursor,
+            "new_articles": s.new_articles,
+            "duplicates_skipped": s.duplicates_skipped,
+            "attempts": s.attempts,
+            "error": s.error,
+            "finished_at": s.finished_at
+        } for s in run.sections]
+    } for run in runs]
@@ -6,6 +6,8 @@ Maps source domains and subcategories to their specific CSS selectors
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from app.services.selector_learning import selector_learner
+
 @dataclass
 class SelectorConfig:
     """Configuration for a specific website's content selectors"""
@@ -14,6 +16,8 @@ class SelectorConfig:
     remove_selectors: List[str] = None  # Selectors for elements to remove (ads, etc.)
     date_selector: Optional[str] = None  # Date/time selector
     author_selector: Optional[str] = None  # Author selector
+    container_selector: Optional[str] = None  # Element holding the whole article; the download stops once it has closed
+    learned: bool = False  # Learned from the generic extractor (selector_learning.py), not configured
     
     def __post_init__(self):
         if self.remove_selectors is None:
@@ -26,6 +30,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "renshi.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.show_text p",
+            container_selector="div.show_text",
             title_selector="h1.title, h1",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement", 
@@ -39,6 +44,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "fanfu.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.show_text p",
+            container_selector="div.show_text",
             title_selector="h1.title, h1",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement",
@@ -52,6 +58,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "world.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.rm_txt_con p",
+            container_selector="div.rm_txt_con",
             title_selector="h1.title, h1",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement", 
@@ -62,6 +69,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
         ),
         "international": SelectorConfig(
             content_selector="div.rm_txt_con p",
+            container_selector="div.rm_txt_con",
             title_selector="h1.title",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement",
@@ -73,6 +81,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "society.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.rm_txt_con p",
+            container_selector="div.rm_txt_con",
             title_selector="h1.title, h1",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement",
@@ -84,6 +93,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "finance.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.rm_txt_con p",
+            container_selector="div.rm_txt_con",
             title_selector="h1.title, h1",
             remove_selectors=[
                 "script", "style", ".ad", ".advertisement",
@@ -95,6 +105,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     "politics.people.com.cn": {
         "default": SelectorConfig(
             content_selector="div.rm_txt_con, div.show_text, div.article_content",
+            container_selector="div.rm_txt_con, div.show_text, div.article_content",
             title_selector="h1.title",
             remove_selectors=["script", "style", ".ad"]
         )
@@ -124,7 +135,7 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
         )
     },
     
-    # Fallback configuration for unknown domains
+    # Fallback configuration for unknown domains (after the generic extractor in content_extractor.py)
     "default": {
         "default": SelectorConfig(
             content_selector="article, .article, .content, .post-content, .entry-content, main, #main",
@@ -138,13 +149,51 @@ SCRAPER_CONFIG: Dict[str, Dict[str, SelectorConfig]] = {
     }
 }
 
-def get_selector_config(domain: str, subcategory: str = "default") -> SelectorConfig:
+# Largest article page downloaded (bytes, decompressed); the rest of a longer page is dropped
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+MAX_BODY_BYTES: Dict[str, int] = {
+    # Policy documents and data releases carry long inline tables
+    "www.gov.cn": 4 * 1024 * 1024,
+    "www.stats.gov.cn": 4 * 1024 * 1024,
+}
+
+def get_max_body_bytes(domain: str) -> int:
+    """Largest page downloaded from a domain"""
+    return MAX_BODY_BYTES.get(domain, DEFAULT_MAX_BODY_BYTES)
+
+# Boilerplate removed from scraped text (text_cleaner.py), after whitespace is collapsed
+DEFAULT_CLEAN_PATTERNS: List[str] = [
+    r'责任编辑[：:][^\n]*',  # Chinese editor information
+    r'编辑[：:][^\n]*',      # Editor information
+    r'来源[：:][^\n]*',      # Source information
+    r'原标题[：:][^\n]*',    # Original title
+    r'\(责编[：:][^)]*\)',   # Editor in parentheses
+    r'点击进入专题',         # Click to enter topic
+    r'更多精彩内容',         # More exciting content
+    r'相关新闻',            # Related news
+    r'【.*?】',             # Content in square brackets
+]
+# Removed on top of the defaults
+CLEAN_PATTERNS: Dict[str, List[str]] = {
+    # Page tools of the government sites
+    "www.gov.cn": [r'扫一扫在手机打开当前页', r'打印本页', r'关闭窗口'],
+    "www.mofcom.gov.cn": [r'打印本页', r'关闭窗口'],
+    "www.stats.gov.cn": [r'打印本页', r'关闭窗口'],
+    "www.xinhuanet.com": [r'\[纠错\]'],
+}
+
+def get_clean_patterns(domain: Optional[str] = None) -> List[str]:
+    """Boilerplate patterns for a domain's text"""
+    return DEFAULT_CLEAN_PATTERNS + CLEAN_PATTERNS.get(domain, [])
+
+def get_selector_config(domain: str, subcategory: str = "default", url: Optional[str] = None) -> SelectorConfig:
     """
     Get the appropriate selector configuration for a domain and subcategory
     
     Args:
         domain: The website domain (e.g., 'world.people.com.cn')
         subcategory: The subcategory or section (e.g., 'international', 'politics')
+        url: The article URL; on unconfigured domains, a selector promoted for its URL pattern is used
     
     Returns:
         SelectorConfig object with the appropriate selectors
@@ -162,6 +211,12 @@ def get_selector_config(domain: str, subcategory: str = "default") -> SelectorCo
         if "default" in domain_config:
             return domain_config["default"]
     
+    # Then the container the generic extractor keeps finding on this kind of page
+    if url:
+        learned = selector_learner.promoted_selector(domain, url)
+        if learned:
+            return SelectorConfig(content_selector=learned, container_selector=learned, learned=True)
+    
     # Fall back to global default configuration
     return SCRAPER_CONFIG["default"]["default"]
 
@@ -0,0 +1,109 @@
+"""
+Selector Learning
+Remembers which container selector the generic extractor found the article in,
+per domain and URL pattern, so the domain's next articles can be read with that
+one selector instead of scoring the whole page again.
+
+Every use is counted. A selector is promoted (get_selector_config returns it as
+a fast path) once it has found the article PROMOTE_AFTER times at a success
+rate of at least MIN_SUCCESS_RATE, and demoted when the rate drops below that
+or it misses MAX_CONSECUTIVE_FAILURES times in a row (a redesigned page); the
+generic extractor then runs again and learns the new layout.
+
+Stats live in the shared cache, so every worker and the scheduler learn from
+each other's articles and the stats survive restarts (with a persistent
+backend).
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import logging
+
+from app.services.cache import get_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROMOTE_AFTER = 3
+MIN_SUCCESS_RATE = 0.8
+MAX_CONSECUTIVE_FAILURES = 2
+
+# Selectors kept per domain and URL pattern (the least successful go first)
+MAX_SELECTORS_PER_PATTERN = 5
+# Stats of a pattern nobody has scraped for this long are dropped
+LEARNED_TTL_SECONDS = 90 * 24 * 3600
+
+_DIGITS = re.compile(r'\d+')
+
+
+def url_pattern(url: str) -> str:
+    """Path of a URL with its numbers generalized (/n1/2024/0101/c1001-40150000.html -> /n#/#/#/c#-#.html)"""
+    return _DIGITS.sub('#', urlparse(url).path or '/')
+
+def _key(domain: str, url: str) -> str:
+    return f"selectors:{domain}{url_pattern(url)}"
+
+def _success_rate(stats: Dict) -> float:
+    uses = stats['successes'] + stats['failures']
+    return stats['successes'] / uses if uses else 0.0
+
+def is_promoted(stats: Dict) -> bool:
+    return (stats['successes'] >= PROMOTE_AFTER
+            and _success_rate(stats) >= MIN_SUCCESS_RATE
+            and stats['consecutive_failures'] < MAX_CONSECUTIVE_FAILURES)
+
+
+class SelectorLearner:
+    """Success stats of learned selectors, per domain and URL pattern"""
+
+    def __init__(self):
+        # Read-modify-write of one process at a time; concurrent processes may lose an update, which
+        # only delays a promotion or demotion by an article
+        self._lock = threading.Lock()
+
+    def stats(self, domain: str, url: str) -> Dict[str, Dict]:
+        """selector -> {'successes', 'failures', 'consecutive_failures', 'last_used'}"""
+        return get_cache().get(_key(domain, url)) or {}
+
+    def promoted_selector(self, domain: str, url: str) -> Optional[str]:
+        """The best promoted selector for the URL's pattern, if any"""
+        promoted = {selector: stats for selector, stats in self.stats(domain, url).items() if is_promoted(stats)}
+        if not promoted:
+            return None
+        return max(promoted, key=lambda s: (_success_rate(promoted[s]), promoted[s]['successes']))
+
+    def record(self, domain: str, url: str, selector: str, success: bool):
+        """Count one use of a selector on an article of the URL's pattern"""
+        key = _key(domain, url)
+        with self._lock:
+            cache = get_cache()
+            learned = cache.get(key) or {}
+            stats = learned.setdefault(selector, {'successes': 0, 'failures': 0, 'consecutive_failures': 0})
+            was_promoted = is_promoted(stats)
+            if success:
+                stats['successes'] += 1
+                stats['consecutive_failures'] = 0
+            else:
+                stats['failures'] += 1
+                stats['consecutive_failures'] += 1
+            stats['last_used'] = time.time()
+
+            if len(learned) > MAX_SELECTORS_PER_PATTERN:
+                worst = min((s for s in learned if s != selector),
+                            key=lambda s: (_success_rate(learned[s]), learned[s]['last_used']))
+                del learned[worst]
+            cache.set(key, learned, LEARNED_TTL_SECONDS)
+
+        if is_promoted(stats) != was_promoted:
+            logger.info(f"{'Promoted' if not was_promoted else 'Demoted'} selector {selector!r} "
+                        f"for {domain}{url_pattern(url)} ({stats['successes']} found, {stats['failures']} missed)")
+
+    def forget(self, domain: str, url: str):
+        get_cache().delete(_key(domain, url))
+
+
+selector_learner = SelectorLearner()
@@ -0,0 +1,143 @@
+"""
+SQL Profiler
+Times every statement on the engine with before/after_cursor_execute
+listeners and adds it to the query stats of the request being handled
+(the /metrics query counters are built on these).
+
+With SQL_PROFILING=1 the profiling middleware also keeps the slowest
+statements of each request and reports them in a Server-Timing header
+(visible in the browser dev tools) and a structured log line. Statements
+slower than SLOW_QUERY_MS (default DEFAULT_SLOW_QUERY_MS when profiling,
+off otherwise) are logged on their own, in requests and background jobs alike.
+"""
+
+import contextvars
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+import logging
+
+from sqlalchemy import event
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200
+
+# Statements kept per profiled request
+DEFAULT_TOP_STATEMENTS = 3
+
+# Logged statements are cut to this length
+STATEMENT_LOG_CHARS = 300
+
+def sql_profiling_enabled() -> bool:
+    return os.getenv('SQL_PROFILING', '').lower() in ('1', 'true', 'yes', 'on')
+
+def slow_query_threshold_ms() -> Optional[float]:
+    """SLOW_QUERY_MS, or the default while profiling (None = no slow-query log)"""
+    value = os.getenv('SLOW_QUERY_MS')
+    if value:
+        return float(value) or None
+    return DEFAULT_SLOW_QUERY_MS if sql_profiling_enabled() else None
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= STATEMENT_LOG_CHARS else statement[:STATEMENT_LOG_CHARS] + "..."
+
+
+class QueryStats:
+    """Query count and time of one request, optionally with its slowest statements"""
+
+    def __init__(self, keep_statements: bool = False, top: int = DEFAULT_TOP_STATEMENTS):
+        self.queries = 0
+        self.seconds = 0.0
+        self.keep_statements = keep_statements
+        self.top = top
+        self.slowest: List[Tuple[float, str]] = []
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.seconds += seconds
+        if self.keep_statements:
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.top:]
+
+
+# Stats of the request being handled (None outside requests)
+_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+def start_query_stats(keep_statements: bool = False) -> QueryStats:
+    """Start counting the queries of the current request"""
+    stats = QueryStats(keep_statements)
+    _query_stats.set(stats)
+    return stats
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+# Read once when the listeners are installed
+_slow_query_ms: Optional[float] = None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if _slow_query_ms is not None and elapsed * 1000 >= _slow_query_ms:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "ms": round(elapsed * 1000, 1),
+            "statement": _shorten(statement)
+        }, ensure_ascii=False))
+
+def install_query_listeners(engine):
+    """Time every statement executed on the engine"""
+    global _slow_query_ms
+    _slow_query_ms = slow_query_threshold_ms()
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    """Server-Timing header value: database time (with the query count) and total time"""
+    return (f'db;dur={stats.seconds * 1000:.1f};desc="{stats.queries} queries", '
+            f'app;dur={total_seconds * 1000:.1f}')
+
+async def profile_sql(request, call_next):
+    """
+    Middleware: Server-Timing header and a log line with the query profile of each request
+
+    Reuses the stats started by an outer middleware (the metrics one) when there is one.
+    """
+    stats = current_query_stats() or start_query_stats()
+    stats.keep_statements = True
+    started = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - started
+
+    response.headers["Server-Timing"] = server_timing(stats, total)
+    logger.info(json.dumps({
+        "event": "sql_profile",
+        "method": request.method,
+        "path": request.url.path,
+        "route": getattr(request.scope.get("route"), "path", None),
+        "status": response.status_code,
+        "queries": stats.queries,
+        "db_ms": round(stats.seconds * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "slowest": [{"ms": round(seconds * 1000, 1), "statement": _shorten(statement)}
+                    for seconds, statement in stats.slowest]
+    }, ensure_ascii=False))
+    return response
@@ -0,0 +1,300 @@
+"""
+Story Clustering Service
+Groups near-duplicate coverage of the same story across sources. Titles (and
+the lead of the scraped content, when available) are reduced to MinHash
+signatures and indexed with LSH banding, so each new article is compared only
+with the few recent articles that share a band instead of with every row.
+Members of a cluster share News.story_cluster_id, which is the id of the
+earliest article of the story.
+
+Identical titles only match on the same collection date: a title that recurs
+every day (a daily press conference) is a new story each day, and matching
+the previous day's row would chain every day into one cluster.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import News
+from app.services.textrank import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# MinHash / LSH parameters: 16 bands of 4 rows puts the LSH threshold near 0.5 Jaccard
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Estimated Jaccard similarity needed to join a cluster
+TITLE_SIMILARITY_THRESHOLD = 0.5
+CONTENT_SIMILARITY_THRESHOLD = 0.5
+
+# Titles with fewer shingles than this are too generic to cluster on
+MIN_SHINGLES = 4
+
+# Characters of content used for the content signature
+CONTENT_LEAD_CHARS = 1000
+
+# Only articles collected within this many days of each other can be the same story
+CLUSTER_WINDOW_DAYS = 1
+
+# Fixed seed so signatures are comparable across processes and runs
+_rng = np.random.RandomState(20240601)
+_HASH_A = _rng.randint(1, MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_HASH_B = _rng.randint(0, MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+def normalize_text(text: Optional[str]) -> str:
+    """NFKC-fold, lowercase and collapse punctuation/whitespace to single spaces"""
+    if not text:
+        return ''
+    folded = unicodedata.normalize('NFKC', text).lower()
+    return NON_WORD_PATTERN.sub(' ', folded).strip()
+
+def shingles(text: Optional[str]) -> Set[str]:
+    """Character bigrams of CJK runs plus latin words of the normalized text"""
+    return set(tokenize(normalize_text(text), 'zh', ngram=2))
+
+def minhash(features: Iterable[str]) -> Optional[np.ndarray]:
+    """MinHash signature of a shingle set (None when there are too few shingles)"""
+    features = set(features)
+    if len(features) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter((zlib.crc32(f.encode('utf-8')) % MERSENNE_PRIME for f in features),
+                         dtype=np.uint64, count=len(features))
+    return ((hashes[:, None] * _HASH_A + _HASH_B) % MERSENNE_PRIME).min(axis=0)
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERMUTATIONS
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures; returns candidate ids sharing at least one band"""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self.signatures: Dict[int, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+
+    def add(self, key: int, signature: np.ndarray):
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def query(self, signature: np.ndarray) -> Set[int]:
+        candidates: Set[int] = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+
+class StoryClusterer:
+    """Assigns story_cluster_id to articles using title and content signatures of recent rows"""
+
+    def __init__(self, db: Session, window_days: int = CLUSTER_WINDOW_DAYS):
+        """
+        Args:
+            db: Database session used to load recent articles
+            window_days: Maximum collection date distance between articles of one story
+        """
+        self.db = db
+        self.window_days = window_days
+        self.title_index = LSHIndex()
+        self.content_index = LSHIndex()
+        self.exact_titles: Dict[Tuple[str, date], int] = {}
+        self.title_of: Dict[int, str] = {}
+        self.cluster_of: Dict[int, int] = {}
+        self.date_of: Dict[int, date] = {}
+        self._loaded_dates: Set[date] = set()
+
+    def _add(self, news_id: int, cluster_id: int, collection_date: date,
+             title: Optional[str], content: Optional[str] = None):
+        """Index an article under its cluster"""
+        self.cluster_of[news_id] = cluster_id
+        self.date_of[news_id] = collection_date
+
+        normalized = normalize_text(title)
+        self.title_of[news_id] = normalized
+        title_shingles = shingles(title)
+        if len(title_shingles) >= MIN_SHINGLES:
+            self.exact_titles.setdefault((normalized, collection_date), news_id)
+
+        title_signature = minhash(title_shingles)
+        if title_signature is not None and news_id not in self.title_index.signatures:
+            self.title_index.add(news_id, title_signature)
+
+        if content:
+            content_signature = minhash(shingles(content[:CONTENT_LEAD_CHARS]))
+            if content_signature is not None and news_id not in self.content_index.signatures:
+                self.content_index.add(news_id, content_signature)
+
+    def load_window(self, start: date, end: date):
+        """Index articles collected between start and end (inclusive) that are not indexed yet"""
+        dates = {start + timedelta(days=i) for i in range((end - start).days + 1)} - self._loaded_dates
+        if not dates:
+            return
+
+        rows = self.db.query(
+            News.id, News.title, func.substr(News.full_content, 1, CONTENT_LEAD_CHARS),
+            News.story_cluster_id, News.collection_date
+        ).filter(News.collection_date.in_(dates)).order_by(News.id).all()
+
+        for news_id, title, content, cluster_id, collection_date in rows:
+            if news_id not in self.cluster_of:
+                self._add(news_id, cluster_id or news_id, collection_date, title, content)
+        self._loaded_dates.update(dates)
+
+    def within_window(self, news_id: int, collection_date: date) -> bool:
+        return abs((self.date_of[news_id] - collection_date).days) <= self.window_days
+
+    def recurs(self, news_id: int, normalized_title: str, collection_date: date) -> bool:
+        """Whether the indexed article is the same title on another day (a recurring column, not the story)"""
+        return self.title_of.get(news_id) == normalized_title and self.date_of[news_id] != collection_date
+
+    def find_cluster(self, title: Optional[str], collection_date: date,
+                     content: Optional[str] = None, exclude_id: Optional[int] = None) -> Optional[int]:
+        """
+        Find the cluster of the most similar indexed article
+
+        Returns:
+            The matching story_cluster_id, or None if the article starts a new story
+        """
+        self.load_window(collection_date - timedelta(days=self.window_days),
+                         collection_date + timedelta(days=self.window_days))
+
+        # Identical (normalized) titles of the same day match, unless they are too generic
+        normalized = normalize_text(title)
+        title_shingles = shingles(title)
+        exact = self.exact_titles.get((normalized, collection_date)) \
+            if len(title_shingles) >= MIN_SHINGLES else None
+        if exact is not None and exact != exclude_id:
+            return self.cluster_of[exact]
+
+        best_id, best_score = None, 0.0
+        checks = [(self.title_index, minhash(title_shingles), TITLE_SIMILARITY_THRESHOLD)]
+        if content:
+            checks.append((self.content_index, minhash(shingles(content[:CONTENT_LEAD_CHARS])),
+                           CONTENT_SIMILARITY_THRESHOLD))
+
+        for index, signature, threshold in checks:
+            if signature is None:
+                continue
+            for candidate in index.query(signature):
+                if candidate == exclude_id or not self.within_window(candidate, collection_date) \
+                        or self.recurs(candidate, normalized, collection_date):
+                    continue
+                score = estimated_similarity(signature, index.signatures[candidate])
+                if score >= threshold and score > best_score:
+                    best_id, best_score = candidate, score
+
+        return self.cluster_of[best_id] if best_id is not None else None
+
+    def assign(self, news_item: News) -> int:
+        """
+        Set story_cluster_id on a flushed article (joining an existing story or starting one)
+
+        Returns:
+            The assigned story_cluster_id
+        """
+        cluster_id = self.find_cluster(news_item.title, news_item.collection_date,
+                                       news_item.full_content, exclude_id=news_item.id)
+        news_item.story_cluster_id = cluster_id or news_item.id
+        self._add(news_item.id, news_item.story_cluster_id, news_item.collection_date,
+                  news_item.title, news_item.full_content)
+        return news_item.story_cluster_id
+
+
+def recluster_stories(db: Session, start: date, end: date,
+                      window_days: int = CLUSTER_WINDOW_DAYS) -> Dict[str, int]:
+    """
+    Rebuild story clusters for a date range using titles and scraped content
+
+    Content is usually scraped after ingestion, so this picks up stories whose
+    titles differ too much to be matched at ingest time. Clusters are merged
+    with union-find and keep the smallest member id.
+
+    Returns:
+        Counts of articles examined, articles whose cluster changed and multi-article clusters
+    """
+    clusterer = StoryClusterer(db, window_days)
+    clusterer.load_window(start - timedelta(days=window_days), end + timedelta(days=window_days))
+
+    parent: Dict[int, int] = {}
+
+    def find(x: int) -> int:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    # Keep existing memberships (they may point at stories older than the window)
+    for news_id, cluster_id in clusterer.cluster_of.items():
+        union(news_id, cluster_id)
+
+    for index, threshold in ((clusterer.title_index, TITLE_SIMILARITY_THRESHOLD),
+                             (clusterer.content_index, CONTENT_SIMILARITY_THRESHOLD)):
+        for news_id, signature in index.signatures.items():
+            for candidate in index.query(signature):
+                if candidate != news_id and clusterer.within_window(candidate, clusterer.date_of[news_id]) \
+                        and not clusterer.recurs(candidate, clusterer.title_of[news_id], clusterer.date_of[news_id]) \
+                        and estimated_similarity(signature, index.signatures[candidate]) >= threshold:
+                    union(news_id, candidate)
+
+    # Identical titles collected on the same day
+    title_owner: Dict[Tuple[str, date], int] = {}
+    rows = db.query(News).filter(News.collection_date >= start, News.collection_date <= end).all()
+    for row in rows:
+        key = (normalize_text(row.title), row.collection_date)
+        if len(shingles(row.title)) >= MIN_SHINGLES:
+            if key in title_owner:
+                union(row.id, title_owner[key])
+            else:
+                title_owner[key] = row.id
+
+    changed = 0
+    sizes: Dict[int, int] = {}
+    for row in rows:
+        cluster_id = find(row.id)
+        sizes[cluster_id] = sizes.get(cluster_id, 0) + 1
+        if row.story_cluster_id != cluster_id:
+            row.story_cluster_id = cluster_id
+            changed += 1
+
+    db.commit()
+    return {
+        "articles": len(rows),
+        "changed": changed,
+        "multi_article_clusters": sum(1 for size in sizes.values() if size > 1)
+    }
+
+def cluster_members(db: Session, cluster_ids: Iterable[int]) -> Dict[int, List[News]]:
+    """Load the members of the given story clusters, grouped by cluster id"""
+    cluster_ids = {cid for cid in cluster_ids if cid is not None}
+    members: Dict[int, List[News]] = {}
+    if not cluster_ids:
+        return members
+    for row in db.query(News).filter(News.story_cluster_id.in_(cluster_ids)).order_by(News.id):
+        members.setdefault(row.story_cluster_id, []).append(row)
+    return members
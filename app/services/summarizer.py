@@ -0,0 +1,359 @@
+"""
+Summarization Service
+Generates article summaries from scraped content with a pluggable backend
+(local extractive TextRank or an OpenAI-compatible LLM endpoint) and caches
+the results in News.summary / News.summary_english. Articles of the same
+story cluster share one summary.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import requests
+from sqlalchemy.orm import Session
+
+from app.models.models import News
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of sentences (extractive) / target sentences (LLM) per requested length
+SUMMARY_LENGTHS = {
+    "short": 2,
+    "medium": 4,
+    "detailed": 7
+}
+
+
+class SummaryBackend(ABC):
+    """Interface for summary generators"""
+
+    name = "base"
+
+    @abstractmethod
+    def summarize_batch(self, texts: List[str], language: str = 'zh', length: str = 'medium') -> List[Optional[str]]:
+        """Summarize several documents at once; returns one summary (or None) per text"""
+        pass
+
+
+class ExtractiveSummarizer(SummaryBackend):
+    """TextRank over sentences: picks the most central sentences of each document"""
+
+    name = "extractive"
+
+    def __init__(self, method: str = 'textrank'):
+        # NumPy is only loaded once a summary is actually generated
+        from app.services.textrank import TextRankSummarizer
+        self.engine = TextRankSummarizer(method=method)
+
+    def summarize(self, text: str, language: str = 'zh', length: str = 'medium') -> Optional[str]:
+        return self.summarize_batch([text], language, length)[0]
+
+    def summarize_batch(self, texts: List[str], language: str = 'zh', length: str = 'medium') -> List[Optional[str]]:
+        count = SUMMARY_LENGTHS.get(length, SUMMARY_LENGTHS["medium"])
+        return self.engine.summarize_batch(texts, count, [language] * len(texts))
+
+
+class LLMSummarizer(SummaryBackend):
+    """Summaries from an OpenAI-compatible chat completions endpoint (e.g. a local llama.cpp/Ollama server)"""
+
+    name = "llm"
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None,
+                 api_key: Optional[str] = None, timeout: int = 120, max_input_chars: int = 6000):
+        self.base_url = (base_url or os.getenv('SUMMARY_LLM_URL', 'http://127.0.0.1:8080/v1')).rstrip('/')
+        self.model = model or os.getenv('SUMMARY_LLM_MODEL', 'local-model')
+        self.api_key = api_key or os.getenv('SUMMARY_LLM_API_KEY')
+        self.timeout = timeout
+        self.max_input_chars = max_input_chars
+        self.session = requests.Session()
+        self.fallback = ExtractiveSummarizer()
+
+    def _prompt(self, text: str, language: str, length: str) -> str:
+        sentences = SUMMARY_LENGTHS.get(length, SUMMARY_LENGTHS["medium"])
+        target = "Chinese" if language == 'zh' else "English"
+        return (
+            f"Summarize the following news article in {target} in at most {sentences} sentences. "
+            f"Reply with the summary only.\n\n{text[:self.max_input_chars]}"
+        )
+
+    def summarize(self, text: str, language: str = 'zh', length: str = 'medium') -> Optional[str]:
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+
+        body = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': self._prompt(text, language, length)}],
+            'temperature': 0.2
+        }
+
+        try:
+            response = self.session.post(f"{self.base_url}/chat/completions", json=body,
+                                         headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content'].strip() or None
+        except Exception as e:
+            logger.warning(f"LLM summary failed, using extractive fallback: {e}")
+            return self.fallback.summarize(text, language, length)
+
+    def summarize_batch(self, texts: List[str], language: str = 'zh', length: str = 'medium') -> List[Optional[str]]:
+        return [self.summarize(text, language, length) for text in texts]
+
+
+SUMMARY_BACKENDS = {
+    ExtractiveSummarizer.name: ExtractiveSummarizer,
+    LLMSummarizer.name: LLMSummarizer
+}
+
+def get_summary_backend(name: Optional[str] = None) -> SummaryBackend:
+    """Create the configured summary backend (SUMMARY_BACKEND env var, default 'extractive')"""
+    name = (name or os.getenv('SUMMARY_BACKEND', 'extractive')).lower()
+    backend_class = SUMMARY_BACKENDS.get(name)
+    if not backend_class:
+        logger.warning(f"Unknown summary backend '{name}', using extractive")
+        backend_class = ExtractiveSummarizer
+    return backend_class()
+
+
+class SummarizationService:
+    """Summarizes scraped articles in batches and stores the results on the News rows"""
+
+    def __init__(self, backend: Optional[SummaryBackend] = None, translator=None, batch_size: int = 50):
+        self.backend = backend or get_summary_backend()
+        self.translator = translator
+        self.batch_size = batch_size
+
+    def _get_translator(self):
+        if self.translator is None:
+            from app.services.translator import MicrosoftTranslator
+            self.translator = MicrosoftTranslator()
+        return self.translator
+
+    def _english_summaries(self, rows: List[News], summaries: List[Optional[str]], length: str) -> List[Optional[str]]:
+        """Get English summaries: reuse English content where available, translate the rest"""
+        english: List[Optional[str]] = [None] * len(rows)
+
+        with_english_content = [i for i, row in enumerate(rows) if row.full_content_english]
+        if with_english_content:
+            generated = self.backend.summarize_batch(
+                [rows[i].full_content_english for i in with_english_content], 'en', length)
+            for i, summary in zip(with_english_content, generated):
+                english[i] = summary
+
+        to_translate = [i for i in range(len(rows)) if english[i] is None and summaries[i]]
+        if to_translate:
+            try:
+                translated = self._get_translator().translate_batch([summaries[i] for i in to_translate])
+                for i, summary in zip(to_translate, translated):
+                    english[i] = summary
+            except Exception as e:
+                logger.warning(f"Summary translation failed: {e}")
+
+        return english
+
+    @staticmethod
+    def _copy_summary(source: News, target: News, now: datetime):
+        target.summary = source.summary
+        target.summary_english = source.summary_english
+        target.is_summarized = True
+        target.summarized_at = now
+
+    def _group_by_story(self, db: Session, rows: List[News],
+                        reuse_existing: bool = True) -> Tuple[List[News], Dict[int, List[News]], List[News], int]:
+        """
+        Pick one row per story cluster to summarize
+
+        Returns:
+            (representatives, followers, unsummarizable, reused): followers maps a
+            representative id to the rows that get a copy of its summary, reused
+            counts rows filled from a summary the cluster already had
+        """
+        now = datetime.utcnow()
+        existing: Dict[int, News] = {}
+        cluster_ids = {row.story_cluster_id for row in rows if row.story_cluster_id}
+        if reuse_existing and cluster_ids:
+            for member in db.query(News).filter(News.story_cluster_id.in_(cluster_ids),
+                                                News.is_summarized == True).order_by(News.id):
+                existing.setdefault(member.story_cluster_id, member)
+
+        reused = 0
+        pending = []
+        for row in rows:
+            source = existing.get(row.story_cluster_id)
+            if source is not None and source.id != row.id:
+                self._copy_summary(source, row, now)
+                reused += 1
+            else:
+                pending.append(row)
+
+        # The first row with content leads its cluster; unclustered rows lead themselves
+        leaders: Dict[int, News] = {}
+        representatives = []
+        for row in pending:
+            key = row.story_cluster_id or -row.id
+            if row.full_content and key not in leaders:
+                leaders[key] = row
+                representatives.append(row)
+
+        followers: Dict[int, List[News]] = {}
+        unsummarizable = []
+        for row in pending:
+            leader = leaders.get(row.story_cluster_id or -row.id)
+            if leader is None:
+                unsummarizable.append(row)
+            elif leader is not row:
+                followers.setdefault(leader.id, []).append(row)
+
+        return representatives, followers, unsummarizable, reused
+
+    def summarize_rows(self, db: Session, rows: List[News], length: str = 'medium',
+                       reuse_existing: bool = True) -> Dict[str, int]:
+        """Summarize the given rows (one per story cluster, grouped by language) and commit"""
+        representatives, followers, unsummarizable, summarized = self._group_by_story(db, rows, reuse_existing)
+        failed = len(unsummarizable)
+
+        by_language: Dict[str, List[News]] = {}
+        for row in representatives:
+            by_language.setdefault(row.content_language or 'zh', []).append(row)
+
+        for language, group in by_language.items():
+            for start in range(0, len(group), self.batch_size):
+                batch = group[start:start + self.batch_size]
+                summaries = self.backend.summarize_batch([row.full_content for row in batch], language, length)
+
+                if language == 'en':
+                    english = summaries
+                else:
+                    english = self._english_summaries(batch, summaries, length)
+
+                now = datetime.utcnow()
+                for row, summary, summary_english in zip(batch, summaries, english):
+                    story_rows = [row] + followers.get(row.id, [])
+                    if not summary:
+                        failed += len(story_rows)
+                        continue
+                    row.summary = summary
+                    row.summary_english = summary_english
+                    row.is_summarized = True
+                    row.summarized_at = now
+                    for follower in story_rows[1:]:
+                        self._copy_summary(row, follower, now)
+                    summarized += len(story_rows)
+
+                db.commit()
+
+        db.commit()  # Rows that only reused an existing cluster summary
+
+        return {"summarized": summarized, "failed": failed}
+
+    def summarize_ids(self, db: Session, news_ids: List[int], length: str = 'medium',
+                      force: bool = False) -> Dict[str, int]:
+        """Summarize specific articles (already summarized ones are skipped unless force=True)"""
+        query = db.query(News).filter(News.id.in_(news_ids), News.is_content_scraped == True)
+        if not force:
+            query = query.filter(News.is_summarized == False)
+        return self.summarize_rows(db, query.all(), length, reuse_existing=not force)
+
+    def summarize_pending(self, db: Session, limit: int = 500, length: str = 'medium') -> Dict[str, int]:
+        """Summarize scraped articles that have no summary yet"""
+        rows = db.query(News).filter(
+            News.is_content_scraped == True,
+            News.is_summarized == False
+        ).order_by(News.id).limit(limit).all()
+        return self.summarize_rows(db, rows, length)
+
+
+class SummaryQueue:
+    """
+    Collects summarize requests from the API and runs them in batches on a
+    background thread, so requests return immediately and concurrent clicks
+    share one backend call
+    """
+
+    def __init__(self, batch_window: float = 0.5, max_batch: int = 50):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending: Dict[str, set] = {}
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, news_id: int, length: str = 'medium', force: bool = False):
+        """Queue an article for summarization"""
+        key = f"{length}:{int(force)}"
+        with self._condition:
+            self._pending.setdefault(key, set()).add(news_id)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="summary-queue", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return sum(len(ids) for ids in self._pending.values())
+
+    def _take_batch(self):
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout=30)
+                if not self._pending:
+                    # Idle: let the thread exit; the next submit starts a new one
+                    self._worker = None
+                    return None
+
+        # Give concurrent requests a moment to join this batch
+        time.sleep(self.batch_window)
+
+        with self._condition:
+            key = next(iter(self._pending))
+            ids = self._pending[key]
+            batch = set(list(ids)[:self.max_batch])
+            ids.difference_update(batch)
+            if not ids:
+                del self._pending[key]
+            return key, batch
+
+    def _run(self):
+        from app.database import SessionLocal
+
+        service = SummarizationService()
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+
+            key, news_ids = taken
+            length, force = key.split(':')
+            db = SessionLocal()
+            try:
+                counts = service.summarize_ids(db, list(news_ids), length=length, force=force == '1')
+                logger.info(f"Summary batch of {len(news_ids)}: {counts['summarized']} summarized, {counts['failed']} failed")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Summary batch failed: {e}")
+            finally:
+                db.close()
+
+
+# Process-wide queue used by the API
+summary_queue = SummaryQueue()
+
+def run_pending_summaries(limit: int = 500) -> Dict[str, int]:
+    """Summarize all scraped-but-unsummarized articles with a fresh session (for scripts/background tasks)"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return SummarizationService().summarize_pending(db, limit=limit)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Pending summarization failed: {e}")
+        return {"summarized": 0, "failed": 0, "error": str(e)}
+    finally:
+        db.close()
@@ -0,0 +1,309 @@
+"""
+Synthetic Data
+Bulk generator of realistic-looking rows for scaling tests and benchmarks:
+News spread over dates and the real sources/sections (Chinese titles with
+English translations, Global Times in English), scraped content and
+summaries of realistic length for a share of them, plus categories,
+comments and saved summaries.
+
+Text comes from pools generated once per run, and rows are written in
+chunks with one multi-row statement each (COPY on PostgreSQL), so a
+million articles take seconds rather than minutes. Generated URLs carry a
+run token, so repeated runs add to the database instead of colliding.
+
+    python -m app.services.synthetic_data --articles 1000000 [--days 365] [--comments 20000]
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import logging
+
+from sqlalchemy import create_engine, func, select
+
+from app.models.models import Base, Category, Comment, News, SavedSummary
+from app.services.title_translation import (
+    ENGLISH_SECTION_PREFIXES, TRANSLATION_COMPLETED, TRANSLATION_NOT_REQUIRED, TRANSLATION_PENDING
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT / COPY
+CHUNK_ROWS = 10000
+
+# Distinct generated titles and article bodies per run
+TITLE_POOL_SIZE = 4096
+CONTENT_POOL_SIZE = 512
+
+# (source, domain, sections) as stored by the scrapers
+SOURCES = [
+    ("People's Daily", "people.com.cn", ["PD Anti Corruption", "PD International Breaking News", "人民网人事频道"]),
+    ("The Paper", "thepaper.cn", ["Paper China Government", "Paper Personnel Trends", "Paper Tiger Hunt"]),
+    ("State Council", "gov.cn", ["State Council News Releases", "State Council Department News",
+                                 "State Council Local News"]),
+    ("NBS", "stats.gov.cn", ["NBS Data Release", "NBS Data Interpretation", "NBS Press Conference"]),
+    ("Taiwan Affairs", "gwytb.gov.cn", ["Taiwan Affairs Office", "Chinese Departments on Taiwan"]),
+    ("MND", "mod.gov.cn", ["MND Regular PC", "MND Routine PC", "MND Special PC"]),
+    ("Guancha", "guancha.cn", ["Guancha International", "Guancha Chinese Diplomacy"]),
+    ("Global Times", "globaltimes.cn", ["GT China Politics", "GT China Society", "GT China Diplomacy"])
+]
+
+CATEGORIES = [
+    ("Economy", "Growth, trade and statistics", "#2E86AB"),
+    ("Politics", "Party and government affairs", "#C0392B"),
+    ("Diplomacy", "Foreign relations", "#8E44AD"),
+    ("Defense", "Military and security", "#34495E"),
+    ("Personnel", "Appointments and investigations", "#D35400"),
+    ("Society", "Social policy and local news", "#27AE60")
+]
+
+ZH_PHRASES = [
+    "国务院常务会议", "研究部署", "进一步推动", "高质量发展", "国家统计局", "发布数据", "居民消费价格",
+    "同比上涨", "外交部发言人", "回答记者提问", "中央纪委国家监委", "严重违纪违法", "接受审查调查",
+    "国防部例行记者会", "两岸关系", "和平发展", "地方政府", "专项债券", "稳就业", "保民生",
+    "深化改革", "扩大开放", "科技创新", "乡村振兴", "生态环境保护", "对外贸易", "增长态势",
+    "规模以上工业", "增加值", "政策措施", "落实落细", "重点领域", "风险防范", "国际合作"
+]
+EN_WORDS = [
+    "China", "State", "Council", "economy", "growth", "policy", "reform", "officials", "meeting",
+    "statistics", "prices", "rose", "percent", "year-on-year", "ministry", "spokesperson", "said",
+    "cooperation", "development", "regional", "local", "government", "bonds", "employment",
+    "investigation", "discipline", "defense", "cross-Strait", "relations", "trade", "exports",
+    "industrial", "output", "innovation", "rural", "environment", "risks", "measures", "international",
+    "Beijing", "quarter", "data", "released", "press", "conference", "announced", "new", "plans"
+]
+USER_NAMES = ["analyst", "editor", "researcher", "reader", "desk", "intern"]
+
+
+class TextPools:
+    """Titles, bodies and summaries generated once and reused across rows"""
+
+    def __init__(self, rng: random.Random):
+        self.zh_titles = [self._zh(rng, rng.randint(2, 4)) for _ in range(TITLE_POOL_SIZE)]
+        self.en_titles = [self._en(rng, rng.randint(8, 14)).rstrip('.') for _ in range(TITLE_POOL_SIZE)]
+        # Chinese articles run 1,000-3,000 characters, English ones 300-700 words
+        self.zh_contents = ["\n\n".join("".join(self._zh(rng, rng.randint(3, 5)) + "。" for _ in range(rng.randint(5, 8)))
+                                        for _ in range(rng.randint(6, 12)))
+                            for _ in range(CONTENT_POOL_SIZE)]
+        self.en_contents = ["\n\n".join(" ".join(self._en(rng, rng.randint(12, 25)) for _ in range(rng.randint(3, 6)))
+                                        for _ in range(rng.randint(4, 7)))
+                            for _ in range(CONTENT_POOL_SIZE)]
+        self.zh_summaries = ["".join(self._zh(rng, 3) + "。" for _ in range(3)) for _ in range(CONTENT_POOL_SIZE)]
+        self.en_summaries = [" ".join(self._en(rng, rng.randint(15, 25)) for _ in range(3))
+                             for _ in range(CONTENT_POOL_SIZE)]
+
+    @staticmethod
+    def _zh(rng: random.Random, phrases: int) -> str:
+        return "".join(rng.choices(ZH_PHRASES, k=phrases))
+
+    @staticmethod
+    def _en(rng: random.Random, words: int) -> str:
+        sentence = " ".join(rng.choices(EN_WORDS, k=words))
+        return sentence[0].upper() + sentence[1:] + "."
+
+
+def news_rows(pools: TextPools, start: int, stop: int, token: str, end_date: date, days: int,
+              content_share: float, summary_share: float, pending_share: float) -> List[Dict]:
+    """Rows start..stop-1 of a run, newest dates first"""
+    sections = [(source, domain, section) for source, domain, names in SOURCES for section in names]
+    now = datetime.utcnow()
+    rows = []
+    for i in range(start, stop):
+        source, domain, section = sections[i % len(sections)]
+        english = source.startswith(ENGLISH_SECTION_PREFIXES)
+        title_index = (i * 7919) % TITLE_POOL_SIZE
+        content_index = (i * 104729) % CONTENT_POOL_SIZE
+        # Fractions of the row number decide which stages have run on it
+        fraction = (i * 0.6180339887) % 1
+        scraped = fraction < content_share
+        summarized = fraction < summary_share
+        pending = not english and fraction > 1 - pending_share
+
+        if english:
+            title = title_english = pools.en_titles[title_index]
+            status = TRANSLATION_NOT_REQUIRED
+        else:
+            title = pools.zh_titles[title_index]
+            title_english = None if pending else pools.en_titles[title_index]
+            status = TRANSLATION_PENDING if pending else TRANSLATION_COMPLETED
+
+        rows.append({
+            'title': title,
+            'title_english': title_english,
+            'translation_status': status,
+            'translation_attempts': 0 if pending else 1,
+            'source_url': f"https://www.{domain}/synthetic/{token}/{i}.html",
+            'source_section': f"{source} - {section}",
+            'collection_date': end_date - timedelta(days=i % days),
+            'full_content': (pools.en_contents if english else pools.zh_contents)[content_index] if scraped else None,
+            'full_content_english': pools.en_contents[content_index] if scraped and not english else None,
+            'summary': (pools.en_summaries if english else pools.zh_summaries)[content_index] if summarized else None,
+            'summary_english': pools.en_summaries[content_index] if summarized else None,
+            'content_language': 'en' if english else 'zh',
+            'source_domain': domain,
+            'is_content_scraped': scraped,
+            'is_content_translated': scraped and not english,
+            'is_summarized': summarized,
+            'content_scraped_at': now if scraped else None,
+            'content_translated_at': now if scraped and not english else None,
+            'summarized_at': now if summarized else None
+        })
+    return rows
+
+
+def _copy_rows(conn, table, rows: Sequence[Dict]):
+    """PostgreSQL COPY ... FROM STDIN of rows with the same keys"""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # Unquoted empty fields are NULL in COPY's CSV format
+        writer.writerow([('t' if value else 'f') if isinstance(value, bool) else value
+                         for value in (row[column] for column in columns)])
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+def _insert_rows(conn, table, rows: Sequence[Dict]):
+    if not rows:
+        return
+    if conn.dialect.name == 'postgresql':
+        _copy_rows(conn, table, rows)
+    else:
+        conn.execute(table.insert(), rows)
+
+
+def ensure_categories(conn) -> List[int]:
+    """Ids of the synthetic categories, creating the missing ones"""
+    existing = dict(conn.execute(select(Category.name, Category.id)).all())
+    _insert_rows(conn, Category.__table__, [
+        {'name': name, 'description': description, 'color': color, 'created_at': datetime.utcnow()}
+        for name, description, color in CATEGORIES if name not in existing])
+    names = [name for name, _, _ in CATEGORIES]
+    return [category_id for category_id, in conn.execute(select(Category.id).where(Category.name.in_(names)))]
+
+def generate(articles: int, days: int = 365, comments: int = 0, saved_summaries: int = 0,
+             end_date: Optional[date] = None, content_share: float = 0.2, summary_share: float = 0.1,
+             pending_share: float = 0.02, seed: int = 0, database_url: Optional[str] = None) -> Dict:
+    """
+    Insert synthetic news, categories, comments and saved summaries
+
+    Args:
+        articles: News rows to add
+        days: Days (ending at end_date, default today) the articles are spread over
+        comments: Comments on the new articles
+        saved_summaries: Saved summaries of the new articles
+        content_share: Share of articles with scraped (and translated) content
+        summary_share: Share of articles with a summary
+        pending_share: Share of Chinese titles left for the title translation stage
+        seed: Seed of the generated text (runs with the same seed produce the same text)
+        database_url: Database to fill (default: the app's)
+
+    Returns:
+        Dictionary with the counts, the run token and the elapsed seconds
+    """
+    if database_url is None:
+        from app.database import DATABASE_URL as database_url
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    pools = TextPools(rng)
+    token = uuid.uuid4().hex[:8]
+    end_date = end_date or date.today()
+    days = max(days, 1)
+
+    # Not the app's engine: its SQLite connections autocommit, which would commit every row
+    engine = create_engine(database_url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            category_ids = ensure_categories(conn)
+            first_id = (conn.execute(select(func.max(News.id))).scalar() or 0) + 1
+            for start in range(0, articles, CHUNK_ROWS):
+                _insert_rows(conn, News.__table__, news_rows(
+                    pools, start, min(start + CHUNK_ROWS, articles), token, end_date, days,
+                    content_share, summary_share, pending_share))
+            last_id = conn.execute(select(func.max(News.id))).scalar() or 0
+
+            if last_id >= first_id:
+                now = datetime.utcnow()
+                for start in range(0, comments, CHUNK_ROWS):
+                    _insert_rows(conn, Comment.__table__, [{
+                        'news_id': rng.randint(first_id, last_id),
+                        'category_id': rng.choice(category_ids) if rng.random() < 0.7 else None,
+                        'comment_text': rng.choice(pools.en_summaries)[:rng.randint(40, 400)],
+                        'user_name': f"{rng.choice(USER_NAMES)}{rng.randint(1, 50)}",
+                        'created_at': now - timedelta(minutes=rng.randrange(days * 1440))
+                    } for _ in range(start, min(start + CHUNK_ROWS, comments))])
+                for start in range(0, saved_summaries, CHUNK_ROWS):
+                    _insert_rows(conn, SavedSummary.__table__, [{
+                        'news_id': rng.randint(first_id, last_id),
+                        'category_id': rng.choice(category_ids),
+                        'custom_title': rng.choice(pools.en_titles)[:200] if rng.random() < 0.3 else None,
+                        'notes': rng.choice(pools.en_summaries) if rng.random() < 0.5 else None,
+                        'saved_at': now - timedelta(minutes=rng.randrange(days * 1440)),
+                        'is_favorite': rng.random() < 0.2
+                    } for _ in range(start, min(start + CHUNK_ROWS, saved_summaries))])
+    finally:
+        engine.dispose()
+
+    _invalidate_caches(end_date, min(days, articles))
+    result = {
+        'token': token,
+        'articles': articles,
+        'comments': comments if articles else 0,
+        'saved_summaries': saved_summaries if articles else 0,
+        'categories': len(category_ids),
+        'first_date': (end_date - timedelta(days=min(days, articles) - 1)).isoformat() if articles else None,
+        'last_date': end_date.isoformat() if articles else None,
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+    logger.info(f"Generated synthetic data: {result}")
+    return result
+
+def _invalidate_caches(end_date: date, days: int):
+    """Rendered pages of the filled dates and the category stats are stale now"""
+    try:
+        from app.services.cache import get_cache, CATEGORY_STATS_KEY
+        from app.services.page_cache import invalidate_dates
+        invalidate_dates(end_date - timedelta(days=offset) for offset in range(days))
+        get_cache().delete(CATEGORY_STATS_KEY)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached pages: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic news for scaling tests")
+    parser.add_argument('--articles', type=int, default=100000, help="News rows to add")
+    parser.add_argument('--days', type=int, default=365, help="Days the articles are spread over")
+    parser.add_argument('--end-date', help="Newest collection date (YYYY-MM-DD, default today)")
+    parser.add_argument('--comments', type=int, default=0, help="Comments to add")
+    parser.add_argument('--saved-summaries', type=int, default=0, help="Saved summaries to add")
+    parser.add_argument('--content-share', type=float, default=0.2, help="Share of articles with scraped content")
+    parser.add_argument('--summary-share', type=float, default=0.1, help="Share of articles with a summary")
+    parser.add_argument('--pending-share', type=float, default=0.02, help="Share of titles left untranslated")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated text")
+    parser.add_argument('--database-url', help="Database to fill (default: DATABASE_URL / the app's)")
+    args = parser.parse_args(argv)
+
+    result = generate(args.articles, args.days, args.comments, args.saved_summaries,
+                      datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None,
+                      args.content_share, args.summary_share, args.pending_share, args.seed, args.database_url)
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Extractive summarization engine
+Vectorized TextRank / centroid sentence ranking with NumPy. A whole batch of
+documents is tokenized into one sparse (COO) sentence x term matrix, weighted
+with per-document TF-IDF, and ranked with one similarity matrix and power
+iteration per document. Chinese is tokenized into character n-grams, English
+into words.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[。！？；!?])|(?<=[.;])\s+')
+CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+CJK_RUN_PATTERN = re.compile(r'[\u4e00-\u9fff]+')
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his in is it its of on or "
+    "that the their they this to was were which will with".split()
+)
+
+# Documents with more sentences than this are ranked on their first sentences only
+MAX_SENTENCES_PER_DOCUMENT = 200
+
+def split_sentences(text: str) -> List[str]:
+    """Split Chinese or English text into sentences"""
+    if not text:
+        return []
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text) if s and len(s.strip()) > 1]
+
+def detect_language(text: str) -> str:
+    """Guess 'zh' or 'en' from the share of CJK characters in a sample of the text"""
+    sample = text[:500]
+    if not sample:
+        return 'en'
+    return 'zh' if len(CJK_PATTERN.findall(sample)) > len(sample) * 0.2 else 'en'
+
+def tokenize(sentence: str, language: str, ngram: int = 2) -> List[str]:
+    """Character n-grams of CJK runs (plus latin words) for Chinese, words for English"""
+    lowered = sentence.lower()
+    tokens = [w for w in WORD_PATTERN.findall(lowered) if w not in ENGLISH_STOPWORDS]
+    if language == 'zh':
+        for run in CJK_RUN_PATTERN.findall(sentence):
+            if len(run) < ngram:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + ngram] for i in range(len(run) - ngram + 1))
+    return tokens
+
+
+class TextRankSummarizer:
+    """Ranks sentences of many documents in one call"""
+
+    def __init__(self, damping: float = 0.85, max_iterations: int = 100, tolerance: float = 1e-6,
+                 method: str = 'textrank', ngram: int = 2):
+        """
+        Args:
+            damping: PageRank damping factor
+            max_iterations: Power iteration cap
+            tolerance: L1 convergence threshold for power iteration
+            method: 'textrank' (graph centrality) or 'centroid' (similarity to the document centroid)
+            ngram: Character n-gram size for Chinese
+        """
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.method = method
+        self.ngram = ngram
+
+    def _build_matrix(self, sentences: List[List[str]], languages: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Tokenize every sentence of the batch into one COO matrix
+
+        Returns:
+            (rows, cols, values, sentence_doc, n_terms) where values are TF-IDF
+            weights already L2-normalised per sentence
+        """
+        vocabulary: Dict[str, int] = {}
+        row_parts, col_parts, sentence_doc = [], [], []
+        row = 0
+        for doc_index, (doc_sentences, language) in enumerate(zip(sentences, languages)):
+            for sentence in doc_sentences:
+                ids = [vocabulary.setdefault(t, len(vocabulary)) for t in tokenize(sentence, language, self.ngram)]
+                row_parts.append(np.full(len(ids), row, dtype=np.int64))
+                col_parts.append(np.asarray(ids, dtype=np.int64))
+                sentence_doc.append(doc_index)
+                row += 1
+
+        n_terms = max(len(vocabulary), 1)
+        sentence_doc = np.asarray(sentence_doc, dtype=np.int64)
+        if not row_parts or not vocabulary:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), sentence_doc, n_terms
+
+        rows = np.concatenate(row_parts)
+        cols = np.concatenate(col_parts)
+
+        # Term frequency: collapse duplicate (sentence, term) entries
+        keys, tf = np.unique(rows * n_terms + cols, return_counts=True)
+        rows, cols = keys // n_terms, keys % n_terms
+
+        # Per-document IDF: in how many sentences of its own document does a term occur
+        docs = sentence_doc[rows]
+        _, doc_term_inverse, df = np.unique(docs * n_terms + cols, return_inverse=True, return_counts=True)
+        sentences_per_doc = np.bincount(sentence_doc, minlength=len(sentences)).astype(np.float64)
+        idf = np.log1p(sentences_per_doc[docs] / df[doc_term_inverse])
+
+        values = (1.0 + np.log(tf)) * idf
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(sentence_doc)))
+        values = values / np.where(norms[rows] > 0, norms[rows], 1.0)
+        return rows, cols, values, sentence_doc, n_terms
+
+    def _rank(self, matrix: np.ndarray) -> np.ndarray:
+        """Score the sentences of one document given its dense sentence x term matrix"""
+        n = matrix.shape[0]
+        if self.method == 'centroid':
+            centroid = matrix.sum(axis=0)
+            norm = np.linalg.norm(centroid)
+            return matrix @ centroid / norm if norm else np.zeros(n)
+
+        # Cosine similarity (rows are unit length) without self-loops
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / n), where=out_weight > 0)
+
+        scores = np.full(n, 1.0 / n)
+        teleport = (1.0 - self.damping) / n
+        for _ in range(self.max_iterations):
+            updated = teleport + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                scores = updated
+                break
+            scores = updated
+        return scores
+
+    def rank_batch(self, documents: List[str], languages: Optional[List[str]] = None) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Split and score the sentences of every document
+
+        Returns:
+            One (sentences, scores) pair per document
+        """
+        if languages is None:
+            languages = [detect_language(doc or '') for doc in documents]
+
+        sentences = [split_sentences(doc)[:MAX_SENTENCES_PER_DOCUMENT] for doc in documents]
+        rows, cols, values, sentence_doc, _ = self._build_matrix(sentences, languages)
+
+        # Slice the global COO matrix into per-document dense blocks (rows are grouped by document)
+        doc_starts = np.concatenate(([0], np.cumsum([len(s) for s in sentences])))
+        entry_bounds = np.searchsorted(rows, doc_starts)
+
+        results = []
+        for doc_index, doc_sentences in enumerate(sentences):
+            n = len(doc_sentences)
+            if n == 0:
+                results.append((doc_sentences, np.zeros(0)))
+                continue
+
+            lo, hi = entry_bounds[doc_index], entry_bounds[doc_index + 1]
+            local_terms, local_cols = np.unique(cols[lo:hi], return_inverse=True)
+            matrix = np.zeros((n, max(len(local_terms), 1)))
+            matrix[rows[lo:hi] - doc_starts[doc_index], local_cols] = values[lo:hi]
+            results.append((doc_sentences, self._rank(matrix)))
+
+        return results
+
+    def summarize_batch(self, documents: List[str], num_sentences: int = 4,
+                        languages: Optional[List[str]] = None) -> List[Optional[str]]:
+        """
+        Summarize every document with its num_sentences best sentences, kept in original order
+        """
+        if languages is None:
+            languages = [detect_language(doc or '') for doc in documents]
+
+        summaries = []
+        for (doc_sentences, scores), language in zip(self.rank_batch(documents, languages), languages):
+            if not doc_sentences:
+                summaries.append(None)
+                continue
+            # Best sentences first, skipping repeats (syndicated copy often repeats lines)
+            chosen_indexes, seen = [], set()
+            for i in np.argsort(-scores, kind='stable'):
+                if doc_sentences[i] not in seen:
+                    seen.add(doc_sentences[i])
+                    chosen_indexes.append(i)
+                    if len(chosen_indexes) == num_sentences:
+                        break
+            chosen = [doc_sentences[i] for i in sorted(chosen_indexes)]
+            summaries.append(''.join(chosen) if language == 'zh' else ' '.join(chosen))
+        return summaries
@@ -0,0 +1,175 @@
+"""
+Title Translation Service
+Backfills News.title_english outside of ingestion: new articles are stored
+with translation_status='pending' and this stage translates them in batches,
+retrying rows whose earlier attempts failed. Identical titles within a story
+cluster are translated once.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.models import News
+from app.services.story_clustering import normalize_text
+from app.services.translator import MicrosoftTranslator
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Values of News.translation_status
+TRANSLATION_PENDING = 'pending'
+TRANSLATION_COMPLETED = 'completed'
+TRANSLATION_FAILED = 'failed'
+TRANSLATION_NOT_REQUIRED = 'not_required'
+
+# Sections whose titles are already in English
+ENGLISH_SECTION_PREFIXES = ('Global Times',)
+
+def initial_translation_fields(article: Dict) -> Dict:
+    """
+    Get the title_english / translation_status values for a freshly scraped article
+
+    Args:
+        article: Scraped article dictionary
+
+    Returns:
+        Dictionary with title_english and translation_status keys
+    """
+    if (article.get('source_section') or '').startswith(ENGLISH_SECTION_PREFIXES):
+        return {'title_english': article['title'], 'translation_status': TRANSLATION_NOT_REQUIRED}
+
+    if article.get('title_english'):
+        return {'title_english': article['title_english'], 'translation_status': TRANSLATION_COMPLETED}
+
+    return {'title_english': None, 'translation_status': TRANSLATION_PENDING}
+
+
+class TitleTranslationService:
+    """Sweeps untranslated titles and translates them in large batches"""
+
+    def __init__(self, translator: Optional[MicrosoftTranslator] = None,
+                 batch_size: int = 500, max_attempts: int = 5):
+        """
+        Initialize the translation stage
+
+        Args:
+            translator: Translator instance (created on demand if not given)
+            batch_size: Number of rows loaded and translated per sweep step
+            max_attempts: Rows that failed this many times are no longer retried
+        """
+        self.translator = translator or MicrosoftTranslator()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    def pending_query(self, db: Session):
+        """Rows waiting for translation, including failed rows that may be retried"""
+        return db.query(News).filter(
+            News.translation_status.in_([TRANSLATION_PENDING, TRANSLATION_FAILED]),
+            News.translation_attempts < self.max_attempts
+        ).order_by(News.id)
+
+    @staticmethod
+    def _title_key(row: News) -> Tuple[int, str]:
+        """Rows with the same key share one translation (unclustered rows only match themselves)"""
+        return (row.story_cluster_id or -row.id, normalize_text(row.title))
+
+    def _known_translations(self, db: Session, rows: List[News]) -> Dict[Tuple[int, str], str]:
+        """English titles already stored for other members of the rows' story clusters"""
+        cluster_ids = {row.story_cluster_id for row in rows if row.story_cluster_id}
+        if not cluster_ids:
+            return {}
+        known = db.query(News.story_cluster_id, News.title, News.title_english).filter(
+            News.story_cluster_id.in_(cluster_ids),
+            News.title_english.isnot(None)
+        ).all()
+        return {(cluster_id, normalize_text(title)): english for cluster_id, title, english in known}
+
+    def translate_batch(self, db: Session, rows: List[News]) -> Dict[str, int]:
+        """Translate one batch of rows and commit the results"""
+        translated = 0
+        failed = 0
+
+        keys = [self._title_key(row) for row in rows]
+        known = self._known_translations(db, rows)
+
+        # Send each distinct title of a story once
+        to_translate: Dict[Tuple[int, str], str] = {}
+        for row, key in zip(rows, keys):
+            if key not in known:
+                to_translate.setdefault(key, row.title)
+
+        if to_translate:
+            try:
+                results = self.translator.translate_batch(list(to_translate.values()))
+            except Exception as e:
+                logger.error(f"Batch title translation failed: {str(e)}")
+                results = [None] * len(to_translate)
+            known.update((key, english) for key, english in zip(to_translate, results) if english)
+
+        translations = [known.get(key) for key in keys]
+        for row, title_english in zip(rows, translations):
+            row.translation_attempts = (row.translation_attempts or 0) + 1
+            if title_english:
+                row.title_english = title_english
+                row.translation_status = TRANSLATION_COMPLETED
+                translated += 1
+            else:
+                row.translation_status = TRANSLATION_FAILED
+                failed += 1
+
+        db.commit()
+        return {"translated": translated, "failed": failed}
+
+    def run(self, db: Session, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Translate pending titles until none are left (or limit rows were processed)
+
+        Args:
+            db: Database session
+            limit: Optional maximum number of rows to process in this run
+
+        Returns:
+            Counts of translated and failed rows
+        """
+        totals = {"translated": 0, "failed": 0, "processed": 0}
+        last_id = 0
+
+        if not getattr(self.translator, 'key', True):
+            # Don't burn retry attempts while the translator is not configured
+            logger.warning("Translator API key missing - leaving titles pending")
+            return totals
+
+        while limit is None or totals["processed"] < limit:
+            batch_size = self.batch_size if limit is None else min(self.batch_size, limit - totals["processed"])
+            # Walk forward by id so each row gets at most one attempt per run
+            rows = self.pending_query(db).filter(News.id > last_id).limit(batch_size).all()
+            if not rows:
+                break
+
+            last_id = rows[-1].id
+            counts = self.translate_batch(db, rows)
+            totals["translated"] += counts["translated"]
+            totals["failed"] += counts["failed"]
+            totals["processed"] += len(rows)
+
+        if totals["processed"]:
+            logger.info(f"Title translation stage: {totals['translated']} translated, {totals['failed']} failed")
+        return totals
+
+
+def run_title_translation(limit: Optional[int] = None) -> Dict[str, int]:
+    """Run the translation stage with its own database session (for background tasks and scripts)"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return TitleTranslationService().run(db, limit=limit)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Title translation stage failed: {str(e)}")
+        return {"translated": 0, "failed": 0, "processed": 0, "error": str(e)}
+    finally:
+        db.close()
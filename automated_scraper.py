@@ -36,123 +36,44 @@ def run_automated_scraping():
         
         # Import after setting up the path
         from app.database import SessionLocal
-        from app.scrapers.peoples_daily_scraper import PeoplesDailyScraper
-        from app.scrapers.paper_scraper import PaperScraper
-        from app.scrapers.state_council_scraper import StateCouncilScraper
-        from app.scrapers.nbs_scraper import NBSScraper
-        from app.scrapers.taiwan_affairs_scraper import TaiwanAffairsScraper
-        from app.scrapers.mnd_scraper import MNDScraper
-        from app.scrapers.guancha_scraper import GuanchaScraper
-        from app.scrapers.global_times_scraper import GlobalTimesScraper
-        from app.models.models import News
-        from app.services.translator import MicrosoftTranslator
+        from app.services.scrape_runs import ScrapeRunner
+        from app.services.title_translation import TitleTranslationService
+        from app.services.page_cache import install_invalidation
+        
+        # Make the web workers' cached pages of the scraped dates stale
+        install_invalidation()
         
         # Create database session
         db = SessionLocal()
         
         try:
-            # Initialize all scrapers with translation enabled
-            logger.info("🔧 Initializing scrapers...")
-            pd_scraper = PeoplesDailyScraper(translate_immediately=True)
-            paper_scraper = PaperScraper(translate_immediately=True)
-            sc_scraper = StateCouncilScraper(translate_immediately=True)
-            nbs_scraper = NBSScraper(translate_immediately=True)
-            tao_scraper = TaiwanAffairsScraper(translate_immediately=True)
-            mnd_scraper = MNDScraper(translate_immediately=True)
-            guancha_scraper = GuanchaScraper(translate_immediately=True)
-            gt_scraper = GlobalTimesScraper(translate_immediately=True)
-            
-            # Fetch articles from all sources
+            # Scrape section by section; each section is committed with its journal entry,
+            # so an interrupted run is resumed by the next invocation
             logger.info("📰 Fetching articles from all sources...")
-            pd_articles = pd_scraper.fetch_news()
-            logger.info(f"  📰 People's Daily: {len(pd_articles)} articles")
-            
-            paper_articles = paper_scraper.fetch_news()
-            logger.info(f"  📰 The Paper: {len(paper_articles)} articles")
-            
-            sc_articles = sc_scraper.fetch_news()
-            logger.info(f"  📰 State Council: {len(sc_articles)} articles")
-            
-            nbs_articles = nbs_scraper.fetch_news()
-            logger.info(f"  📰 NBS: {len(nbs_articles)} articles")
-            
-            tao_articles = tao_scraper.fetch_news()
-            logger.info(f"  📰 Taiwan Affairs: {len(tao_articles)} articles")
-            
-            mnd_articles = mnd_scraper.fetch_news()
-            logger.info(f"  📰 MND: {len(mnd_articles)} articles")
-            
-            guancha_articles = guancha_scraper.fetch_news()
-            logger.info(f"  📰 Guancha: {len(guancha_articles)} articles")
-            
-            gt_articles = gt_scraper.fetch_news()
-            logger.info(f"  📰 Global Times: {len(gt_articles)} articles")
-            
-            # Combine all articles
-            all_articles = (pd_articles + paper_articles + sc_articles + 
-                          nbs_articles + tao_articles + mnd_articles + 
-                          guancha_articles + gt_articles)
-            
-            logger.info(f"📊 Total articles collected: {len(all_articles)}")
-            
-            # Process and save articles
-            translator = MicrosoftTranslator()
-            new_articles_count = 0
-            duplicate_count = 0
-            
-            for article in all_articles:
-                try:
-                    # Check if article already exists by URL
-                    existing_by_url = db.query(News).filter(News.source_url == article['source_url']).first()
-                    
-                    if existing_by_url:
-                        duplicate_count += 1
-                        continue
-                    
-                    # Translate title if needed
-                    if article.get('source_section', '').startswith('Global Times'):
-                        title_english = article['title']  # Already in English
-                    else:
-                        try:
-                            title_english = translator.translate(article['title'])
-                        except Exception as e:
-                            logger.warning(f"Translation failed for: {article['title'][:50]}... Error: {str(e)}")
-                            title_english = None
-                    
-                    # Create news item
-                    news_item = News(
-                        title=article['title'],
-                        title_english=title_english,
-                        source_url=article['source_url'],
-                        source_section=article.get('source_section'),
-                        collection_date=article['collection_date']
-                    )
-                    
-                    db.add(news_item)
-                    db.flush()
-                    new_articles_count += 1
-                    
-                except Exception as article_error:
-                    logger.warning(f"Failed to process article: {article.get('source_url', 'Unknown')} - {str(article_error)}")
-                    db.rollback()
-                    duplicate_count += 1
-                    continue
+            runner = ScrapeRunner(db, trigger='automated', scraper_kwargs={'translate_immediately': True})
+            run_counts = runner.run()
+            if run_counts['resumed']:
+                logger.info(f"🔁 Resumed interrupted run {run_counts['run_id']}")
             
-            # Commit all changes
-            db.commit()
+            # Translation stage: backfill title_english for pending and failed rows
+            logger.info("🌐 Translating pending titles...")
+            translation_counts = TitleTranslationService().run(db)
             
             # Log results
             logger.info("✅ Automated scraping completed successfully!")
-            logger.info(f"📊 Results:")
-            logger.info(f"  ✅ New articles saved: {new_articles_count}")
-            logger.info(f"  ⚠️  Duplicates skipped: {duplicate_count}")
-            logger.info(f"  📈 Total processed: {len(all_articles)}")
+            logger.info(f"📊 Results (run {run_counts['run_id']}):")
+            logger.info(f"  ✅ New articles saved: {run_counts['new_articles']}")
+            logger.info(f"  ⚠️  Duplicates skipped: {run_counts['duplicates']}")
+            logger.info(f"  📂 Sections: {run_counts['sections']} ({run_counts['failed_sections']} failed)")
+            logger.info(f"  🌐 Titles translated: {translation_counts['translated']} (failed: {translation_counts['failed']})")
             
             return {
                 "success": True,
-                "new_articles": new_articles_count,
-                "duplicates": duplicate_count,
-                "total_processed": len(all_articles)
+                "run_id": run_counts['run_id'],
+                "new_articles": run_counts['new_articles'],
+                "duplicates": run_counts['duplicates'],
+                "failed_sections": run_counts['failed_sections'],
+                "titles_translated": translation_counts['translated']
             }
             
         except Exception as processing_error:
@@ -0,0 +1,143 @@
+"""
+Text cleanup micro-benchmark
+Times ContentScraper.clean_text (text_cleaner.py) on generated policy
+documents of growing size, against the previous pattern-by-pattern
+implementation kept here as the baseline, and checks that both give the
+same text. Reports per size: milliseconds per call for each and MB/s.
+
+    python -m benchmarks.cleaning [--sizes 10000,100000,1000000] [--repeat 7] [--domain www.gov.cn]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.results import DEFAULT_THRESHOLD, new_result, regressions, report, store_result
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# (field, higher is better)
+COMPARED_FIELDS = [('ms', False)]
+
+# Boilerplate found inside the text of policy documents and news pages
+INLINE_NOISE = [
+    '【我要纠错】', '【打印本页】', '（责编：王五、赵六）', '(责编：李四)', '点击进入专题', '相关新闻',
+    '更多精彩内容', 'http://www.gov.cn/zhengce/content/2024-01/05/content_6924567.htm',
+    'https://www.stats.gov.cn/sj/zxfb/202401/t20240117_1946624.html', '扫一扫在手机打开当前页'
+]
+
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text as it was: each pattern compiled on use and run as its own pass"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    patterns_to_remove = [
+        r'责任编辑[：:][^\n]*',
+        r'编辑[：:][^\n]*',
+        r'来源[：:][^\n]*',
+        r'原标题[：:][^\n]*',
+        r'\(责编[：:][^)]*\)',
+        r'点击进入专题',
+        r'更多精彩内容',
+        r'相关新闻',
+        r'【.*?】',
+    ]
+    for pattern in patterns_to_remove:
+        text = re.sub(pattern, '', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    return text
+
+
+def policy_document(size: int, seed: int = 0) -> str:
+    """About `size` characters of article paragraphs with boilerplate mixed in and an editor line at the end"""
+    from app.services.synthetic_data import TextPools
+
+    rng = random.Random(seed)
+    pools = TextPools(rng)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        paragraph = rng.choice(pools.zh_contents)
+        if rng.random() < 0.3:
+            cut = rng.randrange(len(paragraph))
+            paragraph = paragraph[:cut] + rng.choice(INLINE_NOISE) + paragraph[cut:]
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "\n\n　　".join(parts) + "\n\n责任编辑：张三\n来源：中国政府网"
+
+
+def time_calls(function: Callable[[str], str], text: str, repeat: int) -> float:
+    """Median seconds per call"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def print_table(rows: Dict[str, Dict]):
+    print(f"\n{'size':>10}{'legacy ms':>12}{'ms':>10}{'speed-up':>10}{'MB/s':>9}{'same':>6}")
+    for name, r in rows.items():
+        print(f"{name:>10}{r['legacy_ms']:>12}{r['ms']:>10}{r['speedup']:>10}{r['mb_per_second']:>9}"
+              f"{'yes' if r['same_output'] else 'NO':>6}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scraped-text cleanup on large policy documents")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated document sizes in characters")
+    parser.add_argument('--repeat', type=int, default=7, help="Timed calls per size (median is kept)")
+    parser.add_argument('--domain', help="Clean with this domain's patterns (the baseline has the defaults only)")
+    parser.add_argument('--label', help="Name of the stored result (default: git revision)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with 1 when a regression is found")
+    args = parser.parse_args(argv)
+
+    from app.services.text_cleaner import clean_text
+
+    def clean(text: str) -> str:
+        return clean_text(text, args.domain)
+
+    result = new_result(args.label, settings={'repeat': args.repeat, 'domain': args.domain}, sizes={})
+    mismatch = False
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = policy_document(size)
+        # First calls compile the patterns
+        same = clean(text) == legacy_clean_text(text)
+        mismatch = mismatch or (not same and not args.domain)
+        legacy = time_calls(legacy_clean_text, text, args.repeat)
+        current = time_calls(clean, text, args.repeat)
+        result['sizes'][str(size)] = {
+            'characters': len(text),
+            'legacy_ms': round(legacy * 1000, 3),
+            'ms': round(current * 1000, 3),
+            'speedup': round(legacy / current, 2) if current else None,
+            'mb_per_second': round(len(text.encode('utf-8')) / current / 1e6, 1) if current else None,
+            'same_output': same
+        }
+
+    print_table(result['sizes'])
+    if mismatch:
+        print("\nclean_text output differs from the baseline")
+
+    path, previous = store_result('cleaning', result)
+    # Runs with other settings are not comparable
+    comparable = previous if previous and previous.get('settings') == result['settings'] else None
+    found = regressions(result['sizes'], comparable['sizes'], COMPARED_FIELDS, args.threshold) if comparable else []
+    report(path, comparable, found, args.threshold)
+    if mismatch or (found and args.fail_on_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Ingestion throughput benchmark
+Runs the full fetch -> dedup -> persist -> translate path (ScrapeEngine,
+save_articles, TitleTranslationService) against generated section pages
+served by the local HTTP stand-in and a fake translator, both with a
+configurable latency, on top of an archive of 1k to 1M existing rows.
+
+Reports per database and archive size: articles/second, database round
+trips, translator calls and peak RSS, so it shows how dedup and insert
+scale as the news table grows. Each configuration runs in its own child
+process so peak RSS is its own.
+
+    python -m benchmarks.ingestion [--sizes 1000,10000,100000,1000000]
+    python -m benchmarks.ingestion --postgres-url postgresql://... (a scratch database: its tables are dropped)
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from benchmarks.results import BENCHMARKS_DIR, DEFAULT_THRESHOLD, new_result, regressions, report, store_result
+from benchmarks.standin import FakeTranslatorServer, FetchTimer, MemoryStore, StandInServer, attach
+
+PROJECT_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+# Rows inserted per statement when building the archive
+SEED_CHUNK_ROWS = 10000
+
+# The benchmark scrapes the NBS sections (plain link lists with one selector)
+SOURCE_NAME = "NBS"
+ARCHIVE_URL = "https://www.stats.gov.cn/archive/{}.html"
+
+# (field, higher is better)
+COMPARED_FIELDS = [('articles_per_second', True), ('db_round_trips', False), ('peak_rss_mb', False)]
+
+
+def create_benchmark_engine(database_url: str):
+    """Engine configured like app/database.py, with an empty schema"""
+    from sqlalchemy import create_engine
+    from app.database import ensure_added_columns
+    from app.models.models import Base
+    from app.services.sql_profiler import install_query_listeners
+
+    if database_url.startswith('sqlite'):
+        engine = create_engine(database_url, connect_args={"check_same_thread": False, "isolation_level": None})
+    else:
+        engine = create_engine(database_url, pool_pre_ping=True, pool_size=5, max_overflow=10)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ensure_added_columns(engine)
+    install_query_listeners(engine)
+    return engine
+
+def seed_archive(database_url: str, rows: int):
+    """Insert already translated archive rows spread over the past year"""
+    from sqlalchemy import create_engine
+    from app.models.models import News
+
+    # Not the app's engine: its SQLite connections autocommit, which would commit every row
+    seed_engine = create_engine(database_url)
+    today = date.today()
+    with seed_engine.begin() as conn:
+        for start in range(0, rows, SEED_CHUNK_ROWS):
+            conn.execute(News.__table__.insert(), [{
+                'title': f"统计数据解读 第{i}期",
+                'title_english': f"Statistics briefing no. {i}",
+                'translation_status': 'completed',
+                'translation_attempts': 1,
+                'source_url': ARCHIVE_URL.format(i),
+                'source_section': f"{SOURCE_NAME} - archive",
+                'collection_date': today - timedelta(days=i % 365),
+                'is_content_scraped': False,
+                'is_content_translated': False,
+                'is_summarized': False
+            } for i in range(start, min(start + SEED_CHUNK_ROWS, rows))])
+    seed_engine.dispose()
+
+def build_upstream(section_urls: List[str], archive_rows: int, articles: int, duplicate_ratio: float) -> MemoryStore:
+    """Section pages whose links are partly already archived (dedup hits) and partly new"""
+    store = MemoryStore()
+    duplicates = int(articles * duplicate_ratio) if archive_rows else 0
+    for section_index, url in enumerate(section_urls):
+        links = []
+        for i in range(articles):
+            if i < duplicates:
+                # Spread over the whole archive so lookups are not all cache-hot
+                archived = (section_index * articles + i) * 7919 % archive_rows
+                links.append((ARCHIVE_URL.format(archived), f"统计数据解读 第{archived}期"))
+            else:
+                links.append((f"/sj/bench/{section_index}/{i}.html", f"国家统计局发布第{section_index}组数据 {i}"))
+        body = '<html><body>' + ''.join(f'<a class="pc1200" href="{href}">{title}</a>' for href, title in links)
+        store.put(url, 200, 'text/html; charset=utf-8', (body + '</body></html>').encode('utf-8'))
+    return store
+
+
+def run_one(database_url: str, archive_rows: int, articles: int, duplicate_ratio: float,
+            upstream_latency_ms: float, translator_latency_ms: float) -> Dict:
+    """One configuration in this process"""
+    from sqlalchemy.orm import sessionmaker
+    from app.services.cache import Cache, MemoryBackend, set_cache
+    from app.services.scrape_engine import ScrapeEngine
+    from app.services.sql_profiler import start_query_stats
+    from app.services.title_translation import TitleTranslationService
+    from app.services.translator import MicrosoftTranslator
+
+    engine = create_benchmark_engine(database_url)
+    started = time.perf_counter()
+    seed_archive(database_url, archive_rows)
+    seed_seconds = time.perf_counter() - started
+
+    # A cold translation memo, so every new title reaches the translator
+    set_cache(Cache(MemoryBackend()))
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    scrape_engine = ScrapeEngine(wait_seconds=0, session_factory=session_factory)
+    sections = scrape_engine.sections(SOURCE_NAME)
+    store = build_upstream([scrape_engine.section_url(source, section) for source, section in sections],
+                           archive_rows, articles, duplicate_ratio)
+
+    with StandInServer(store, latency_seconds=upstream_latency_ms / 1000) as stand_in, \
+            FakeTranslatorServer(latency_seconds=translator_latency_ms / 1000) as translator_server:
+        os.environ['MS_TRANSLATOR_ENDPOINT'] = translator_server.base_url
+        os.environ.setdefault('MS_TRANSLATOR_KEY', 'benchmark')
+        attach(scrape_engine.scraper_for(SOURCE_NAME), stand_in, FetchTimer())
+
+        stats = start_query_stats()
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            totals = {'new_articles': 0, 'duplicates_skipped': 0}
+            for source, section in sections:
+                counts = scrape_engine.scrape_section(db, source, section)
+                for field in totals:
+                    totals[field] += counts.get(field, 0)
+            ingest_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            translation = TitleTranslationService(translator=MicrosoftTranslator()).run(db)
+            translate_seconds = time.perf_counter() - started
+        finally:
+            db.close()
+
+    pipeline_seconds = ingest_seconds + translate_seconds
+    return {
+        'database': engine.dialect.name,
+        'archive_rows': archive_rows,
+        'seed_seconds': round(seed_seconds, 2),
+        'new_articles': totals['new_articles'],
+        'duplicates_skipped': totals['duplicates_skipped'],
+        'translated_titles': translation['translated'],
+        'ingest_seconds': round(ingest_seconds, 3),
+        'translate_seconds': round(translate_seconds, 3),
+        'articles_per_second': round(totals['new_articles'] / pipeline_seconds, 1) if pipeline_seconds else None,
+        'db_round_trips': stats.queries,
+        'db_seconds': round(stats.seconds, 3),
+        'translator_calls': translator_server.calls,
+        # ru_maxrss is in KB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def run_child(database_url: str, size: int, args, work_dir: str) -> Optional[Dict]:
+    """Run one configuration in a child process and return its JSON result"""
+    command = [sys.executable, '-m', 'benchmarks.ingestion', '--run-one',
+               '--database-url', database_url, '--sizes', str(size),
+               '--articles-per-section', str(args.articles_per_section),
+               '--duplicate-ratio', str(args.duplicate_ratio),
+               '--upstream-latency-ms', str(args.upstream_latency_ms),
+               '--translator-latency-ms', str(args.translator_latency_ms)]
+    # Run from the scratch directory: importing app.database creates ./news_aggregator.db
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [PROJECT_ROOT, os.getenv('PYTHONPATH')]))}
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True, cwd=work_dir, env=env)
+    lines = [line for line in completed.stdout.splitlines() if line.strip()]
+    if completed.returncode != 0 or not lines:
+        print(f"{database_url} with {size} rows failed (exit code {completed.returncode})")
+        return None
+    return json.loads(lines[-1])
+
+
+def print_table(rows: Dict[str, Dict]):
+    print(f"\n{'database':<12}{'archive':>10}{'new':>7}{'dup':>7}{'art/s':>9}{'db trips':>10}"
+          f"{'tr calls':>10}{'ingest s':>10}{'peak MB':>9}")
+    for r in rows.values():
+        print(f"{r['database']:<12}{r['archive_rows']:>10}{r['new_articles']:>7}{r['duplicates_skipped']:>7}"
+              f"{r['articles_per_second'] or 0:>9}{r['db_round_trips']:>10}{r['translator_calls']:>10}"
+              f"{r['ingest_seconds']:>10}{r['peak_rss_mb']:>9}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fetch -> dedup -> persist -> translate throughput")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated archive sizes (existing news rows)")
+    parser.add_argument('--postgres-url', help="Also run on this PostgreSQL database (scratch: its tables are dropped)")
+    parser.add_argument('--articles-per-section', type=int, default=100, help="Links on each generated section page")
+    parser.add_argument('--duplicate-ratio', type=float, default=0.3, help="Share of links that are already archived")
+    parser.add_argument('--upstream-latency-ms', type=float, default=50, help="Delay of each page fetch")
+    parser.add_argument('--translator-latency-ms', type=float, default=200, help="Delay of each translator call")
+    parser.add_argument('--label', help="Name of the stored result (default: git revision)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with 1 when a regression is found")
+    parser.add_argument('--run-one', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # save_articles logs every duplicate at INFO
+    logging.disable(logging.INFO)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    if args.run_one:
+        print(json.dumps(run_one(args.database_url, sizes[0], args.articles_per_section, args.duplicate_ratio,
+                                 args.upstream_latency_ms, args.translator_latency_ms)))
+        return 0
+
+    result = new_result(args.label, settings={
+        'articles_per_section': args.articles_per_section,
+        'duplicate_ratio': args.duplicate_ratio,
+        'upstream_latency_ms': args.upstream_latency_ms,
+        'translator_latency_ms': args.translator_latency_ms
+    }, runs={})
+
+    work_dir = tempfile.mkdtemp(prefix='ingestion-benchmark-')
+    try:
+        for size in sizes:
+            targets = [f"sqlite:///{os.path.join(work_dir, f'archive-{size}.db')}"]
+            if args.postgres_url:
+                targets.append(args.postgres_url)
+            for database_url in targets:
+                run = run_child(database_url, size, args, work_dir)
+                if run:
+                    result['runs'][f"{run['database']}:{size}"] = run
+                    print(f"{run['database']} {size} rows: {run['articles_per_second']} articles/s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if not result['runs']:
+        return 1
+    print_table(result['runs'])
+
+    path, previous = store_result('ingestion', result)
+    # Runs with other settings are not comparable
+    comparable = previous if previous and previous.get('settings') == result['settings'] else None
+    found = regressions(result['runs'], comparable['runs'], COMPARED_FIELDS, args.threshold) if comparable else []
+    report(path, comparable, found, args.threshold)
+    if found and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Web load test
+Seeds a synthetic database, starts the app under gunicorn in the configs we
+deploy (digitalocean_deploy.md) and drives it with an asyncio client that
+mixes requests to the main read routes. Reports per config and route:
+requests/sec and p50/p95/p99 latency, stored (results.py) and compared
+with the previous run of the same settings.
+
+    python -m benchmarks.load [--articles 50000] [--duration 30] [--concurrency 32]
+    python -m benchmarks.load --config default --database-url postgresql://... (a scratch database: its tables are dropped)
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from benchmarks.results import BENCHMARKS_DIR, DEFAULT_THRESHOLD, new_result, regressions, report, store_result
+
+PROJECT_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+# name -> (gunicorn workers, environment), as in digitalocean_deploy.md
+DEPLOYED_CONFIGS = {
+    'low-memory': (1, {'LOW_MEMORY_MODE': '1'}),
+    'default': (4, {})
+}
+
+# Server start-up (imports, create_all) on a slow droplet
+READY_TIMEOUT_SECONDS = 60
+
+# (field, higher is better)
+COMPARED_FIELDS = [('rps', True), ('p95_ms', False), ('p99_ms', False)]
+
+
+def seed_database(database_url: str, articles: int, days: int, comments: int) -> Dict:
+    """Fresh schema filled by the synthetic data generator"""
+    from sqlalchemy import create_engine
+    from app.models.models import Base
+    from app.services.cache import Cache, MemoryBackend, set_cache
+    from app.services.synthetic_data import generate
+
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    # The servers start with their own cache; nothing to invalidate here
+    set_cache(Cache(MemoryBackend()))
+    generate(articles, days, comments, comments // 2, seed=42, database_url=database_url)
+    return {'articles': articles, 'days': days, 'comments': comments, 'today': date.today()}
+
+
+def scenarios(dataset: Dict) -> List[Tuple[str, int, Callable[[random.Random], str]]]:
+    """(route, weight, path for a random target) for the read routes under test"""
+    articles, days, today = dataset['articles'], dataset['days'], dataset['today']
+
+    def random_date(rng):
+        return (today - timedelta(days=rng.randrange(days))).isoformat()
+
+    def random_month(rng):
+        month = today.replace(day=1) - timedelta(days=rng.randrange(days))
+        return f"/?year={month.year}&month={month.month}"
+
+    return [
+        ('/', 10, random_month),
+        ('/news/{date}', 30, lambda rng: f"/news/{random_date(rng)}"),
+        ('/article/{id}', 25, lambda rng: f"/article/{rng.randint(1, articles)}"),
+        ('/api/articles/{id}', 25, lambda rng: f"/api/articles/{rng.randint(1, articles)}"),
+        ('/api/comments', 5, lambda rng: "/api/comments"),
+        ('/api/categories/stats', 5, lambda rng: "/api/categories/stats")
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(workers: int, extra_env: Dict[str, str], database_url: str, work_dir: str,
+                 port: int) -> subprocess.Popen:
+    """gunicorn with the deployed worker class, from the project root like the systemd unit"""
+    env = {
+        **os.environ, **extra_env,
+        'DATABASE_URL': database_url,
+        'CACHE_URL': f"sqlite:///{os.path.join(work_dir, f'cache-{port}.db')}",
+        'PYTHONPATH': os.pathsep.join(filter(None, [PROJECT_ROOT, os.getenv('PYTHONPATH')]))
+    }
+    log = open(os.path.join(work_dir, f'gunicorn-{port}.log'), 'wb')
+    return subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app.main:app', '-w', str(workers),
+                             '-k', 'uvicorn.workers.UvicornWorker', '--bind', f'127.0.0.1:{port}'],
+                            cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+async def wait_ready(base_url: str, server: subprocess.Popen) -> bool:
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline and server.poll() is None:
+            try:
+                async with session.get(base_url + '/health') as response:
+                    if response.status == 200:
+                        return True
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    return False
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))]
+
+async def drive(base_url: str, routes, concurrency: int, warmup: float, duration: float,
+                seed: int = 1) -> Dict[str, Dict]:
+    """Closed-loop clients picking routes by weight; only requests after the warm-up are recorded"""
+    names = [name for name, _, _ in routes]
+    weights = [weight for _, weight, _ in routes]
+    paths = {name: path for name, _, path in routes}
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+
+    started = time.monotonic()
+    record_from = started + warmup
+    stop_at = record_from + duration
+
+    async def client(rng: random.Random, session: aiohttp.ClientSession):
+        while True:
+            name = rng.choices(names, weights)[0]
+            request_started = time.monotonic()
+            if request_started >= stop_at:
+                return
+            try:
+                async with session.get(base_url + paths[name](rng)) as response:
+                    await response.read()
+                    ok = response.status < 500
+            except aiohttp.ClientError:
+                ok = False
+            if request_started >= record_from:
+                latencies[name].append(time.monotonic() - request_started)
+                if not ok:
+                    errors[name] += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as session:
+        await asyncio.gather(*(client(random.Random(seed + i), session) for i in range(concurrency)))
+
+    results = {}
+    for name in names:
+        values = sorted(latencies[name])
+        results[name] = {
+            'requests': len(values),
+            'errors': errors[name],
+            'rps': round(len(values) / duration, 1),
+            **{f'p{p}_ms': round(percentile(values, p / 100) * 1000, 1) if values else None for p in (50, 95, 99)}
+        }
+    return results
+
+def run_config(name: str, database_url: str, dataset: Dict, args, work_dir: str) -> Optional[Dict[str, Dict]]:
+    workers, extra_env = DEPLOYED_CONFIGS[name]
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(workers, extra_env, database_url, work_dir, port)
+    try:
+        if not asyncio.run(wait_ready(base_url, server)):
+            with open(os.path.join(work_dir, f'gunicorn-{port}.log'), errors='replace') as f:
+                log_tail = f.readlines()[-20:]
+            print(f"{name}: server did not start\n" + ''.join(log_tail))
+            return None
+        return asyncio.run(drive(base_url, scenarios(dataset), args.concurrency, args.warmup, args.duration))
+    finally:
+        stop_server(server)
+
+
+def print_table(rows: Dict[str, Dict]):
+    print(f"\n{'config:route':<36}{'requests':>9}{'errors':>8}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for key, r in rows.items():
+        print(f"{key:<36}{r['requests']:>9}{r['errors']:>8}{r['rps']:>8}"
+              f"{r['p50_ms'] or '-':>9}{r['p95_ms'] or '-':>9}{r['p99_ms'] or '-':>9}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the web routes under the deployed gunicorn configs")
+    parser.add_argument('--config', action='append', choices=list(DEPLOYED_CONFIGS),
+                        help="Only this gunicorn config (repeatable, default: all)")
+    parser.add_argument('--database-url', help="Seed and serve this database instead of a temporary SQLite file "
+                                               "(scratch: its tables are dropped)")
+    parser.add_argument('--articles', type=int, default=50000, help="Synthetic news rows")
+    parser.add_argument('--days', type=int, default=365, help="Days the articles are spread over")
+    parser.add_argument('--comments', type=int, default=500, help="Synthetic comments (half as many saved summaries)")
+    parser.add_argument('--concurrency', type=int, default=32, help="Concurrent clients")
+    parser.add_argument('--warmup', type=float, default=5, help="Seconds of unrecorded load first (fills the caches)")
+    parser.add_argument('--duration', type=float, default=30, help="Recorded seconds per config")
+    parser.add_argument('--label', help="Name of the stored result (default: git revision)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with 1 when a regression is found")
+    args = parser.parse_args(argv)
+
+    configs = args.config or list(DEPLOYED_CONFIGS)
+    work_dir = tempfile.mkdtemp(prefix='load-test-')
+    database_url = args.database_url or f"sqlite:///{os.path.join(work_dir, 'load.db')}"
+    result = new_result(args.label, settings={
+        'database': database_url.split(':', 1)[0],
+        'articles': args.articles,
+        'days': args.days,
+        'comments': args.comments,
+        'concurrency': args.concurrency,
+        'duration': args.duration
+    }, routes={})
+
+    try:
+        started = time.perf_counter()
+        dataset = seed_database(database_url, args.articles, args.days, args.comments)
+        print(f"Seeded {args.articles} articles in {time.perf_counter() - started:.1f}s")
+        for name in configs:
+            routes = run_config(name, database_url, dataset, args, work_dir)
+            if routes:
+                total = sum(r['rps'] for r in routes.values())
+                print(f"{name}: {total:.1f} requests/s")
+                result['routes'].update({f"{name}:{route}": r for route, r in routes.items()})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if not result['routes']:
+        return 1
+    print_table(result['routes'])
+
+    path, previous = store_result('load', result)
+    # Runs with other settings are not comparable
+    comparable = previous if previous and previous.get('settings') == result['settings'] else None
+    found = regressions(result['routes'], comparable['routes'], COMPARED_FIELDS, args.threshold) if comparable else []
+    report(path, comparable, found, args.threshold)
+    if found and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Stored benchmark results
+Each run is written to benchmarks/results/<kind>/<label>.json (label defaults
+to the git revision) and compared with the most recent earlier run of the
+same kind.
+"""
+
+import glob
+import json
+import os
+import platform
+import re
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_ROOT = os.path.join(BENCHMARKS_DIR, 'results')
+
+# Changes larger than this fraction are reported as regressions
+DEFAULT_THRESHOLD = 0.2
+
+
+def slug(name: str) -> str:
+    return re.sub(r'[^0-9a-z]+', '-', name.lower()).strip('-') or 'result'
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+def new_result(label: Optional[str] = None, **fields) -> Dict:
+    """Result header: label, git revision, time and Python version"""
+    revision = git_revision()
+    return {
+        'label': label or revision,
+        'revision': revision,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        **fields
+    }
+
+def previous_result(kind: str, exclude: Optional[str] = None) -> Optional[Dict]:
+    """The most recent stored result of a kind (other than the given file)"""
+    results = []
+    for path in glob.glob(os.path.join(RESULTS_ROOT, kind, '*.json')):
+        if path != exclude:
+            with open(path, encoding='utf-8') as f:
+                results.append(json.load(f))
+    return max(results, key=lambda r: r['created_at']) if results else None
+
+def store_result(kind: str, result: Dict) -> Tuple[str, Optional[Dict]]:
+    """Write a result; returns its path and the previous result to compare with"""
+    directory = os.path.join(RESULTS_ROOT, kind)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{slug(result['label'])}.json")
+    previous = previous_result(kind, exclude=path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=1)
+    return path, previous
+
+def regressions(current: Dict[str, Dict], previous: Dict[str, Dict], fields: Sequence[Tuple[str, bool]],
+                threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Changes beyond the threshold in the wrong direction
+
+    Args:
+        current: Rows of this run by name (e.g. per source)
+        previous: Rows of the previous run by name
+        fields: (field, higher is better) pairs to compare
+    """
+    found = []
+    for name, row in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        for field, higher_is_better in fields:
+            old, new = before.get(field), row.get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                found.append(f"{name}: {field} {old} -> {new} ({change:+.0%})")
+    return found
+
+def report(path: str, previous: Optional[Dict], found: List[str], threshold: float):
+    print(f"\nResults written to {os.path.relpath(path)}")
+    if previous:
+        print(f"Compared with {previous['label']} ({previous['created_at']}): "
+              f"{len(found)} regression(s) over {threshold:.0%}")
+        for line in found:
+            print(f"  {line}")
@@ -0,0 +1,187 @@
+"""
+Scraper benchmark
+Replays recorded pages of every section of every scraper through the local
+HTTP stand-in (standin.py) and measures, per source: pages/sec, parse time
+(wall time minus time waiting for pages), links extracted and peak Python
+memory while scraping. Results are stored (results.py) and compared with
+the previous run, so regressions show up between versions.
+
+    # Once, on a machine with network access: record the fixtures
+    python -m benchmarks.scrapers --record
+    # Any time after, offline
+    python -m benchmarks.scrapers [--source NBS] [--iterations 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.results import (
+    BENCHMARKS_DIR, DEFAULT_THRESHOLD, new_result, regressions, report, slug, store_result
+)
+from benchmarks.standin import FetchTimer, FixtureStore, StandInServer, attach
+
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures', 'scrapers')
+
+# SinaScraper is not in the registry (it is only used by NewsService)
+SINA_SOURCE = "Sina News"
+
+
+def benchmark_sections() -> List[Tuple[str, Callable, List[str], Callable]]:
+    """
+    (source, scraper factory, section names, run section) for every scraper
+
+    run section(scraper, section) returns the scraped articles.
+    """
+    from app.scrapers.registry import create_scraper, source_names
+    from app.scrapers.sina_scraper import SinaScraper
+
+    sources = []
+    for source_name in source_names():
+        factory = lambda name=source_name: create_scraper(name)
+        sections = list(factory().websites[source_name])
+        run = lambda scraper, section, name=source_name: scraper.fetch_section(name, section)
+        sources.append((source_name, factory, sections, run))
+
+    def run_sina(scraper, section):
+        # One entry of SinaScraper.sources at a time, through its async path
+        all_sources = scraper.sources
+        scraper.sources = {section: all_sources[section]}
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return asyncio.run(_sina_news(scraper))
+        finally:
+            scraper.sources = all_sources
+
+    sources.append((SINA_SOURCE, SinaScraper, list(SinaScraper().sources), run_sina))
+    return sources
+
+async def _sina_news(scraper):
+    try:
+        return await scraper.get_news()
+    finally:
+        await scraper.close_session()
+
+
+def run_section(factory: Callable, run: Callable, section: str, stand_in: StandInServer,
+                measure_memory: bool) -> Dict:
+    scraper = factory()
+    timer = FetchTimer()
+    attach(scraper, stand_in, timer)
+
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        articles = run(scraper, section)
+    finally:
+        wall = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        if measure_memory:
+            tracemalloc.stop()
+
+    return {
+        'pages': timer.pages,
+        'links': len(articles),
+        'wall_seconds': wall,
+        'fetch_seconds': timer.seconds,
+        'parse_seconds': max(wall - timer.seconds, 0.0),
+        'peak_kb': round(peak / 1024, 1) if peak is not None else None
+    }
+
+def benchmark_source(source: str, factory: Callable, sections: List[str], run: Callable,
+                     stand_in: StandInServer, iterations: int, measure_memory: bool) -> Dict:
+    """Median timings over the iterations (memory from a separate traced pass)"""
+    results = {}
+    for section in sections:
+        runs = [run_section(factory, run, section, stand_in, False) for _ in range(iterations)]
+        result = {field: statistics.median_low(r[field] for r in runs) for field in ('pages', 'links')}
+        result.update({field: round(statistics.median(r[field] for r in runs), 4)
+                       for field in ('wall_seconds', 'fetch_seconds', 'parse_seconds')})
+        result['peak_kb'] = run_section(factory, run, section, stand_in, True)['peak_kb'] if measure_memory else None
+        results[section] = result
+
+    wall = sum(r['wall_seconds'] for r in results.values())
+    pages = sum(r['pages'] for r in results.values())
+    peaks = [r['peak_kb'] for r in results.values() if r['peak_kb'] is not None]
+    return {
+        'sections': results,
+        'pages': pages,
+        'links': sum(r['links'] for r in results.values()),
+        'wall_seconds': round(wall, 4),
+        'parse_seconds': round(sum(r['parse_seconds'] for r in results.values()), 4),
+        'pages_per_second': round(pages / wall, 1) if wall else None,
+        'peak_kb': max(peaks) if peaks else None
+    }
+
+
+# (field, higher is better)
+COMPARED_FIELDS = [('parse_seconds', False), ('pages_per_second', True), ('links', True), ('peak_kb', False)]
+
+
+def print_table(result: Dict):
+    print(f"\n{'source':<18}{'pages':>7}{'links':>7}{'pages/s':>10}{'parse s':>10}{'peak KB':>10}")
+    for source, r in result['sources'].items():
+        print(f"{source:<18}{r['pages']:>7}{r['links']:>7}{r['pages_per_second'] or 0:>10}"
+              f"{r['parse_seconds']:>10}{r['peak_kb'] if r['peak_kb'] is not None else '-':>10}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against recorded pages")
+    parser.add_argument('--source', action='append', help="Only this source (repeatable)")
+    parser.add_argument('--iterations', type=int, default=3, help="Timed runs per section (median is kept)")
+    parser.add_argument('--record', action='store_true', help="Fetch and store pages that have no fixture yet")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced memory pass")
+    parser.add_argument('--label', help="Name of the stored result (default: git revision)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with 1 when a regression is found")
+    args = parser.parse_args(argv)
+
+    # The scrapers log every page at INFO
+    logging.disable(logging.INFO)
+
+    result = new_result(args.label, iterations=args.iterations, sources={})
+    missing = {}
+    for source, factory, sections, run in benchmark_sections():
+        if args.source and source not in args.source:
+            continue
+        store = FixtureStore(os.path.join(FIXTURES_DIR, slug(source)))
+        if not len(store) and not args.record:
+            print(f"{source}: no fixtures, run with --record first")
+            continue
+        with StandInServer(store, record=args.record) as stand_in:
+            if args.record:
+                # One pass fills the store; timings must not include live fetches
+                for section in sections:
+                    run_section(factory, run, section, stand_in, False)
+                stand_in.record = False
+            result['sources'][source] = benchmark_source(source, factory, sections, run, stand_in,
+                                                         args.iterations, not args.no_memory)
+            if stand_in.missing:
+                missing[source] = sorted(stand_in.missing)
+
+    if not result['sources']:
+        return 1
+
+    print_table(result)
+    for source, urls in missing.items():
+        print(f"{source}: {len(urls)} URL(s) without a fixture (served as 404)")
+
+    path, previous = store_result('scrapers', result)
+    found = regressions(result['sources'], previous['sources'], COMPARED_FIELDS, args.threshold) if previous else []
+    report(path, previous, found, args.threshold)
+    if found and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Local HTTP stand-in for the news sites
+Serves recorded pages (fixtures) from 127.0.0.1 so scrapers can be
+benchmarked without the network. Requests keep their real URLs inside the
+scraper (the scrapers branch on the domain); only the transport is pointed
+at the stand-in:
+
+- requests-based scrapers get StandInAdapter mounted on their http_session
+- aiohttp-based scrapers (SinaScraper) get their fetch_page wrapped
+
+FakeTranslatorServer does the same for the translator API. In record mode
+a URL without a fixture is fetched live once and stored.
+
+Fixture layout: <fixtures dir>/index.json maps each URL to the stored body
+file, its status and Content-Type (the charset matters to the scrapers).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import quote, unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.services.http_client import get_http_session, new_http_session
+
+
+class FixtureStore:
+    """Recorded responses of one fixture directory, keyed by URL"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """{'status', 'content_type', 'body'} of a recorded URL"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            body = f.read()
+        return {'status': entry['status'], 'content_type': entry['content_type'], 'body': body}
+
+    def put(self, url: str, status: int, content_type: str, body: bytes):
+        file_name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.html'
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, file_name), 'wb') as f:
+                f.write(body)
+            self.index[url] = {'file': file_name, 'status': status, 'content_type': content_type}
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+class MemoryStore:
+    """Generated pages kept in memory, with the FixtureStore interface"""
+
+    def __init__(self):
+        self.pages: Dict[str, Dict] = {}
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.pages
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self.pages.get(url)
+
+    def put(self, url: str, status: int, content_type: str, body: bytes):
+        self.pages[url] = {'status': status, 'content_type': content_type, 'body': body}
+
+
+class StandInServer:
+    """Threaded HTTP server replaying a FixtureStore (recording misses when record=True)"""
+
+    def __init__(self, store, record: bool = False, latency_seconds: float = 0.0):
+        """
+        Args:
+            store: FixtureStore (or MemoryStore) with the pages to serve
+            record: Fetch and store URLs that have no fixture
+            latency_seconds: Delay before each response, to imitate a remote site
+        """
+        self.store = store
+        self.record = record
+        self.latency_seconds = latency_seconds
+        self.missing = set()
+        self.served = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def url_for(self, url: str) -> str:
+        """Stand-in address of a real URL"""
+        return self.base_url + '/' + quote(url, safe='')
+
+    def start(self) -> 'StandInServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _fetch_live(self, url: str) -> Optional[Dict]:
+        try:
+            response = get_http_session().get(url, timeout=30)
+        except requests.RequestException:
+            return None
+        content_type = response.headers.get('Content-Type', 'text/html')
+        self.store.put(url, response.status_code, content_type, response.content)
+        return {'status': response.status_code, 'content_type': content_type, 'body': response.content}
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if stand_in.latency_seconds:
+                    time.sleep(stand_in.latency_seconds)
+                url = unquote(self.path.lstrip('/'))
+                page = stand_in.store.get(url)
+                if page is None and stand_in.record:
+                    page = stand_in._fetch_live(url)
+                if page is None:
+                    stand_in.missing.add(url)
+                    page = {'status': 404, 'content_type': 'text/plain', 'body': b'no fixture'}
+                stand_in.served += 1
+                self.send_response(page['status'])
+                self.send_header('Content-Type', page['content_type'])
+                self.send_header('Content-Length', str(len(page['body'])))
+                self.end_headers()
+                self.wfile.write(page['body'])
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class FetchTimer:
+    """Pages fetched and time spent waiting for them (the rest of a scrape is parsing)"""
+
+    def __init__(self):
+        self.pages = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float):
+        self.pages += 1
+        self.seconds += seconds
+
+
+class StandInAdapter(HTTPAdapter):
+    """requests transport that sends every request to the stand-in under its original URL"""
+
+    def __init__(self, stand_in: StandInServer, timer: FetchTimer):
+        super().__init__()
+        self.stand_in = stand_in
+        self.timer = timer
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        request.url = self.stand_in.url_for(original_url)
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            response.content  # Body transfer belongs to the fetch, not the parse
+        finally:
+            self.timer.add(time.perf_counter() - started)
+            request.url = original_url
+        response.url = original_url
+        return response
+
+
+def attach(scraper, stand_in: StandInServer, timer: FetchTimer):
+    """Point a scraper's HTTP transport at the stand-in"""
+    # A session of its own: the shared HTTP client must keep its real transport
+    session = new_http_session()
+    adapter = StandInAdapter(stand_in, timer)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    scraper.http_session = session
+
+    # Scrapers on the async aiohttp path fetch through fetch_page
+    original_fetch_page = scraper.fetch_page
+
+    async def fetch_page(url: str) -> str:
+        started = time.perf_counter()
+        try:
+            return await original_fetch_page(stand_in.url_for(url))
+        finally:
+            timer.add(time.perf_counter() - started)
+
+    scraper.fetch_page = fetch_page
+
+
+class FakeTranslatorServer:
+    """
+    Local stand-in for the Microsoft Translator /translate API with a fixed latency
+
+    Point MicrosoftTranslator at it with MS_TRANSLATOR_ENDPOINT=<base_url>.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> 'FakeTranslatorServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        translator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'[]')
+                with translator._lock:
+                    translator.calls += 1
+                    translator.texts += len(body)
+                if translator.latency_seconds:
+                    time.sleep(translator.latency_seconds)
+                payload = json.dumps([{'translations': [{'text': f"[en] {item['text']}", 'to': 'en'}]}
+                                      for item in body], ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+News Scrape Scheduler - long-running replacement for the cron jobs
+Polls every section on its own interval and records schedule/run stats
+(see GET /api/scheduler/status)
+"""
+
+import sys
+import os
+import logging
+
+# Add the app directory to Python path
+sys.path.append('/var/www/news_summary')
+sys.path.append('/var/www/news_summary/app')
+
+# Configure logging
+log_file = '/var/www/news_summary/logs/scheduler.log'
+os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(log_file),
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    from app.services.scheduler import (
+        ScrapeScheduler, DEFAULT_INTERVAL_MINUTES, MIN_INTERVAL_MINUTES, MAX_INTERVAL_MINUTES
+    )
+    from app.services.page_cache import install_invalidation
+    from app.services.metrics import start_publisher
+
+    # Make the web workers' cached pages of the polled dates stale
+    install_invalidation()
+    # Scraper fetch and translator latency show up in the web app's /metrics
+    start_publisher("scheduler")
+
+    interval = int(os.getenv('SCRAPE_DEFAULT_INTERVAL_MINUTES', DEFAULT_INTERVAL_MINUTES))
+    min_interval = int(os.getenv('SCRAPE_MIN_INTERVAL_MINUTES', MIN_INTERVAL_MINUTES))
+    max_interval = int(os.getenv('SCRAPE_MAX_INTERVAL_MINUTES', MAX_INTERVAL_MINUTES))
+    logger.info(f"🚀 Starting news scrape scheduler (start interval {interval} min, adaptive {min_interval}-{max_interval} min)...")
+    try:
+        ScrapeScheduler(default_interval_minutes=interval, min_interval_minutes=min_interval,
+                        max_interval_minutes=max_interval).run_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Scheduler stopped")
@@ -0,0 +1,33 @@
+#!/bin/bash
+# Replace the twice-daily cron scrape with the long-running scheduler service
+
+echo "🤖 Setting up the news scrape scheduler..."
+echo "=============================================="
+
+# Create logs directory
+mkdir -p /var/www/news_summary/logs
+chmod 755 /var/www/news_summary/logs
+
+# Remove the old cron jobs (automated_scraper.py stays available for manual runs)
+echo "🗑  Removing automated scraping cron jobs..."
+crontab -l 2>/dev/null | grep -v "Automated News Scraping" | grep -v "/var/www/news_summary/cron_scraper.sh" | crontab -
+
+# Install and start the systemd service
+echo "📦 Installing news_scheduler.service..."
+sudo cp /var/www/news_summary/news_scheduler.service /etc/systemd/system/news_scheduler.service
+sudo systemctl daemon-reload
+sudo systemctl enable news_scheduler
+sudo systemctl restart news_scheduler
+
+echo ""
+echo "✅ Scheduler service installed!"
+echo "=============================================="
+echo "📝 Scheduler log: /var/www/news_summary/logs/scheduler.log"
+echo "📊 Schedule and last runs: curl http://127.0.0.1:8000/api/scheduler/status"
+echo ""
+echo "🔍 To check the service:"
+echo "   sudo systemctl status news_scheduler"
+echo "   sudo journalctl -u news_scheduler -f"
+echo ""
+echo "🧪 To run a one-off scrape of all sources:"
+echo "   cd /var/www/news_summary && ./cron_scraper.sh"
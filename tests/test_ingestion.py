@@ -0,0 +1,25 @@
+"""
+save_articles: a row that cannot be stored must not take the batch's other rows with it
+"""
+
+from datetime import date
+
+from app.models.models import News
+from app.services.ingestion import save_articles
+
+
+def article(n, title="标题"):
+    return {"title": title, "source_url": f"http://x/{n}", "source_section": "Example - news",
+            "collection_date": date(2024, 1, 1)}
+
+
+def test_failing_row_keeps_the_others_and_is_not_counted(session_factory):
+    db = session_factory()
+    # The middle row violates NOT NULL on title
+    counts = save_articles(db, [article(1, "第一条新闻标题"), article(2, None), article(3, "第三条新闻标题")])
+    db.commit()
+
+    assert {row.source_url for row in db.query(News).all()} == {"http://x/1", "http://x/3"}
+    assert counts["new_articles"] == 2
+    assert counts["duplicates_skipped"] == 1
+    db.close()
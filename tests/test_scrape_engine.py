@@ -0,0 +1,135 @@
+"""
+ScrapeEngine and crawl frontier: a failed section must not move its high-water
+mark, and a date-scoped fetch must not join a run of the latest links
+"""
+
+import threading
+import time
+from datetime import date
+
+from app.models.models import News, SectionFrontier
+from app.scrapers.frontier import CrawlFrontier
+from app.services.leases import acquire_lease, release_lease
+from app.services.scrape_engine import (
+    SECTION_JOINED, SECTION_SCRAPED, ScrapeEngine, scrape_mode, section_lease_key
+)
+
+BAD_PAGE = "http://example.cn/bad/index.html"
+GOOD_PAGE = "http://example.cn/good/index.html"
+MIXED_PAGE = "http://example.cn/mixed/index.html"
+
+
+class FakeScraper:
+    """
+    Passes over its section page like the real scrapers; the 'bad' section's articles
+    cannot be stored, and the 'mixed' section's second article violates NOT NULL
+    """
+
+    websites = {"Example": {"bad": BAD_PAGE, "good": GOOD_PAGE, "mixed": MIXED_PAGE}}
+
+    def __init__(self):
+        self.frontier = None
+
+    def fetch_section(self, source_name, section_name):
+        page_url = self.websites[source_name][section_name]
+        cursor = self.frontier.cursor(page_url)
+        articles = []
+        for i in range(3):
+            href = f"{page_url}?article={i}"
+            if not cursor.known(href):
+                articles.append({
+                    "title": None if section_name == "mixed" and i == 1 else f"{section_name} {i}",
+                    # The bad section's articles lack source_url: save_articles raises
+                    ("url" if section_name == "bad" else "source_url"): href,
+                    "source_section": f"{source_name} - {section_name}",
+                    "collection_date": date(2024, 1, 1)
+                })
+        return articles
+
+
+def test_failed_section_leaves_its_mark_unchanged(session_factory):
+    db = session_factory()
+    db.add(SectionFrontier(page_url=BAD_PAGE, last_seen_urls='["old-link"]'))
+    db.commit()
+
+    frontier = CrawlFrontier.load(db)
+    engine = ScrapeEngine(frontier=frontier, wait_seconds=0, session_factory=session_factory)
+    scraper = FakeScraper()
+    scraper.frontier = frontier
+    engine.scrapers["Example"] = scraper
+
+    result = engine.scrape_sections(db, [("Example", "bad"), ("Example", "good")])
+
+    statuses = {o["section"]: o["status"] for o in result["sections"]}
+    assert statuses == {"bad": "error", "good": SECTION_SCRAPED}
+    assert frontier.pending() == []
+
+    marks = {row.page_url: row.last_seen_urls for row in db.query(SectionFrontier).all()}
+    assert marks[BAD_PAGE] == '["old-link"]'
+    assert frontier.marks[BAD_PAGE] == ["old-link"]
+    assert f"{GOOD_PAGE}?article=0" in marks[GOOD_PAGE]
+
+    # The failed section's links are still new on its next run
+    assert not frontier.cursor(BAD_PAGE).known(f"{BAD_PAGE}?article=0")
+    db.close()
+
+
+def test_failed_row_does_not_lose_the_rest_of_the_section(session_factory):
+    db = session_factory()
+    frontier = CrawlFrontier.load(db)
+    # SQLite cannot turn this read transaction into a write after the lease is written
+    db.commit()
+    engine = ScrapeEngine(frontier=frontier, wait_seconds=0, session_factory=session_factory)
+    scraper = FakeScraper()
+    scraper.frontier = frontier
+    engine.scrapers["Example"] = scraper
+
+    result = engine.scrape_section(db, "Example", "mixed")
+
+    assert result["status"] == SECTION_SCRAPED
+    assert result["new_articles"] == 2
+    stored = {row.source_url for row in db.query(News).all()}
+    # Every link the frontier now skips is either stored or the row that could not be
+    assert stored == {f"{MIXED_PAGE}?article=0", f"{MIXED_PAGE}?article=2"}
+    db.close()
+
+
+def release_later(key, owner, result, session_factory, delay=0.3):
+    timer = threading.Timer(delay, release_lease, (key, owner, result, session_factory))
+    timer.start()
+    return timer
+
+
+def test_dated_fetch_scrapes_after_a_latest_run_instead_of_joining(session_factory):
+    db = session_factory()
+    engine = ScrapeEngine(wait_seconds=5, session_factory=session_factory)
+    engine.scrapers["Example"] = FakeScraper()
+    engine.scrapers["Example"].frontier = CrawlFrontier()
+
+    key = section_lease_key("Example", "good")
+    assert acquire_lease(key, "scheduler", session_factory=session_factory)
+    timer = release_later(key, "scheduler", {"new_articles": 7, "mode": scrape_mode()}, session_factory)
+    started = time.monotonic()
+    result = engine.scrape_section(db, "Example", "good", collection_date=date(2024, 2, 1),
+                                   update_existing_sections=True)
+    timer.join()
+
+    assert time.monotonic() - started >= 0.2
+    assert result["status"] == SECTION_SCRAPED
+    assert result["new_articles"] == 3
+    assert {row.collection_date for row in db.query(News).all()} == {date(2024, 2, 1)}
+    db.close()
+
+
+def test_latest_fetch_joins_a_latest_run(session_factory):
+    db = session_factory()
+    engine = ScrapeEngine(wait_seconds=5, session_factory=session_factory)
+
+    key = section_lease_key("Example", "good")
+    assert acquire_lease(key, "scheduler", session_factory=session_factory)
+    timer = release_later(key, "scheduler", {"new_articles": 7, "mode": scrape_mode()}, session_factory)
+    result = engine.scrape_section(db, "Example", "good")
+    timer.join()
+
+    assert result == {"new_articles": 7, "status": SECTION_JOINED}
+    db.close()
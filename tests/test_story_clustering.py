@@ -0,0 +1,43 @@
+"""
+Story clustering at ingest: a title that recurs every day is a new story each day
+"""
+
+from datetime import date, timedelta
+
+from app.models.models import News
+from app.services.ingestion import save_articles
+from app.services.story_clustering import recluster_stories
+
+DAILY_TITLE = "国防部例行记者会"
+
+
+def article(url, title, collection_date):
+    return {"title": title, "source_url": url, "source_section": "Example - news",
+            "collection_date": collection_date}
+
+
+def test_daily_title_starts_a_new_cluster_each_day(session_factory):
+    db = session_factory()
+    first = date(2024, 6, 1)
+    for day in range(5):
+        collection_date = first + timedelta(days=day)
+        save_articles(db, [article(f"http://x/{day}", DAILY_TITLE, collection_date)])
+        db.commit()
+
+    clusters = [row.story_cluster_id for row in db.query(News).order_by(News.collection_date)]
+    assert len(set(clusters)) == 5
+
+    assert recluster_stories(db, first, collection_date)["multi_article_clusters"] == 0
+    db.close()
+
+
+def test_same_title_on_the_same_day_joins_the_cluster(session_factory):
+    db = session_factory()
+    collection_date = date(2024, 6, 1)
+    save_articles(db, [article("http://a/1", DAILY_TITLE, collection_date),
+                       article("http://b/1", f"{DAILY_TITLE}！", collection_date)])
+    db.commit()
+
+    clusters = {row.story_cluster_id for row in db.query(News).all()}
+    assert len(clusters) == 1
+    db.close()